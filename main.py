@@ -1,31 +1,40 @@
 # main.py
-import tkinter as tk
-from ollama_gui import OllamaFinderGUI
-import subprocess
+import argparse
 import os
 import sys
 import logging
 import shutil
+import threading
+from ollama_profiling import start_profiling, profile_phase, finish_profiling
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def check_ollama_installation():
-    """Check if ollama is installed and accessible"""
+    """
+    Check if ollama is installed and accessible.
+    A cached location that still matches the executable on disk is trusted after a single
+    stat; a stale cache is refreshed on a background thread instead of delaying startup.
+    """
+    from ollama_location import load_location, location_is_current, discover_location
     try:
+        cached = load_location()
+        if cached is not None:
+            if location_is_current(cached):
+                logging.debug(f"Using cached Ollama location {cached['path']} (version {cached.get('version') or 'unknown'})")
+                return True
+            logging.info("Cached Ollama location is stale, rediscovering in the background")
+            threading.Thread(target=discover_location, args=(cached,), daemon=True).start()
+            return True
+        
         # Check if ollama is in PATH
         if shutil.which("ollama") is None:
             logging.error("Ollama executable not found in PATH")
             return False
         
-        # Test basic ollama command
-        result = subprocess.run(["ollama", "list"], 
-                               capture_output=True, 
-                               text=True, 
-                               encoding="utf-8")
-        
-        if result.returncode != 0:
-            logging.error(f"Ollama test command failed: {result.stderr}")
+        # Self-test the executable and cache what we found
+        if discover_location() is None:
+            logging.error("Ollama test command failed")
             return False
         
         return True
@@ -37,17 +46,27 @@ def start_gui():
     """Start the GUI"""
     logging.debug("Starting GUI")
     
+    # The application modules are imported here rather than at the top of the file,
+    # so --profile-startup can time them
+    with profile_phase("imports"):
+        import tkinter as tk
+        from ollama_gui import OllamaFinderGUI
+    
     # Check ollama installation before starting GUI
-    if not check_ollama_installation():
+    with profile_phase("installation check"):
+        installed = check_ollama_installation()
+    if not installed:
         import tkinter.messagebox as messagebox
         messagebox.showerror("Ollama Not Found", 
                             "Ollama is not installed or not accessible.\n"
                             "Please install Ollama and make sure it's in your PATH.")
         logging.warning("Starting GUI without confirmed Ollama installation")
     
-    root = tk.Tk()
-    root.geometry("900x650")  # Updated window size for a modern look
-    gui = OllamaFinderGUI(root)
+    with profile_phase("tk root"):
+        root = tk.Tk()
+        root.geometry("900x650")  # Updated window size for a modern look
+    with profile_phase("gui"):
+        gui = OllamaFinderGUI(root)
     
     # Directly remove the "?" button from the GUI
     if hasattr(gui, 'help_button') and gui.help_button:
@@ -64,8 +83,29 @@ def start_gui():
     return gui  # Return the GUI instance for testing purposes
 
 if __name__ == "__main__":
-    gui = start_gui()
+    parser = argparse.ArgumentParser(description="Ollama Finder GUI")
+    parser.add_argument("--profile-startup", nargs="?", const=os.path.join("logs", "startup_profile.txt"),
+                        metavar="REPORT", help="write import and startup phase timings to REPORT "
+                                               "(default logs/startup_profile.txt) once the model lists are populated")
+    parser.add_argument("--benchmark", nargs="+", metavar="MODEL",
+                        help="benchmark MODEL(s) without opening the GUI and save the results")
+    parser.add_argument("--repeats", type=int, default=3, help="times each benchmark prompt is sent (default 3)")
+    parser.add_argument("--fake-server", action="store_true",
+                        help="run --benchmark against a built-in fake Ollama server to check the harness offline")
+    args = parser.parse_args()
+    if args.benchmark:
+        from ollama_benchmark import run_headless
+        sys.exit(run_headless(args.benchmark, repeats=args.repeats, fake=args.fake_server))
+    if args.profile_startup:
+        start_profiling(args.profile_startup)
+    
+    try:
+        gui = start_gui()
+    except Exception:
+        # Report the phases that did run, and take the import hook out before the traceback
+        finish_profiling()
+        raise
     try:
-        gui.root.mainloop()
+        gui.master.mainloop()
     except Exception as e:
         logging.error(f"Error starting GUI: {e}")
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+HTTP client for the Ollama REST API
+Keeps a single pooled session to the server so inventory queries don't spawn the CLI
+"""
+
+import json
+import os
+import threading
+from collections import namedtuple
+
+# requests is imported where it is used: it costs tens of milliseconds to load and the
+# first request is made from a worker thread, so this keeps it off the startup path
+
+DEFAULT_HOST = "http://localhost:11434"
+
+# Structured records returned by the inventory endpoints
+ModelRecord = namedtuple("ModelRecord", ["name", "digest", "size", "modified_at", "details"])
+RunningModelRecord = namedtuple(
+    "RunningModelRecord",
+    ["name", "digest", "size", "size_vram", "expires_at", "details"]
+)
+
+
+class OllamaAPIError(Exception):
+    """Raised when the Ollama server can't be reached or returns an error"""
+
+
+class OllamaConnectionError(OllamaAPIError):
+    """Raised when the request never got a response (refused, reset or timed out)"""
+
+
+def resolve_base_url(host=None):
+    """
+    Returns the server base URL, honouring OLLAMA_HOST the same way the CLI does.
+
+    Args:
+        host (str, optional): Explicit host, e.g. "127.0.0.1:11434" or "http://box:11434"
+    """
+    host = host or os.environ.get("OLLAMA_HOST") or DEFAULT_HOST
+    if "://" not in host:
+        host = "http://" + host
+    if host.count(":") < 2:  # scheme only, no port given
+        host += ":11434"
+    return host.rstrip("/")
+
+
+class OllamaClient:
+    """Thin wrapper around a persistent requests.Session pointed at one Ollama server"""
+
+    def __init__(self, base_url=None, timeout=5.0, pool_size=4):
+        """
+        Initialize the client
+
+        Args:
+            base_url: Server URL, defaults to OLLAMA_HOST or http://localhost:11434
+            timeout: Timeout in seconds for inventory requests
+            pool_size: Number of keep-alive connections to hold open
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.base_url = resolve_base_url(base_url)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method, path, **kwargs):
+        import requests
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.request(method, self.base_url + path, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise OllamaConnectionError(f"Ollama server not reachable at {self.base_url}: {e}") from e
+        except requests.RequestException as e:
+            raise OllamaAPIError(f"Request to {self.base_url}{path} failed: {e}") from e
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", response.text)
+            except (ValueError, AttributeError):  # not JSON, or not an object
+                message = response.text
+            raise OllamaAPIError(f"{method} {path} failed ({response.status_code}): {message}")
+        return response
+
+    def _request_json(self, method, path, **kwargs):
+        """
+        Makes a request and returns its decoded JSON object. A body that isn't one, such
+        as a proxy's HTML error page or a truncated reply, raises OllamaAPIError.
+        """
+        return decode_json(self._request(method, path, **kwargs))
+
+    def list_models(self):
+        """Returns a list of ModelRecord for every locally available model (/api/tags)"""
+        data = self._request_json("GET", "/api/tags")
+        return [
+            ModelRecord(
+                name=m.get("name") or m.get("model", ""),
+                digest=m.get("digest", ""),
+                size=m.get("size", 0),
+                modified_at=m.get("modified_at", ""),
+                details=m.get("details") or {},
+            )
+            for m in data.get("models") or []
+        ]
+
+    def running_models(self):
+        """Returns a list of RunningModelRecord for every loaded model (/api/ps)"""
+        data = self._request_json("GET", "/api/ps")
+        return [
+            RunningModelRecord(
+                name=m.get("name") or m.get("model", ""),
+                digest=m.get("digest", ""),
+                size=m.get("size", 0),
+                size_vram=m.get("size_vram", 0),
+                expires_at=m.get("expires_at", ""),
+                details=m.get("details") or {},
+            )
+            for m in data.get("models") or []
+        ]
+
+    def show_model(self, name):
+        """Returns the raw /api/show document for a model"""
+        return self._request_json("POST", "/api/show", json={"model": name})
+
+    def chat(self, payload, stream=False, timeout=60):
+        """
+        Posts a chat request to /api/chat.
+
+        Args:
+            payload (dict): Request body (model, messages, options, ...)
+            stream (bool): When True the open streaming Response is returned; read it
+                with iter_json_lines() and close it to abandon the generation
+            timeout: Seconds to wait for the response (per chunk when streaming)
+
+        Returns:
+            The decoded response dict, or the streaming Response
+        """
+        payload = dict(payload, stream=stream)
+        response = self._request("POST", "/api/chat", json=payload, stream=stream, timeout=timeout)
+        return response if stream else decode_json(response)
+
+    def load_model(self, name, keep_alive="5m", timeout=300):
+        """
+        Loads a model into memory without generating anything (/api/generate with no
+        prompt) and returns the reply, whose load_duration is the time spent loading.
+
+        Args:
+            name (str): Model to load
+            keep_alive: How long the model stays loaded afterwards, e.g. "10m";
+                -1 keeps it loaded indefinitely and 0 unloads it
+            timeout: Seconds to wait for the load to finish
+        """
+        payload = {"model": name, "keep_alive": keep_alive, "stream": False}
+        return self._request_json("POST", "/api/generate", json=payload, timeout=timeout)
+
+    def copy_model(self, source, destination):
+        """Copies a model under a new name (/api/copy); the layers are shared, not duplicated"""
+        self._request("POST", "/api/copy", json={"source": source, "destination": destination})
+
+    def delete_model(self, name):
+        """Deletes a model and any layers no other model uses (/api/delete)"""
+        self._request("DELETE", "/api/delete", json={"model": name})
+
+    def pull(self, name, insecure=False, timeout=(5, 300)):
+        """
+        Starts pulling a model (/api/pull) and returns the open streaming Response.
+        Read it with iter_json_lines(); each chunk carries a status and, while a layer
+        downloads, its digest with total/completed byte counts. Re-issuing the pull after
+        an interruption resumes the partially downloaded layers.
+
+        Args:
+            name (str): Model to pull, e.g. "llama3.2:3b"
+            insecure (bool): Allow insecure connections to the registry
+            timeout: Connect and per-chunk read timeout in seconds
+        """
+        payload = {"model": name, "insecure": insecure, "stream": True}
+        return self._request("POST", "/api/pull", json=payload, stream=True, timeout=timeout)
+
+    def version(self):
+        """Returns the server version string"""
+        return self._request_json("GET", "/api/version").get("version", "")
+
+    def close(self):
+        self.session.close()
+
+
+def decode_json(response):
+    """Returns the JSON object in a response body, raising OllamaAPIError if there isn't one"""
+    try:
+        data = response.json()
+    except ValueError:  # requests.JSONDecodeError is a ValueError
+        data = None
+    if not isinstance(data, dict):
+        request = response.request
+        raise OllamaAPIError(f"{request.method} {request.path_url} returned an invalid reply "
+                             f"({response.headers.get('Content-Type', 'no content type')}): "
+                             f"{response.text[:200]!r}")
+    return data
+
+
+def iter_json_lines(response):
+    """
+    Yields the decoded objects of an NDJSON streaming response.
+    Raises OllamaAPIError if the server reports an error mid-stream or sends a line
+    that isn't a JSON object.
+    """
+    import requests
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                chunk = json.loads(line)
+            except ValueError:
+                chunk = None
+            if not isinstance(chunk, dict):
+                raise OllamaAPIError(f"Invalid line in stream: {line[:200]!r}")
+            if "error" in chunk:
+                raise OllamaAPIError(chunk["error"])
+            yield chunk
+    except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+        raise OllamaConnectionError(f"Stream interrupted: {e}") from e
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the shared client, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
+
+
+def set_client(client):
+    """Replaces the shared client, e.g. to point the app at a stand-in server"""
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+
+
+def format_size(num_bytes):
+    """Formats a byte count the way the CLI does (e.g. 4.7 GB)"""
+    size = float(num_bytes or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+def format_model_details(info):
+    """
+    Renders an /api/show document as text laid out like 'ollama show'.
+
+    Args:
+        info (dict): The decoded /api/show response
+    """
+    details = info.get("details") or {}
+    model_info = info.get("model_info") or {}
+    arch = model_info.get("general.architecture", details.get("family", ""))
+
+    rows = [
+        ("architecture", arch),
+        ("parameters", details.get("parameter_size", "")),
+        ("context length", model_info.get(f"{arch}.context_length", "")),
+        ("embedding length", model_info.get(f"{arch}.embedding_length", "")),
+        ("quantization", details.get("quantization_level", "")),
+    ]
+    lines = ["  Model"]
+    lines += [f"    {key:<20}{value}" for key, value in rows if value != ""]
+
+    capabilities = info.get("capabilities") or []
+    if capabilities:
+        lines += ["", "  Capabilities"] + [f"    {c}" for c in capabilities]
+
+    parameters = (info.get("parameters") or "").strip()
+    if parameters:
+        lines += ["", "  Parameters"] + [f"    {p.strip()}" for p in parameters.splitlines()]
+
+    license_text = (info.get("license") or "").strip()
+    if license_text:
+        lines += ["", "  License"] + [f"    {l}" for l in license_text.splitlines()[:2]]
+
+    return "\n".join(lines) + "\n"
+
+
+def format_running_instance(record):
+    """Renders a RunningModelRecord as the instance details block shown under model info"""
+    if record.size:
+        vram_share = record.size_vram / record.size * 100
+        processor = "100% GPU" if vram_share >= 100 else "100% CPU" if vram_share <= 0 else f"{100 - vram_share:.0f}%/{vram_share:.0f}% CPU/GPU"
+    else:
+        processor = "unknown"
+    return (
+        "Running instance details:\n"
+        f"    name        {record.name}\n"
+        f"    id          {record.digest[:12]}\n"
+        f"    size        {format_size(record.size)}\n"
+        f"    processor   {processor}\n"
+        f"    until       {record.expires_at}"
+    )
@@ -0,0 +1,218 @@
+"""
+Batch model operations for Ollama GUI
+Runs show/copy/remove across many models on a bounded worker pool and collects the
+outcome into a single report; pulls are handed to the pull queue
+"""
+
+import time
+import tkinter as tk
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, scrolledtext, messagebox
+
+from ollama_api import get_client, format_model_details, OllamaAPIError
+
+BatchResult = namedtuple("BatchResult", ["model", "ok", "message", "seconds"])
+
+
+def _show(client, model, options):
+    return format_model_details(client.show_model(model))
+
+
+def _copy(client, model, options):
+    destination = options["destination"].format(model=model)
+    client.copy_model(model, destination)
+    return f"copied to {destination}"
+
+
+def _remove(client, model, options):
+    client.delete_model(model)
+    return "removed"
+
+
+# Operation name -> (callable run on a worker, whether it changes the inventory)
+OPERATIONS = {
+    "show": (_show, False),
+    "copy": (_copy, True),
+    "remove": (_remove, True),
+}
+
+
+class BatchRunner:
+    """Runs one operation over a list of models, at most max_workers requests at a time"""
+
+    def __init__(self, tasks, max_workers=4, client=None):
+        """
+        Initialize the runner
+
+        Args:
+            tasks (TaskRunner): Used to deliver results on the Tk thread
+            max_workers: Number of models processed concurrently
+            client: OllamaClient to use, defaults to the shared client
+        """
+        self.tasks = tasks
+        self.max_workers = max_workers
+        self.client = client
+        self.cancelled = False
+        self._executor = None
+
+    def run(self, operation, models, on_result=None, on_done=None, **options):
+        """
+        Starts the batch and returns immediately.
+
+        Args:
+            operation (str): A key of OPERATIONS
+            models (list): Model names to process
+            on_result: Called on the Tk thread with (BatchResult, finished count, total) per model
+            on_done: Called on the Tk thread with the list of BatchResult once every model is done
+            **options: Operation options, e.g. destination="{model}-copy" for copy
+        """
+        func, _ = OPERATIONS[operation]
+        client = self.client or get_client()
+        results = []
+        total = len(models)
+        self.cancelled = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ollama-batch")
+
+        def process(model):
+            if self.cancelled:
+                return BatchResult(model, False, "cancelled", 0.0)
+            started = time.perf_counter()
+            try:
+                message = func(client, model, options)
+                return BatchResult(model, True, message, time.perf_counter() - started)
+            except OllamaAPIError as e:
+                return BatchResult(model, False, str(e), time.perf_counter() - started)
+            except Exception as e:
+                # e.g. a bad copy pattern; every model must still report, or on_done never runs
+                return BatchResult(model, False, f"{e.__class__.__name__}: {e}", time.perf_counter() - started)
+
+        def finished(result):
+            # Tk thread: results arrive one at a time, so no locking is needed
+            results.append(result)
+            if on_result:
+                on_result(result, len(results), total)
+            if len(results) == total:
+                self._executor.shutdown(wait=False)
+                if on_done:
+                    on_done(sorted(results, key=lambda r: models.index(r.model)))
+
+        for model in models:
+            future = self._executor.submit(process, model)
+            future.add_done_callback(lambda f: self.tasks.post(finished, f.result()))
+
+    def cancel(self):
+        """Skips the models that haven't started yet; running requests complete"""
+        self.cancelled = True
+
+
+def format_report(operation, results, elapsed):
+    """Renders batch results as one plain-text report"""
+    succeeded = [r for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
+    lines = [f"Batch {operation}: {len(succeeded)} succeeded, {len(failed)} failed in {elapsed:.1f}s", ""]
+    if failed:
+        lines.append("Failed:")
+        lines += [f"  {r.model}: {r.message}" for r in failed]
+        lines.append("")
+    if succeeded:
+        lines.append("Succeeded:")
+        for r in succeeded:
+            if "\n" in r.message:
+                lines += [f"  {r.model}", r.message.rstrip("\n")]
+            else:
+                lines.append(f"  {r.model}: {r.message} ({r.seconds * 1000:.0f} ms)")
+    return "\n".join(lines) + "\n"
+
+
+class BatchDialog:
+    """Window for choosing an operation, running it over the selected models and showing the report"""
+
+    def __init__(self, parent, models, runner, on_pull=None, on_started=None, on_finished=None):
+        """
+        Initialize the dialog
+
+        Args:
+            parent: Parent application reference (provides master)
+            models (list): The selected model names
+            runner (BatchRunner): Executes the operation
+            on_pull: Called with the model list when the pull operation is chosen
+            on_started: Called with the operation name just before a batch starts
+            on_finished: Called with (operation, results) after a batch that changes the inventory
+        """
+        self.parent = parent
+        self.models = list(models)
+        self.runner = runner
+        self.on_pull = on_pull
+        self.on_started = on_started
+        self.on_finished = on_finished
+        self.started = None
+
+        self.window = tk.Toplevel(parent.master)
+        self.window.title(f"Batch Operations - {len(self.models)} model(s)")
+        self.window.geometry("560x460")
+
+        ttk.Label(self.window, text=", ".join(self.models), wraplength=530).pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        options = ttk.Frame(self.window)
+        options.pack(fill=tk.X, padx=10, pady=5)
+        self.operation_var = tk.StringVar(value="show")
+        for value, text in (("show", "Show"), ("copy", "Copy"), ("remove", "Remove"), ("pull", "Pull / update")):
+            ttk.Radiobutton(options, text=text, value=value, variable=self.operation_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options, text="Copy as:").pack(side=tk.LEFT, padx=(15, 0))
+        self.destination_var = tk.StringVar(value="{model}-copy")
+        ttk.Entry(options, textvariable=self.destination_var, width=18).pack(side=tk.LEFT, padx=5)
+
+        controls = ttk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        self.run_button = ttk.Button(controls, text="Run", command=self.start)
+        self.run_button.pack(side=tk.LEFT)
+        ttk.Button(controls, text="Cancel", command=runner.cancel).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Close", command=self.window.destroy).pack(side=tk.RIGHT)
+        self.progress = ttk.Progressbar(controls, orient=tk.HORIZONTAL, mode="determinate", maximum=len(self.models))
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+
+        self.report_text = scrolledtext.ScrolledText(self.window, wrap=tk.WORD, font=("Consolas", 8), state=tk.DISABLED)
+        self.report_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def start(self):
+        operation = self.operation_var.get()
+        if not self.models:
+            self.show_report("No models selected.\n")
+            return
+        if operation == "pull":
+            if self.on_pull:
+                self.on_pull(self.models)
+            self.show_report(f"Queued {len(self.models)} model(s) on the pull panel.\n")
+            return
+        if operation == "remove" and not messagebox.askyesno(
+                "Confirm Deletion",
+                f"Remove {len(self.models)} model(s)? This action cannot be undone.",
+                icon=messagebox.WARNING, parent=self.window):
+            return
+        self.run_button.config(state=tk.DISABLED)
+        self.progress["value"] = 0
+        self.show_report(f"Running {operation} on {len(self.models)} model(s)...\n")
+        self.started = time.perf_counter()
+        if self.on_started:
+            self.on_started(operation)
+        self.runner.run(operation, self.models, on_result=self.result_arrived,
+                        on_done=lambda results: self.batch_done(operation, results),
+                        destination=self.destination_var.get())
+
+    def result_arrived(self, result, finished, total):
+        if self.window.winfo_exists():
+            self.progress["value"] = finished
+
+    def batch_done(self, operation, results):
+        if OPERATIONS[operation][1] and self.on_finished:
+            self.on_finished(operation, results)
+        if self.window.winfo_exists():
+            self.run_button.config(state=tk.NORMAL)
+            self.show_report(format_report(operation, results, time.perf_counter() - self.started))
+
+    def show_report(self, text):
+        self.report_text.config(state=tk.NORMAL)
+        self.report_text.delete("1.0", tk.END)
+        self.report_text.insert(tk.END, text)
+        self.report_text.config(state=tk.DISABLED)
@@ -0,0 +1,491 @@
+"""
+Model benchmarks for Ollama GUI
+Runs a fixed prompt set against models and records time-to-first-token, prompt and
+generation throughput (from the server's eval counts and durations) and total latency
+in a SQLite store. Runs from the GUI or headless with 'python main.py --benchmark MODEL'.
+"""
+
+import os
+import platform
+import sqlite3
+import statistics
+import threading
+import time
+import tkinter as tk
+from collections import namedtuple
+from datetime import datetime
+from tkinter import ttk, scrolledtext
+
+from ollama_api import get_client, iter_json_lines, OllamaAPIError
+from ollama_location import user_data_dir
+
+_CONTEXT_PARAGRAPH = (
+    "The lighthouse keeper logged the weather every hour: wind direction, visibility, "
+    "the height of the swell and the ships that passed. Most nights nothing happened, "
+    "but the log was kept anyway, because the value of a record lies in its continuity. "
+)
+
+# (prompt id, prompt): fixed so results stay comparable between runs and machines
+DEFAULT_PROMPTS = [
+    ("short", "Reply with the single word: ready."),
+    ("explain", "Explain in three sentences how a hash table handles collisions."),
+    ("code", "Write a Python function that returns the n-th Fibonacci number iteratively."),
+    ("long_context", "Summarize the following text in one sentence.\n\n" + _CONTEXT_PARAGRAPH * 12),
+]
+
+# Deterministic, bounded generations so runs measure the hardware, not the sampling
+BENCHMARK_OPTIONS = {"temperature": 0, "seed": 42, "num_predict": 128}
+
+BenchmarkResult = namedtuple("BenchmarkResult", [
+    "model", "prompt_id", "repeat", "ttft_ms", "prompt_tokens", "prompt_tps",
+    "eval_tokens", "eval_tps", "total_ms", "load_ms", "error",
+])
+
+
+def _rate(count, duration_ns):
+    """Tokens per second from a count and a duration in nanoseconds"""
+    return count / (duration_ns / 1e9) if count and duration_ns else None
+
+
+def _cell(value, fmt):
+    """Formats a measurement that may be missing, e.g. the TTFT of a reply with no content"""
+    return format(value, fmt) if value is not None else "-"
+
+
+def measure_prompt(client, model, prompt, options=None, on_response=None, on_final_chunk=None):
+    """
+    Sends one streamed chat request and measures it.
+
+    Args:
+        client (OllamaClient): Client to send the request with
+        model (str): Model to run
+        prompt (str): User message
+        options (dict, optional): Generation options, defaults to BENCHMARK_OPTIONS
+        on_response: Called with the open streaming Response, so it can be closed to cancel
+        on_final_chunk: Called with the final chunk and the time to first token in ms
+
+    Returns:
+        dict with ttft_ms, prompt_tokens, prompt_tps, eval_tokens, eval_tps, total_ms and load_ms
+    """
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "options": options or BENCHMARK_OPTIONS,
+    }
+    started = time.perf_counter()
+    response = client.chat(payload, stream=True, timeout=300)
+    if on_response:
+        on_response(response)
+    first_token_at = None
+    final_chunk = None
+    try:
+        for chunk in iter_json_lines(response):
+            if first_token_at is None and (chunk.get("message") or {}).get("content"):
+                first_token_at = time.perf_counter()
+            if chunk.get("done"):
+                final_chunk = chunk
+    finally:
+        response.close()
+    finished = time.perf_counter()
+    if final_chunk is None:
+        raise OllamaAPIError("Stream ended without the final statistics chunk")
+    ttft_ms = (first_token_at - started) * 1000 if first_token_at else None
+    if on_final_chunk:
+        on_final_chunk(final_chunk, ttft_ms)
+    return {
+        "ttft_ms": ttft_ms,
+        "prompt_tokens": final_chunk.get("prompt_eval_count", 0),
+        "prompt_tps": _rate(final_chunk.get("prompt_eval_count"), final_chunk.get("prompt_eval_duration")),
+        "eval_tokens": final_chunk.get("eval_count", 0),
+        "eval_tps": _rate(final_chunk.get("eval_count"), final_chunk.get("eval_duration")),
+        "total_ms": (finished - started) * 1000,
+        "load_ms": (final_chunk.get("load_duration") or 0) / 1e6,
+    }
+
+
+class BenchmarkStore:
+    """SQLite file holding every benchmark run and its per-prompt results"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started TEXT NOT NULL,
+            host TEXT,
+            server_url TEXT,
+            server_version TEXT,
+            models TEXT,
+            repeats INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            model TEXT NOT NULL,
+            prompt_id TEXT NOT NULL,
+            repeat INTEGER,
+            ttft_ms REAL,
+            prompt_tokens INTEGER,
+            prompt_tps REAL,
+            eval_tokens INTEGER,
+            eval_tps REAL,
+            total_ms REAL,
+            load_ms REAL,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS results_model ON results(model, run_id);
+    """
+
+    def __init__(self, path=None):
+        """
+        Open (and create if needed) the store
+
+        Args:
+            path (str, optional): Database file, defaults to benchmarks.db in the user data
+                directory; ":memory:" keeps the results for this process only
+        """
+        self.path = path or os.path.join(user_data_dir(), "benchmarks.db")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Written from the benchmark worker and read on the Tk thread, so access is serialized
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.executescript(self.SCHEMA)
+
+    def start_run(self, models, repeats, server_url=None, server_version=None):
+        """Records a new run and returns its id"""
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, host, server_url, server_version, models, repeats) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), platform.node(), server_url, server_version,
+                 ",".join(models), repeats))
+            return cursor.lastrowid
+
+    def add_result(self, run_id, result):
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO results (run_id, {', '.join(BenchmarkResult._fields)}) "
+                f"VALUES (?, {', '.join('?' * len(BenchmarkResult._fields))})",
+                (run_id, *result))
+
+    def run_results(self, run_id):
+        """Returns the BenchmarkResults of one run in the order they were measured"""
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(BenchmarkResult._fields)} FROM results WHERE run_id = ? ORDER BY rowid",
+                (run_id,)).fetchall()
+        return [BenchmarkResult(*row) for row in rows]
+
+    def latest_results(self, model):
+        """Returns (run started, results) for the most recent run that included model, or None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT runs.id, runs.started FROM runs JOIN results ON results.run_id = runs.id "
+                "WHERE results.model = ? ORDER BY runs.id DESC LIMIT 1", (model,)).fetchone()
+        if row is None:
+            return None
+        return row[1], [r for r in self.run_results(row[0]) if r.model == model]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class BenchmarkCancelled(Exception):
+    """Raised inside a BenchmarkRunner when the run was stopped"""
+
+
+class BenchmarkRunner:
+    """
+    Runs every prompt against every model, repeats times, one request at a time so
+    the measurements don't compete for the hardware. run() blocks; call it on a worker.
+    """
+
+    def __init__(self, models, prompts=None, repeats=3, warmup=True, store=None, client=None,
+                 on_result=None, on_final_chunk=None):
+        """
+        Initialize the runner
+
+        Args:
+            models (list): Models to benchmark
+            prompts (list, optional): (prompt id, prompt) pairs, defaults to DEFAULT_PROMPTS
+            repeats: Times each prompt is sent to each model
+            warmup: Load each model before measuring so load time doesn't skew the first prompt
+            store (BenchmarkStore, optional): Where results are saved
+            client: OllamaClient to use, defaults to the shared client
+            on_result: Called on the worker thread with (BenchmarkResult, finished count, total)
+            on_final_chunk: Called on the worker thread with (model, final chunk, time to first token ms)
+        """
+        self.models = list(models)
+        self.prompts = list(prompts or DEFAULT_PROMPTS)
+        self.repeats = repeats
+        self.warmup = warmup
+        self.store = store
+        self.client = client
+        self.on_result = on_result
+        self.on_final_chunk = on_final_chunk
+        self.run_id = None
+        self.cancelled = threading.Event()
+        self.response = None
+
+    @property
+    def total(self):
+        return len(self.models) * len(self.prompts) * self.repeats
+
+    def cancel(self):
+        """Stops the run; the request in flight is abandoned"""
+        self.cancelled.set()
+        response = self.response
+        if response is not None:
+            response.close()
+
+    def run(self):
+        """Performs the benchmark and returns the list of BenchmarkResult"""
+        client = self.client or get_client()
+        if self.store is not None:
+            try:
+                version = client.version()
+            except OllamaAPIError:
+                version = None
+            self.run_id = self.store.start_run(self.models, self.repeats, client.base_url, version)
+        results = []
+        for model in self.models:
+            if self.warmup and not self.cancelled.is_set():
+                try:
+                    client.load_model(model)
+                except OllamaAPIError:
+                    pass  # the measured requests report the failure for every prompt
+            for repeat in range(1, self.repeats + 1):
+                for prompt_id, prompt in self.prompts:
+                    if self.cancelled.is_set():
+                        raise BenchmarkCancelled()
+                    result = self._measure(client, model, prompt_id, prompt, repeat)
+                    results.append(result)
+                    if self.store is not None:
+                        self.store.add_result(self.run_id, result)
+                    if self.on_result:
+                        self.on_result(result, len(results), self.total)
+        return results
+
+    def _measure(self, client, model, prompt_id, prompt, repeat):
+        try:
+            on_final_chunk = None
+            if self.on_final_chunk:
+                on_final_chunk = lambda chunk, ttft_ms: self.on_final_chunk(model, chunk, ttft_ms)
+            measured = measure_prompt(client, model, prompt,
+                                      on_response=lambda response: setattr(self, "response", response),
+                                      on_final_chunk=on_final_chunk)
+            return BenchmarkResult(model, prompt_id, repeat, error=None, **measured)
+        except Exception as e:
+            if self.cancelled.is_set():
+                raise BenchmarkCancelled()
+            if not isinstance(e, OllamaAPIError):
+                e = f"{e.__class__.__name__}: {e}"
+            return BenchmarkResult(model, prompt_id, repeat, None, 0, None, 0, None, None, None, str(e))
+        finally:
+            self.response = None
+
+
+def summarize(results):
+    """
+    Reduces results to one row per model (in first-seen order) with the median of each metric.
+
+    Returns:
+        list of dicts with model, samples, errors, ttft_ms, prompt_tps, eval_tps and total_ms
+    """
+    by_model = {}
+    for result in results:
+        by_model.setdefault(result.model, []).append(result)
+    summary = []
+    for model, rows in by_model.items():
+        ok = [r for r in rows if not r.error]
+
+        def median(field):
+            values = [getattr(r, field) for r in ok if getattr(r, field) is not None]
+            return statistics.median(values) if values else None
+
+        summary.append({
+            "model": model, "samples": len(ok), "errors": len(rows) - len(ok),
+            "ttft_ms": median("ttft_ms"), "prompt_tps": median("prompt_tps"),
+            "eval_tps": median("eval_tps"), "total_ms": median("total_ms"),
+        })
+    return summary
+
+
+def format_summary(summary):
+    """Renders summarize() output as a fixed-width table"""
+    def cell(value, width, precision):
+        return f"{value:{width}.{precision}f}" if value is not None else f"{'-':>{width}}"
+    lines = [f"{'model':<28} {'ok':>4} {'err':>4} {'ttft ms':>9} {'prompt t/s':>11} {'eval t/s':>9} {'total ms':>9}"]
+    for row in summary:
+        lines.append(f"{row['model']:<28} {row['samples']:>4} {row['errors']:>4} "
+                     f"{cell(row['ttft_ms'], 9, 0)} {cell(row['prompt_tps'], 11, 1)} "
+                     f"{cell(row['eval_tps'], 9, 1)} {cell(row['total_ms'], 9, 0)}")
+    return "\n".join(lines)
+
+
+def run_headless(models, repeats=3, warmup=True, store_path=None, fake=False):
+    """
+    Runs a benchmark without the GUI, printing each result and a summary table.
+
+    Args:
+        models (list): Models to benchmark
+        repeats: Times each prompt is sent to each model
+        warmup: Load each model before measuring
+        store_path (str, optional): Results database, defaults to the user data directory
+        fake (bool): Benchmark against a local FakeOllamaServer instead of a real server,
+            for checking the harness offline; results go to memory unless store_path is given
+
+    Returns:
+        Process exit code: 0 when every request succeeded, 1 otherwise
+    """
+    from ollama_api import OllamaClient
+    server = None
+    client = None
+    if fake:
+        from ollama_fake_server import FakeOllamaServer, FakeOllamaState, make_model
+        server = FakeOllamaServer(state=FakeOllamaState(models=[make_model(m) for m in models], token_delay=0.002))
+        server.start()
+        client = OllamaClient(server.base_url)
+        store_path = store_path or ":memory:"
+
+    store = BenchmarkStore(store_path)
+
+    def report(result, finished, total):
+        if result.error:
+            print(f"[{finished}/{total}] {result.model} {result.prompt_id} #{result.repeat}: error {result.error}")
+        else:
+            print(f"[{finished}/{total}] {result.model} {result.prompt_id} #{result.repeat}: "
+                  f"ttft {_cell(result.ttft_ms, '.0f')} ms, eval {_cell(result.eval_tps, '.1f')} tok/s, "
+                  f"total {_cell(result.total_ms, '.0f')} ms")
+
+    runner = BenchmarkRunner(models, repeats=repeats, warmup=warmup, store=store, client=client, on_result=report)
+    try:
+        results = runner.run()
+    except KeyboardInterrupt:
+        runner.cancel()
+        print("Benchmark interrupted")
+        return 1
+    finally:
+        if server is not None:
+            server.stop()
+    print()
+    print(format_summary(summarize(results)))
+    if store.path != ":memory:":
+        print(f"\nSaved as run {runner.run_id} in {store.path}")
+    store.close()
+    return 0 if all(not r.error for r in results) else 1
+
+
+class BenchmarkDialog:
+    """Window that runs a benchmark over the selected models and shows the results as they arrive"""
+
+    COLUMNS = (("prompt", "Prompt", 100), ("repeat", "#", 30), ("ttft", "TTFT ms", 70),
+               ("prompt_tps", "Prompt t/s", 80), ("eval_tps", "Eval t/s", 70), ("total", "Total ms", 70))
+
+    def __init__(self, parent, models, store):
+        """
+        Initialize the dialog
+
+        Args:
+            parent: Parent application reference (provides master and tasks)
+            models (list): Models to benchmark
+            store (BenchmarkStore): Where results are saved and previous runs are read from
+        """
+        self.parent = parent
+        self.models = list(models)
+        self.store = store
+        self.runner = None
+
+        self.window = tk.Toplevel(parent.master)
+        self.window.title(f"Benchmark - {len(self.models)} model(s)")
+        self.window.geometry("620x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=10, pady=(10, 5))
+        ttk.Label(controls, text="Repeats:").pack(side=tk.LEFT)
+        self.repeats_var = tk.IntVar(value=3)
+        ttk.Spinbox(controls, from_=1, to=20, width=3, textvariable=self.repeats_var).pack(side=tk.LEFT, padx=5)
+        self.warmup_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(controls, text="Load models first", variable=self.warmup_var).pack(side=tk.LEFT, padx=5)
+        self.run_button = ttk.Button(controls, text="Run", command=self.start)
+        self.run_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Stop", command=self.stop).pack(side=tk.LEFT)
+        self.progress = ttk.Progressbar(controls, orient=tk.HORIZONTAL, mode="determinate")
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+
+        self.tree = ttk.Treeview(self.window, columns=[c[0] for c in self.COLUMNS], height=10)
+        self.tree.heading("#0", text="Model")
+        self.tree.column("#0", width=150)
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        self.summary_text = scrolledtext.ScrolledText(self.window, height=8, wrap=tk.NONE, font=("Consolas", 8),
+                                                      state=tk.DISABLED)
+        self.summary_text.pack(fill=tk.X, padx=10, pady=10)
+        self.show_previous()
+
+    def show_previous(self):
+        """Shows each model's summary from its most recent stored run"""
+        lines = []
+        for model in self.models:
+            latest = self.store.latest_results(model)
+            if latest:
+                started, results = latest
+                lines.append(f"Last run {started}:")
+                lines.append(format_summary(summarize(results)))
+        self.show_summary("\n".join(lines) or "No previous benchmark runs for these models.")
+
+    def start(self):
+        if self.runner is not None:
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.runner = BenchmarkRunner(
+            self.models, repeats=max(1, self.repeats_var.get()), warmup=self.warmup_var.get(), store=self.store,
+            on_result=lambda result, finished, total: self.parent.tasks.post(self.result_arrived, result, finished, total),
+            on_final_chunk=lambda model, chunk, ttft_ms: self.parent.tasks.post(
+                self.parent.model_metrics.record_response, model, chunk, ttft_ms))
+        self.progress.config(maximum=self.runner.total, value=0)
+        self.run_button.config(state=tk.DISABLED)
+        self.show_summary("Running...")
+        self.parent.tasks.submit(self.runner.run, on_done=self.finished, on_error=self.failed)
+
+    def stop(self):
+        if self.runner is not None:
+            self.runner.cancel()
+
+    def result_arrived(self, result, finished, total):
+        if not self.window.winfo_exists():
+            return
+        if result.error:
+            values = (result.prompt_id, result.repeat, "error", "", "", result.error)
+        else:
+            values = (result.prompt_id, result.repeat, _cell(result.ttft_ms, ".0f"), _cell(result.prompt_tps, ".1f"),
+                      _cell(result.eval_tps, ".1f"), _cell(result.total_ms, ".0f"))
+        item = self.tree.insert("", tk.END, text=result.model, values=values)
+        self.tree.see(item)
+        self.progress["value"] = finished
+
+    def finished(self, results):
+        run_id = self.runner.run_id
+        self.runner = None
+        if self.window.winfo_exists():
+            self.run_button.config(state=tk.NORMAL)
+            self.show_summary(f"Run {run_id}, medians:\n" + format_summary(summarize(results)))
+
+    def failed(self, e):
+        self.runner = None
+        if self.window.winfo_exists():
+            self.run_button.config(state=tk.NORMAL)
+            self.show_summary("Benchmark stopped." if isinstance(e, BenchmarkCancelled) else f"Benchmark failed: {e}")
+
+    def show_summary(self, text):
+        self.summary_text.config(state=tk.NORMAL)
+        self.summary_text.delete("1.0", tk.END)
+        self.summary_text.insert(tk.END, text)
+        self.summary_text.config(state=tk.DISABLED)
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
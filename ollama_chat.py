@@ -0,0 +1,330 @@
+"""
+Chat helpers for Ollama GUI
+Runs /api/chat requests on a worker and streams the tokens into the chat pane's output sink
+"""
+
+import threading
+import time
+
+from ollama_api import get_client, iter_json_lines, OllamaConnectionError
+
+
+class ChatStreamRenderer:
+    """
+    Feeds streamed tokens from a worker thread into the chat pane's OutputSink, which
+    appends them once per frame, and records when the first token arrived and became visible
+    """
+
+    def __init__(self, sink, tag="ai"):
+        """
+        Initialize the renderer
+
+        Args:
+            sink (OutputSink): The chat pane's output sink
+            tag: Text tag applied to the streamed content
+        """
+        self.sink = sink
+        self.tag = tag
+        self.started_at = None
+        self.first_token_at = None    # first content chunk received by the worker
+        self.first_visible_at = None  # first content inserted into the widget
+        self.finished_at = None
+        self.tokens_received = 0
+        self.parts = []  # everything fed, for storing the reply once it is complete
+        self._start_flushes = 0
+
+    def start(self):
+        """Marks the start of the request; call on the Tk thread"""
+        self.started_at = time.perf_counter()
+        self._start_flushes = self.sink.flushes
+
+    def feed(self, text):
+        """Queues streamed text for the next frame; safe to call from any thread"""
+        if not text:
+            return
+        on_flush = None
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            on_flush = self._mark_visible
+        self.tokens_received += 1
+        self.parts.append(text)
+        self.sink.write(text, self.tag, on_flush=on_flush)
+
+    def _mark_visible(self):
+        if self.first_visible_at is None:
+            self.first_visible_at = time.perf_counter()
+
+    def finish(self):
+        """Writes out anything still buffered and stops the clock; call on the Tk thread"""
+        self.sink.flush()
+        self.finished_at = time.perf_counter()
+
+    @property
+    def text(self):
+        """The reply received so far"""
+        return "".join(self.parts)
+
+    @property
+    def frames(self):
+        """Number of widget updates the reply took"""
+        return self.sink.flushes - self._start_flushes
+
+    def timings(self):
+        """Returns time-to-first-token, time-to-first-visible-token and total time in ms"""
+        def since_start(moment):
+            return (moment - self.started_at) * 1000 if moment is not None and self.started_at is not None else None
+        return {
+            "first_token_ms": since_start(self.first_token_at),
+            "first_visible_ms": since_start(self.first_visible_at),
+            "total_ms": since_start(self.finished_at),
+        }
+
+
+def estimate_tokens(text):
+    """
+    Rough token count of text for budgeting: about four characters per token for English
+    prose, plus a few tokens of chat-template framing per message
+    """
+    return len(text) // 4 + 4
+
+
+class Conversation:
+    """
+    Message history of one chat, kept as (role, content, tokens) tuples, that assembles
+    the /api/chat messages array under a token budget. The system prompt is always sent;
+    older turns are dropped first once the budget is exceeded. Runs on the Tk thread.
+    """
+
+    def __init__(self, system_prompt=None, token_budget=1536, trim_to=0.75):
+        """
+        Initialize the conversation
+
+        Args:
+            system_prompt (str, optional): Pinned at the start of every request
+            token_budget: Most prompt tokens a request may carry, system prompt included;
+                keep it below the model's num_ctx so the reply still fits
+            trim_to: When the budget is exceeded, older turns are dropped until the prompt
+                is within this fraction of the budget. Dropping in one larger step keeps
+                the start of the history unchanged for the next few requests, so the
+                server can reuse its cached prompt instead of evaluating it again.
+        """
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.trim_to = trim_to
+        self.messages = []  # (role, content, tokens)
+        self.first_sent = 0  # index of the oldest message still sent
+
+    def add(self, role, content, tokens=None):
+        """
+        Appends a message
+
+        Args:
+            role (str): "user" or "assistant"
+            content (str): The message text
+            tokens (int, optional): Exact token count when known, e.g. a reply's eval_count
+        """
+        self.messages.append((role, content, tokens or estimate_tokens(content)))
+
+    def discard_unanswered(self):
+        """
+        Removes the newest message if it is a user message, i.e. a question whose request
+        failed or was cancelled, so the next request doesn't send two questions in a row
+        """
+        if self.messages and self.messages[-1][0] == "user":
+            self.messages.pop()
+            self.first_sent = min(self.first_sent, len(self.messages))
+
+    def clear(self):
+        self.messages = []
+        self.first_sent = 0
+
+    def _tokens(self, start):
+        system = estimate_tokens(self.system_prompt) if self.system_prompt else 0
+        return system + sum(tokens for _, _, tokens in self.messages[start:])
+
+    def _trim(self):
+        """Moves first_sent forward, a whole turn at a time, until the prompt fits the budget"""
+        if self._tokens(self.first_sent) <= self.token_budget:
+            return
+        target = self.token_budget * self.trim_to
+        last = len(self.messages) - 1  # the newest message is always sent
+        start = self.first_sent
+        while start < last and self._tokens(start) > target:
+            start += 1
+            # Never start on a reply whose question was dropped
+            while start < last and self.messages[start][0] == "assistant":
+                start += 1
+        self.first_sent = start
+
+    def build_payload(self, model, **fields):
+        """
+        Returns (payload, context) for the next request.
+
+        Args:
+            model (str): Model to send the conversation to
+            **fields: Further request fields, e.g. keep_alive or options
+
+        Returns:
+            The /api/chat request body, and a dict with the estimated prompt tokens, the
+            number of messages sent and the number of older messages dropped
+        """
+        self._trim()
+        messages = [{"role": "system", "content": self.system_prompt}] if self.system_prompt else []
+        messages += [{"role": role, "content": content} for role, content, _ in self.messages[self.first_sent:]]
+        context = {
+            "tokens": self._tokens(self.first_sent),
+            "messages": len(messages),
+            "dropped": self.first_sent,
+        }
+        return dict(fields, model=model, messages=messages), context
+
+
+class ChatCancelled(Exception):
+    """Raised inside a ChatWorker when the request was stopped by the user"""
+
+
+class ChatWorker:
+    """
+    Runs one /api/chat request on the task pool.
+    The request always uses the streaming protocol so cancel() can close the open
+    response and the server frees its slot immediately; with stream=False the reply
+    is only handed to the renderer once it is complete.
+    """
+
+    def __init__(self, payload, renderer, stream=True, max_retries=3, retry_delay=1.0, client=None):
+        """
+        Initialize the worker
+
+        Args:
+            payload (dict): The chat request body
+            renderer (ChatStreamRenderer): Receives the content tokens
+            stream (bool): Render tokens as they arrive rather than all at once
+            max_retries: Connection attempts before giving up
+            retry_delay: Seconds to wait between attempts
+            client: OllamaClient to use, defaults to the shared client
+        """
+        self.payload = payload
+        self.renderer = renderer
+        self.stream = stream
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.client = client
+        self.on_retry = None
+        self.cancelled = threading.Event()
+        self.response = None
+        self.future = None
+        self._connecting = None  # Event set when the pending request returns, or on cancel
+
+    def start(self, tasks, on_done=None, on_error=None, on_retry=None):
+        """Submits the request to a TaskRunner; callbacks run on the Tk thread"""
+        self.on_retry = on_retry
+        self.future = tasks.submit(self.run, on_done=on_done, on_error=on_error)
+        return self
+
+    def is_active(self):
+        return self.future is not None and not self.future.done()
+
+    def cancel(self):
+        """Stops the request; closing the open stream tells the server to abandon it"""
+        self.cancelled.set()
+        connecting = self._connecting
+        if connecting is not None:
+            connecting.set()  # stop waiting for headers, e.g. during a long model load
+        response = self.response
+        if response is not None:
+            response.close()
+
+    def _connect(self):
+        client = self.client or get_client()
+        retry_count = 0
+        while True:
+            try:
+                return self._open_stream(client)
+            except OllamaConnectionError:
+                retry_count += 1
+                if retry_count >= self.max_retries or self.cancelled.is_set():
+                    raise
+                if self.on_retry:
+                    self.on_retry(retry_count)
+                # Waiting on the event lets Stop interrupt the back-off
+                if self.cancelled.wait(self.retry_delay):
+                    raise ChatCancelled()
+
+    def _open_stream(self, client):
+        """
+        Sends the request on a helper thread and waits until the response headers arrive
+        or the request is cancelled. requests offers no way to abort a request that is
+        still waiting for headers, so on cancel the helper is left to finish on its own
+        and closes the response as soon as it gets one.
+        """
+        outcome = {}
+        lock = threading.Lock()  # decides whether the worker or the helper owns the response
+        connecting = threading.Event()
+        self._connecting = connecting
+        if self.cancelled.is_set():
+            raise ChatCancelled()  # cancel() ran before _connecting was published
+
+        def request():
+            try:
+                response, error = client.chat(self.payload, stream=True), None
+            except Exception as e:
+                response, error = None, e
+            with lock:
+                abandoned = outcome.get("abandoned", False)
+                if not abandoned:
+                    outcome["response"], outcome["error"] = response, error
+            if abandoned and response is not None:
+                response.close()  # the worker gave up on it; tells the server to stop
+            connecting.set()
+
+        threading.Thread(target=request, name="chat-connect", daemon=True).start()
+        connecting.wait()
+        self._connecting = None
+        with lock:
+            if "response" not in outcome:
+                outcome["abandoned"] = True
+                raise ChatCancelled()  # woken by cancel() before the server answered
+        if outcome["error"] is not None:
+            raise outcome["error"]
+        return outcome["response"]
+
+    def run(self):
+        """
+        Performs the request on the calling (worker) thread.
+
+        Returns:
+            The final chunk of the stream (carries eval_count, eval_duration, ...)
+        """
+        response = self._connect()
+        self.response = response
+        if self.cancelled.is_set():
+            response.close()
+            raise ChatCancelled()
+
+        final_chunk = {}
+        parts = []
+        try:
+            for chunk in iter_json_lines(response):
+                if self.cancelled.is_set():
+                    raise ChatCancelled()
+                content = (chunk.get("message") or {}).get("content", "")
+                if self.stream:
+                    self.renderer.feed(content)
+                else:
+                    parts.append(content)
+                if chunk.get("done"):
+                    final_chunk = chunk
+        except ChatCancelled:
+            raise
+        except Exception:
+            # Closing the response from cancel() surfaces here as a read error
+            if self.cancelled.is_set():
+                raise ChatCancelled()
+            raise
+        finally:
+            response.close()
+        if self.cancelled.is_set() and not final_chunk:
+            raise ChatCancelled()
+        if parts:
+            self.renderer.feed("".join(parts))
+        return final_chunk
@@ -1,6 +1,8 @@
 from tkinter import simpledialog, messagebox
 import subprocess
-from ollama_functions import log_message, populate_models_list
+from ollama_functions import log_message
+from ollama_pull import PullPanel, DONE, FAILED, CANCELLED
+from ollama_batch import OPERATIONS
 
 def get_selected_model(gui):
     """
@@ -14,15 +16,66 @@ def get_selected_model(gui):
     else:
         return None
 
+def refresh_inventory(gui, available=True, running=True):
+    """
+    Invalidates the shared model inventory after a command that changes it. The fetch
+    runs on the task pool and the lists are repainted from its diff on the Tk thread.
+    """
+    gui.inventory.invalidate(available=available, running=running)
+    gui.tasks.submit(gui.poll_inventory, on_done=gui.apply_inventory_changes,
+                     on_error=gui.report_monitor_failure)
+
 def pull_model(gui):
     """
-    Pulls a model. Will use the selected model as the default value if available.
+    Queues one or more models (separated by spaces or commas) on the pull manager and
+    opens the pull panel. Will use the selected model as the default value if available.
     """
     default_model = get_selected_model(gui) or ""
-    model_name = simpledialog.askstring("Pull Model", "Enter model name to pull:", initialvalue=default_model)
-    if model_name:
-        log_message(gui, f"Pulling model: {model_name}", gui.checking_color)
-        gui.run_command(["ollama", "pull", model_name])
+    model_names = simpledialog.askstring("Pull Model", "Enter model name(s) to pull:", initialvalue=default_model)
+    if model_names:
+        names = model_names.replace(",", " ").split()
+        log_message(gui, f"Queued for pulling: {', '.join(names)}", gui.checking_color)
+        show_pull_panel(gui)
+        gui.pull_manager.enqueue(names)
+
+def show_pull_panel(gui):
+    """
+    Opens the pull panel, or raises it if it is already open.
+    """
+    if gui.pull_panel is None:
+        def closed():
+            gui.pull_panel = None
+        gui.pull_panel = PullPanel(gui, gui.pull_manager, on_close=closed)
+    else:
+        gui.pull_panel.window.lift()
+
+def pull_job_updated(gui, job):
+    """
+    Called by the pull manager on the Tk thread whenever a pull makes progress or changes state.
+    """
+    if gui.pull_panel is not None:
+        gui.pull_panel.update_job(job)
+
+def pull_job_finished(gui, job):
+    """
+    Called by the pull manager on the Tk thread once per pull, when it has finished.
+    """
+    if job.state == DONE:
+        log_message(gui, f"Pulled {job.name} ({job.attempts} attempt(s))", gui.found_color)
+    elif job.state == FAILED:
+        log_message(gui, f"Pull of {job.name} failed: {job.error}", gui.not_found_color)
+
+def pulls_finished(gui, jobs):
+    """
+    Called once the pull queue has drained; refreshes the inventory a single time for the whole batch.
+    """
+    done = sum(1 for job in jobs if job.state == DONE)
+    failed = sum(1 for job in jobs if job.state == FAILED)
+    cancelled = sum(1 for job in jobs if job.state == CANCELLED)
+    log_message(gui, f"Pull queue finished: {done} pulled, {failed} failed, {cancelled} cancelled",
+                gui.found_color if not failed else gui.checking_color)
+    if done:
+        refresh_inventory(gui)
 
 def create_model(gui):
     """
@@ -34,7 +87,7 @@ def create_model(gui):
         file_path = simpledialog.askstring("Create Model", "Enter path to Modelfile:")
         if file_path:
             log_message(gui, f"Creating model: {model_name} from {file_path}", gui.checking_color)
-            gui.run_command(["ollama", "create", model_name, "-f", file_path])
+            gui.run_command(["ollama", "create", model_name, "-f", file_path], on_complete=lambda code: refresh_inventory(gui))
 
 def serve_ollama(gui):
     """
@@ -90,7 +143,7 @@ def cp_model(gui):
         destination_model = simpledialog.askstring("Copy Model", "Enter destination model name:")
         if destination_model:
             log_message(gui, f"Copying model: {source_model} to {destination_model}", gui.checking_color)
-            gui.run_command(["ollama", "cp", source_model, destination_model])
+            gui.run_command(["ollama", "cp", source_model, destination_model], on_complete=lambda code: refresh_inventory(gui))
 
 def rm_model(gui):
     """
@@ -105,8 +158,51 @@ def rm_model(gui):
                                     icon=messagebox.WARNING)
         if confirm:
             log_message(gui, f"Removing model: {model_name}", gui.checking_color)
-            gui.run_command(["ollama", "rm", model_name])
-            # Refresh the available models list after deletion
-            populate_models_list(gui)
+            # Refresh the available models list once the deletion has finished
+            gui.run_command(["ollama", "rm", model_name], on_complete=lambda code: refresh_inventory(gui))
         else:
             log_message(gui, f"Removal of model '{model_name}' cancelled.", gui.cancelled_color)
+
+def warm_up_model(gui, model_name, force=False):
+    """
+    Loads a model in the background with the warm-up keep_alive. Models that are already
+    running are skipped unless force is set (which also extends their keep_alive).
+    """
+    if not force and model_name in gui.inventory.running_names():
+        return
+    gui.model_warmer.warm(model_name)
+    log_message(gui, f"Warming up {model_name}...", gui.checking_color)
+
+def warmup_finished(gui, record):
+    """
+    Called by the model warmer on the Tk thread when a warm-up request completes.
+    """
+    if record.error:
+        log_message(gui, f"Warm-up of {record.model} failed: {record.error}", gui.not_found_color)
+        return
+    keep = "until unmarked" if record.keep_alive == -1 else f"for {record.keep_alive}"
+    log_message(gui, f"{record.model} is loaded (load_duration {record.load_ms:.0f} ms, "
+                     f"request {record.wall_ms:.0f} ms), kept resident {keep}", gui.found_color)
+    gui.model_metrics.record_response(record.model, record.reply)
+    # Show it in the running list
+    refresh_inventory(gui, available=False)
+
+def batch_started(gui, operation):
+    """
+    Called when a batch operation starts; holds off the monitor for operations that
+    change the inventory so the batch ends with a single refresh.
+    """
+    if OPERATIONS[operation][1]:
+        gui.batch_active = True
+
+def batch_finished(gui, operation, results):
+    """
+    Called once a batch copy/remove has finished; refreshes the inventory a single time
+    for the whole batch and resumes the monitor.
+    """
+    gui.batch_active = False
+    succeeded = sum(1 for result in results if result.ok)
+    log_message(gui, f"Batch {operation}: {succeeded} of {len(results)} model(s) succeeded",
+                gui.found_color if succeeded == len(results) else gui.checking_color)
+    if succeeded:
+        refresh_inventory(gui)
@@ -0,0 +1,350 @@
+"""
+Stand-in Ollama HTTP server
+Answers the REST endpoints the GUI uses from canned data so the client code can be
+exercised offline. Run it directly to point the GUI at it:
+
+    python ollama_fake_server.py --port 11435
+    OLLAMA_HOST=127.0.0.1:11435 python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_digest(name):
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def make_model(name, size=1_000_000_000, family="llama", parameter_size="1B", quantization="Q4_K_M"):
+    """Builds a /api/tags style model entry"""
+    return {
+        "name": name,
+        "model": name,
+        "modified_at": "2024-01-01T00:00:00Z",
+        "size": size,
+        "digest": fake_digest(name),
+        "details": {
+            "format": "gguf",
+            "family": family,
+            "families": [family],
+            "parameter_size": parameter_size,
+            "quantization_level": quantization,
+        },
+    }
+
+
+DEFAULT_REPLY = "This is a canned reply from the fake Ollama server."
+
+
+class FakeOllamaState:
+    """Mutable model inventory and generation behaviour served by FakeOllamaServer"""
+
+    def __init__(self, models=None, running=None, reply=DEFAULT_REPLY, token_delay=0.0):
+        self.lock = threading.Lock()
+        self.models = {m["name"]: m for m in (models or [make_model("smollm2:135m", 270_000_000, parameter_size="135M")])}
+        self.running = set(running or [])
+        self.reply = reply
+        self.token_delay = token_delay  # seconds between streamed tokens
+        self.load_duration = 0.25  # seconds reported for a cold model load
+        self.keep_alive = {}  # name -> keep_alive of the last request that used the model
+        self.pullable = {}  # name -> size in bytes of models /api/pull can fetch
+        self.pull_steps = 20  # progress chunks per layer
+        self.pull_delay = 0.0  # seconds between progress chunks
+        self.pull_progress = {}  # name -> {digest: completed bytes}, so retries resume
+        self.pull_interruptions = {}  # name -> number of pulls to cut off midway
+        self.request_log = []
+        self.aborted_streams = 0  # streams the client closed before the final chunk
+
+    def tokens(self):
+        words = self.reply.split(" ")
+        return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Like the real server (Go sets TCP_NODELAY); otherwise Nagle plus delayed ACKs hold
+    # each streamed chunk on a reused connection for ~40 ms and skew time-to-first-token
+    disable_nagle_algorithm = True
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass  # keep stdout quiet
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def do_GET(self):
+        with self.state.lock:
+            self.state.request_log.append(("GET", self.path))
+        if self.path == "/api/tags":
+            with self.state.lock:
+                self._send_json({"models": list(self.state.models.values())})
+        elif self.path == "/api/ps":
+            with self.state.lock:
+                running = []
+                for name in sorted(self.state.running):
+                    model = self.state.models.get(name)
+                    if model:
+                        running.append(dict(model, size_vram=model["size"], expires_at="2099-01-01T00:00:00Z"))
+            self._send_json({"models": running})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = self._read_json()
+        with self.state.lock:
+            self.state.request_log.append(("POST", self.path))
+        if self.path in ("/api/chat", "/api/generate"):
+            self._generate(body, chat=self.path == "/api/chat")
+        elif self.path == "/api/pull":
+            self._pull(body)
+        elif self.path == "/api/copy":
+            source, destination = body.get("source", ""), body.get("destination", "")
+            with self.state.lock:
+                model = self.state.models.get(source)
+                if model:
+                    self.state.models[destination] = dict(model, name=destination, model=destination)
+            if model:
+                self._send_json({})
+            else:
+                self._send_json({"error": f"model '{source}' not found"}, status=404)
+        elif self.path == "/api/show":
+            name = body.get("model") or body.get("name", "")
+            with self.state.lock:
+                model = self.state.models.get(name)
+            if not model:
+                self._send_json({"error": f"model '{name}' not found"}, status=404)
+                return
+            details = model["details"]
+            self._send_json({
+                "modelfile": f"FROM {name}\n",
+                "parameters": 'stop "<|end|>"',
+                "template": "{{ .Prompt }}",
+                "details": details,
+                "model_info": {
+                    "general.architecture": details["family"],
+                    f"{details['family']}.context_length": 8192,
+                    f"{details['family']}.embedding_length": 2048,
+                },
+                "capabilities": ["completion"],
+            })
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_DELETE(self):
+        body = self._read_json()
+        with self.state.lock:
+            self.state.request_log.append(("DELETE", self.path))
+        if self.path != "/api/delete":
+            self._send_json({"error": "not found"}, status=404)
+            return
+        name = body.get("model") or body.get("name", "")
+        with self.state.lock:
+            model = self.state.models.pop(name, None)
+            self.state.running.discard(name)
+        if model:
+            self._send_json({})
+        else:
+            self._send_json({"error": f"model '{name}' not found"}, status=404)
+
+    def _write_chunk(self, payload):
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _generate(self, body, chat):
+        """Answers /api/chat and /api/generate, streaming one chunk per word by default"""
+        name = body.get("model", "")
+        with self.state.lock:
+            known = name in self.state.models
+            cold = name not in self.state.running
+            if known:
+                self.state.running.add(name)
+            tokens = self.state.tokens()
+            delay = self.state.token_delay
+            load_duration = self.state.load_duration if cold else 0.0
+            if known and "keep_alive" in body:
+                self.state.keep_alive[name] = body["keep_alive"]
+                if body["keep_alive"] in (0, "0", "0s"):
+                    self.state.running.discard(name)  # keep_alive 0 unloads after the request
+        if not known:
+            self._send_json({"error": f"model '{name}' not found"}, status=404)
+            return
+
+        if chat:
+            prompt = " ".join(m.get("content", "") for m in body.get("messages") or [])
+        else:
+            prompt = body.get("prompt", "")
+        if not prompt:
+            tokens = []  # empty prompt only loads the model
+
+        started = time.perf_counter()
+        prompt_tokens = max(1, len(prompt.split()))
+
+        def make_chunk(text, done):
+            chunk = {"model": name, "created_at": "2024-01-01T00:00:00Z", "done": done}
+            if chat:
+                chunk["message"] = {"role": "assistant", "content": text}
+            else:
+                chunk["response"] = text
+            return chunk
+
+        def final_chunk():
+            total = time.perf_counter() - started + load_duration
+            eval_duration = max(delay * len(tokens), 1e-3)
+            chunk = make_chunk("", True)
+            chunk.update({
+                "done_reason": "stop" if tokens else "load",
+                "total_duration": int(total * 1e9),
+                "load_duration": int(load_duration * 1e9),
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prompt_tokens * 1e6),
+                "eval_count": len(tokens),
+                "eval_duration": int(eval_duration * 1e9),
+            })
+            return chunk
+
+        if not body.get("stream", True):
+            if load_duration:
+                time.sleep(load_duration)
+            time.sleep(delay * len(tokens))
+            reply = final_chunk()
+            reply.update({k: v for k, v in make_chunk("".join(tokens), True).items() if k in ("message", "response")})
+            self._send_json(reply)
+            return
+
+        # Like the real server, the headers only go out once the model is loaded
+        if load_duration:
+            time.sleep(load_duration)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                if delay:
+                    time.sleep(delay)
+                self._write_chunk(make_chunk(token, False))
+            self._write_chunk(final_chunk())
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            with self.state.lock:
+                self.state.aborted_streams += 1
+            self.close_connection = True
+
+
+    def _pull(self, body):
+        """Streams /api/pull progress for a pullable model, resuming any earlier partial download"""
+        name = body.get("model") or body.get("name", "")
+        with self.state.lock:
+            size = self.state.pullable.get(name)
+            if size is None and name in self.state.models:
+                size = self.state.models[name]["size"]
+            progress = self.state.pull_progress.setdefault(name, {})
+            interrupt = self.state.pull_interruptions.get(name, 0) > 0
+            if interrupt:
+                self.state.pull_interruptions[name] -= 1
+            steps, delay = self.state.pull_steps, self.state.pull_delay
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self._write_chunk({"status": "pulling manifest"})
+            if size is None:
+                self._write_chunk({"error": "pull model manifest: file does not exist"})
+                self.wfile.write(b"0\r\n\r\n")
+                return
+            layers = [("sha256:" + fake_digest(name + ":weights"), size), ("sha256:" + fake_digest(name + ":params"), 512)]
+            sent = 0
+            for digest, total in layers:
+                step = max(1, total // steps)
+                completed = progress.get(digest, 0)
+                while True:
+                    self._write_chunk({"status": f"pulling {digest[7:19]}", "digest": digest, "total": total, "completed": completed})
+                    if completed >= total:
+                        break
+                    if delay:
+                        time.sleep(delay)
+                    completed = min(total, completed + step)
+                    with self.state.lock:
+                        progress[digest] = completed
+                    sent += 1
+                    if interrupt and sent == steps // 2:
+                        self.close_connection = True
+                        return  # drop the connection mid-download, like a network failure
+            for status in ("verifying sha256 digest", "writing manifest", "success"):
+                self._write_chunk({"status": status})
+            with self.state.lock:
+                self.state.models.setdefault(name, make_model(name, size))
+                self.state.pull_progress.pop(name, None)
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            with self.state.lock:
+                self.state.aborted_streams += 1
+            self.close_connection = True
+
+
+class FakeOllamaServer:
+    """Runs FakeOllamaHandler on a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, state=None):
+        self.state = state or FakeOllamaState()
+        self.httpd = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve canned Ollama API responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    args = parser.parse_args()
+    server = FakeOllamaServer(args.host, args.port)
+    print(f"Fake Ollama server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,21 +1,39 @@
 import os
 import platform
-import subprocess
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import threading
-import queue
-import re
-import time  # Added missing import for sleep functionality
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import shutil  # Added missing import
-import requests  # added import
+from ollama_process import CommandRunner
+from ollama_api import get_client, OllamaAPIError, format_model_details, format_running_instance
+from ollama_location import save_location, probe_version, default_cache_path
 
 MAX_DEPTH = 5  # Limit the search depth
+SEARCH_WORKERS = 8  # Directories scanned concurrently by the broad search
+EXECUTABLE_NAMES = {"ollama", "ollama.exe"}
+
+# Filesystem types that never hold an installation (kernel views, RAM disks) or are slow
+# to walk (network mounts); their mount points are skipped without being opened. squashfs
+# is where snaps are mounted, but a snap is started through /snap/bin, which is not pruned.
+PRUNED_FS_TYPES = {
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "ramfs", "cgroup", "cgroup2", "debugfs",
+    "tracefs", "securityfs", "pstore", "bpf", "configfs", "fusectl", "mqueue", "hugetlbfs",
+    "binfmt_misc", "autofs", "nsfs", "efivarfs", "squashfs",
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "afs",
+}
+PRUNED_DIRS = {
+    "Linux": {"/proc", "/sys", "/dev", "/run", "/tmp", "/var/lib/docker", "/lost+found"},
+    "Darwin": {"/dev", "/System", "/Volumes", "/private/var/vm", "/cores"},
+}
+PRUNED_NAMES = {"$recycle.bin", "system volume information", "windows", ".git", "node_modules", "__pycache__"}
 
 def find_ollama(gui):
     """
     Finds the Ollama installation directory by scanning common installation locations first,
-    then falling back to a broader search if needed.
+    then falling back to a broader, concurrent search if needed (see scan_for_executable).
     Yields potential paths to the Ollama executable.
     """
     # Define common installation locations to check first
@@ -36,6 +54,7 @@ def find_ollama(gui):
             "/usr/local/bin",
             "/usr/bin",
             "/opt/ollama",
+            "/snap/bin",  # snap wrapper; the snap's own squashfs mount is pruned from the broad search
             os.path.expanduser("~/ollama"),
             os.path.expanduser("~/.local/bin")
         ]
@@ -68,99 +87,163 @@ def find_ollama(gui):
     else:
         drives = ["/"]  # Start at the root for Linux/macOS
 
-    for drive in drives:
-        for root, _, files in os.walk(drive):
-            depth = root[len(drive) :].count(os.sep)
-            if depth > MAX_DEPTH:
-                continue  # Skip directories deeper than MAX_DEPTH
+    path = scan_for_executable(drives, lambda: not gui.searching, log=lambda m: gui.log_message(m, gui.checking_color))
+    if path:
+        gui.log_message(f"Checking path: {path}", gui.checking_color)
+        yield path
 
-            for file in files:
-                if file.lower() == "ollama.exe" or file.lower() == "ollama":
-                    path = os.path.join(root, file)
-                    gui.log_message(f"Checking path: {path}", gui.checking_color)
-                    yield path
+def pruned_mount_points():
+    """
+    Returns the directories the broad search must not enter: pseudo-filesystems, network
+    mounts and other per-platform system directories. Mount points come from /proc/mounts
+    where available, so nothing under them is ever listed.
+    """
+    pruned = set(PRUNED_DIRS.get(platform.system(), ()))
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] in PRUNED_FS_TYPES:
+                    pruned.add(fields[1].replace("\\040", " "))
+    except OSError:
+        pass  # not Linux
+    return pruned
 
-def get_ollama_models():
+def _scan_directory(path, depth, max_depth, pruned, stop):
     """
-    Runs 'ollama list' and returns a list of available models.
-    Returns an empty list if Ollama is not found or no models are available.
+    Lists one directory for the broad search.
+    Returns (matching executables, subdirectories to descend into); subdirectories are
+    only returned while they are still within max_depth.
     """
+    matches, subdirs = [], []
+    if stop.is_set():
+        return matches, subdirs
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, check=True)
-        models = [line.split()[0] for line in result.stdout.splitlines()[1:]]  # Skip header line
-        return models
-    except FileNotFoundError:
-        print("Ollama not found in PATH.")
-        return []
-    except subprocess.CalledProcessError as e:
-        print(f"Error running 'ollama list': {e}")
-        return []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < max_depth and name not in PRUNED_NAMES and entry.path not in pruned:
+                            subdirs.append(entry.path)
+                    elif name in EXECUTABLE_NAMES and entry.is_file():
+                        matches.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass  # unreadable or vanished directory
+    return matches, subdirs
 
-def get_running_ollama_models():
+def scan_for_executable(roots, should_stop, max_depth=MAX_DEPTH, workers=SEARCH_WORKERS, log=None):
+    """
+    Searches the given roots for the Ollama executable with a pool of scandir workers.
+    Pseudo-filesystems and network mounts are pruned before descending, and directories
+    deeper than max_depth are never listed.
+
+    Args:
+        roots (list): Directories to start from
+        should_stop: Callable polled while searching; returning True abandons the search
+        max_depth: Deepest directory level below a root that is still listed
+        workers: Number of directories listed concurrently
+        log: Optional callable receiving progress messages
+
+    Returns:
+        The path of the first executable found, or None
+    """
+    pruned = pruned_mount_points()
+    stop = threading.Event()
+    started = time.perf_counter()
+    scanned = 0
+    found = None
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ollama-search")
+    try:
+        pending = {executor.submit(_scan_directory, root, 0, max_depth, pruned, stop): 0 for root in roots}
+        while pending and found is None:
+            if should_stop():
+                break
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                matches, subdirs = future.result()
+                scanned += 1
+                if matches:
+                    found = matches[0]
+                    break
+                for subdir in subdirs:
+                    pending[executor.submit(_scan_directory, subdir, depth + 1, max_depth, pruned, stop)] = depth + 1
+    finally:
+        # Queued directories are dropped and running workers return at their next check
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    if log:
+        log(f"Broad search scanned {scanned} directories in {time.perf_counter() - started:.1f}s")
+    return found
+
+def get_ollama_model_records():
     """
-    Runs 'ollama ps' and returns a list of running models.
-    Returns an empty list if Ollama is not found or no models are running.
+    Queries /api/tags and returns a list of ModelRecord for the available models.
+    Returns an empty list if the Ollama server is not reachable.
     """
     try:
-        result = subprocess.run(["ollama", "ps"], capture_output=True, text=True, check=True)
-        # Parse the output, skipping the header line
-        lines = result.stdout.splitlines()[1:]
-        models = []
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 2:  # Ensure there are at least two words
-                model_name = parts[0]  # Model name is the first element
-                models.append(model_name)
-            else:
-                models.append("Unknown")  # Handle cases with fewer elements
-        return models
-    except FileNotFoundError:
-        print("Ollama not found in PATH.")
+        return get_client().list_models()
+    except OllamaAPIError as e:
+        print(f"Error listing models: {e}")
         return []
-    except subprocess.CalledProcessError as e:
-        print(f"Error running 'ollama ps': {e}")
+
+def get_running_model_records():
+    """
+    Queries /api/ps and returns a list of RunningModelRecord for the loaded models.
+    Returns an empty list if the Ollama server is not reachable.
+    """
+    try:
+        return get_client().running_models()
+    except OllamaAPIError as e:
+        print(f"Error listing running models: {e}")
         return []
 
+def get_ollama_models():
+    """
+    Returns a list of available model names.
+    Returns an empty list if Ollama is not reachable or no models are available.
+    """
+    return [record.name for record in get_ollama_model_records()]
+
+def get_running_ollama_models():
+    """
+    Returns a list of running model names.
+    Returns an empty list if Ollama is not reachable or no models are running.
+    """
+    return [record.name for record in get_running_model_records()]
+
 def get_model_information(model_name):
     """
-    Runs 'ollama show' and returns the model information.
-    Returns None if the model is not found or Ollama is not installed.
+    Queries /api/show and returns the model information formatted like 'ollama show'.
+    Returns None if the model is not found or the server is not reachable.
     """
     try:
-        result = subprocess.run(["ollama", "show", model_name], capture_output=True, text=True, check=True)
-        return result.stdout
-    except FileNotFoundError:
-        print("Ollama not found in PATH.")
-        return None
-    except subprocess.CalledProcessError as e:
-        print(f"Error running 'ollama show': {e}")
+        return format_model_details(get_client().show_model(model_name))
+    except OllamaAPIError as e:
+        print(f"Error showing model: {e}")
         return None
 
 def get_running_instance_info(model_name):
     """
     Returns instance-specific information for the given running model
-    by parsing the output of 'ollama ps'.
+    from the /api/ps records.
     """
     try:
-        result = subprocess.run(["ollama", "ps"], capture_output=True, text=True, check=True)
-        rows = result.stdout.splitlines()[1:]  # skip header
-        for row in rows:
-            parts = row.split()
-            if parts and parts[0] == model_name:
-                return f"Running instance details:\n{row}"
+        for record in get_client().running_models():
+            if record.name == model_name:
+                return format_running_instance(record)
         return ""
-    except subprocess.CalledProcessError as e:
+    except OllamaAPIError as e:
         return f"Error retrieving running info via ps: {e}"
-    except FileNotFoundError:
-        return "Ollama not found. Please ensure it is installed and in your PATH."
 
 def start_search(gui):
     gui.searching = True
     #self.search_button.config(state=tk.DISABLED)
     #self.cancel_button.config(state=tk.NORMAL)
-    gui.output_text.config(state=tk.NORMAL)
-    gui.output_text.delete("1.0", tk.END)
-    gui.output_text.config(state=tk.DISABLED)
+    gui.output_sink.clear()
 
     gui.search_thread = threading.Thread(target=gui.search_ollama_thread)
     gui.search_thread.start()
@@ -190,24 +273,27 @@ def search_complete(gui):
     gui.searching = False
 
 def log_message(gui, message, color=None):
-    gui.output_text.config(state=tk.NORMAL)
+    """
+    Appends a line to the output pane. Writes go through the batched output sink,
+    so this is cheap to call per line and safe to call from worker threads.
+    """
     if color:
-        gui.output_text.tag_config(color, foreground=color, background=gui.bg_color)
-        gui.output_text.insert(tk.END, message + "\n", color)
-    else:
-        gui.output_text.insert(tk.END, message + "\n")
-    gui.output_text.see(tk.END)  # Autoscroll to the bottom
-    gui.output_text.config(state=tk.DISABLED)
+        gui.output_sink.define_tag(color, foreground=color, background=gui.bg_color)
+    gui.output_sink.write(message + "\n", color)
 
 def save_ollama_location(gui, ollama_path):
     """
-    Saves the Ollama installation path to a file.
+    Saves the Ollama installation path, its stat fingerprint and reported version to the
+    location cache. Runs the executable once, so call it off the Tk thread.
     """
     if ollama_path:
-        with open("ollam-ah.dat", "w") as f:
-            f.write(ollama_path)
+        try:
+            entry = save_location(ollama_path, probe_version(ollama_path))
+        except OSError as e:
+            log_message(gui, f"Could not save Ollama location: {e}", gui.not_found_color)
+            return
         log_message(gui, f"Ollama found at: {ollama_path}", gui.found_color)
-        log_message(gui, "Ollama location saved to ollam-ah.dat", gui.found_color)
+        log_message(gui, f"Ollama location saved to {default_cache_path()} (version {entry['version'] or 'unknown'})", gui.found_color)
     else:
         log_message(gui, "Ollama not found.", gui.not_found_color)
 
@@ -219,8 +305,8 @@ def populate_models_list(gui):
     # Clear the listbox first to prevent duplicates
     gui.models_listbox.delete(0, tk.END)
     
-    # Get and add the models
-    models = get_ollama_models()
+    # Get and add the models from the shared inventory
+    models = gui.inventory.available_names()
     if models:
         for model in models:
             gui.models_listbox.insert(tk.END, model)
@@ -232,133 +318,66 @@ def populate_running_models_list(gui):
     Populates the running models listbox with the currently running models.
     """
     gui.running_models_listbox.delete(0, tk.END)  # Clear the listbox
-    running_models = get_running_ollama_models()
+    running_models = gui.inventory.running_names()
     if running_models:
         for model in running_models:
             gui.running_models_listbox.insert(tk.END, model)
     else:
         gui.running_models_listbox.insert(tk.END, "No models running or Ollama not installed.")
 
-def run_command(gui, command):
+def run_command(gui, command, on_complete=None):
     """
     Runs a command and displays the output in real-time to mimic a DOS window.
     Shows the command prompt, echoes the command, and displays formatted output.
+    Returns immediately; output is drained by a CommandRunner pump on the Tk thread
+    and on_complete(exit_code) is called once the command has finished.
     """
-    gui.output_text.config(state=tk.NORMAL)
-    gui.output_text.delete("1.0", tk.END)  # Clear previous output
+    sink = gui.output_sink
+    sink.clear()  # Clear previous output
     
     # Create DOS-like command tags
-    gui.output_text.tag_config("prompt", foreground="#CCCCCC")
-    gui.output_text.tag_config("command", foreground="#FFFFFF", font=("Courier New", 10, "bold"))
-    gui.output_text.tag_config("output", foreground="#00FF00")
-    gui.output_text.tag_config("error", foreground="#FF6666")
+    sink.define_tag("prompt", foreground="#CCCCCC")
+    sink.define_tag("command", foreground="#FFFFFF", font=("Courier New", 10, "bold"))
+    sink.define_tag("output", foreground="#00FF00")
+    sink.define_tag("error", foreground="#FF6666")
     
     # Create a DOS-like command prompt
     current_dir = os.getcwd()
     # Format the command prompt to look like DOS: C:\path\to\dir>
-    gui.output_text.insert(tk.END, f"{current_dir}>", "prompt")
+    sink.write(f"{current_dir}>", "prompt")
     # Echo the command that's being run
     cmd_str = " ".join(command)
-    gui.output_text.insert(tk.END, f"{cmd_str}\n\n", "command")
-    gui.output_text.see(tk.END)
-    gui.output_text.config(state=tk.DISABLED)
-    gui.master.update()  # Force update to show command before output starts
-
-    def enqueue_output(process, out_queue, err_queue):
-        # Capture and process stdout
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                # Remove ANSI color codes and control characters
-                clean_line = re.sub(r'\x1b\[[0-9;]*m', '', line)
-                clean_line = re.sub(r'[\r\n]+', '\n', clean_line)
-                out_queue.put(clean_line)
-        
-        # Capture and process stderr
-        for line in iter(process.stderr.readline, ''):
-            if line:
-                # Remove ANSI color codes and control characters
-                clean_line = re.sub(r'\x1b\[[0-9;]*m', '', line)
-                clean_line = re.sub(r'[\r\n]+', '\n', clean_line)
-                err_queue.put(clean_line)
+    sink.write(f"{cmd_str}\n\n", "command")
 
-    try:
-        # Create separate queues for stdout and stderr
-        out_queue = queue.Queue()
-        err_queue = queue.Queue()
-        
-        # Use line buffering for more responsive output
-        process = subprocess.Popen(
-            command, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True, 
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Start thread to capture output
-        output_thread = threading.Thread(
-            target=enqueue_output, 
-            args=(process, out_queue, err_queue)
-        )
-        output_thread.daemon = True
-        output_thread.start()
-        
-        # Process output in real-time
-        while process.poll() is None or not (out_queue.empty() and err_queue.empty()):
-            # Process stdout
-            try:
-                while True:
-                    line = out_queue.get_nowait()
-                    gui.output_text.config(state=tk.NORMAL)
-                    gui.output_text.insert(tk.END, line, "output")
-                    gui.output_text.see(tk.END)
-                    gui.output_text.config(state=tk.DISABLED)
-                    gui.master.update()
-            except queue.Empty:
-                pass
-                
-            # Process stderr
-            try:
-                while True:
-                    line = err_queue.get_nowait()
-                    gui.output_text.config(state=tk.NORMAL)
-                    gui.output_text.insert(tk.END, line, "error")
-                    gui.output_text.see(tk.END)
-                    gui.output_text.config(state=tk.DISABLED)
-                    gui.master.update()
-            except queue.Empty:
-                pass
-                
-            # Brief pause to prevent CPU hogging
-            time.sleep(0.05)
-            gui.master.update()
-        
+    def command_finished(exit_code):
+        gui.running_commands.discard(runner)
+        sink.close_region(runner)
         # Add exit code information like DOS
-        exit_code = process.returncode
-        gui.output_text.config(state=tk.NORMAL)
         if exit_code == 0:
-            gui.output_text.insert(tk.END, f"\nCommand completed successfully with exit code {exit_code}\n", "output")
+            sink.write(f"\nCommand completed successfully with exit code {exit_code}\n", "output")
         else:
-            gui.output_text.insert(tk.END, f"\nCommand failed with exit code {exit_code}\n", "error")
+            sink.write(f"\nCommand failed with exit code {exit_code}\n", "error")
         
         # Add another command prompt at the end
-        gui.output_text.insert(tk.END, f"\n{current_dir}>", "prompt")
-        gui.output_text.see(tk.END)
-        gui.output_text.config(state=tk.DISABLED)
+        sink.write(f"\n{current_dir}>", "prompt")
+        logging.debug(f"'{cmd_str}' output: {sink.total_lines} lines total, {sink.lines_per_second:.0f} lines/s")
+        if on_complete:
+            on_complete(exit_code)
+
+    # The runner's screen goes to an in-place region of the sink, so progress bars are
+    # redrawn rather than appended, and the sink inserts the result in per-frame batches
+    runner = CommandRunner(gui.master, command, lambda committed, live: sink.update_region(runner, committed, live), command_finished)
+    try:
+        runner.start()
+        gui.running_commands.add(runner)
+        return runner
         
     except FileNotFoundError:
-        gui.output_text.config(state=tk.NORMAL)
-        gui.output_text.insert(tk.END, "'{}' is not recognized as an internal or external command,\noperable program or batch file.\n".format(command[0]), "error")
-        gui.output_text.insert(tk.END, f"\n{current_dir}>", "prompt")
-        gui.output_text.see(tk.END)
-        gui.output_text.config(state=tk.DISABLED)
+        sink.write("'{}' is not recognized as an internal or external command,\noperable program or batch file.\n".format(command[0]), "error")
+        sink.write(f"\n{current_dir}>", "prompt")
     except Exception as e:
-        gui.output_text.config(state=tk.NORMAL)
-        gui.output_text.insert(tk.END, f"Error executing command: {e}\n", "error")
-        gui.output_text.insert(tk.END, f"\n{current_dir}>", "prompt")
-        gui.output_text.see(tk.END)
-        gui.output_text.config(state=tk.DISABLED)
+        sink.write(f"Error executing command: {e}\n", "error")
+        sink.write(f"\n{current_dir}>", "prompt")
 
 def chat_with_ai(message):
     """
@@ -366,6 +385,7 @@ def chat_with_ai(message):
     Sends a POST request to http://localhost:11434/api/generate with parameters for model, prompt, and stream.
     Returns the AI response.
     """
+    import requests  # only needed here; loaded on first use
     url = "http://localhost:11434/api/generate"
     payload = {
         "model": "smollm2:135m",
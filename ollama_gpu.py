@@ -0,0 +1,229 @@
+"""
+GPU telemetry for Ollama GUI
+Reads utilization, memory and temperature for every GPU through a backend that keeps
+its handles open between polls: NVML for NVIDIA, sysfs for AMD/Intel on Linux, a null
+backend when neither is present, and a fake backend for machines without a GPU.
+Select one explicitly with the OLLAMA_GUI_GPU_BACKEND environment variable.
+"""
+
+import glob
+import math
+import os
+import time
+from collections import namedtuple
+
+GpuReading = namedtuple("GpuReading", [
+    "index", "name", "load_percent", "memory_used", "memory_total", "temperature",
+])
+
+BACKEND_ENV = "OLLAMA_GUI_GPU_BACKEND"
+
+
+class GpuBackendUnavailable(Exception):
+    """Raised by a backend constructor when its library or devices aren't present"""
+
+
+class GpuBackend:
+    """Base class: a backend opens its devices once and read() samples all of them"""
+
+    name = "none"
+
+    def __init__(self):
+        self.device_names = []
+
+    def read(self):
+        """Returns one GpuReading per device; fields a device can't report are None"""
+        return []
+
+    def close(self):
+        pass
+
+
+class NullBackend(GpuBackend):
+    """Used when no GPU can be read; reports no devices"""
+
+
+class NvmlBackend(GpuBackend):
+    """NVIDIA GPUs through NVML (the nvidia-ml-py package); handles are kept for the process lifetime"""
+
+    name = "nvml"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+        except Exception as e:  # ImportError, or NVMLError when there is no driver
+            raise GpuBackendUnavailable(f"NVML not available: {e}")
+        self.nvml = pynvml
+        try:
+            self.handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+            for handle in self.handles:
+                name = pynvml.nvmlDeviceGetName(handle)
+                self.device_names.append(name.decode() if isinstance(name, bytes) else name)
+        except pynvml.NVMLError as e:
+            # e.g. a GPU that fell off the bus; let open_gpu_backend fall back to sysfs
+            pynvml.nvmlShutdown()
+            raise GpuBackendUnavailable(f"NVML could not open the GPUs: {e}")
+        if not self.handles:
+            pynvml.nvmlShutdown()
+            raise GpuBackendUnavailable("NVML found no GPUs")
+
+    def read(self):
+        nvml = self.nvml
+        readings = []
+        for index, handle in enumerate(self.handles):
+            try:
+                load = nvml.nvmlDeviceGetUtilizationRates(handle).gpu
+                memory = nvml.nvmlDeviceGetMemoryInfo(handle)
+                used, total = memory.used, memory.total
+            except nvml.NVMLError:
+                load = used = total = None
+            try:
+                temperature = nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU)
+            except nvml.NVMLError:
+                temperature = None
+            readings.append(GpuReading(index, self.device_names[index], load, used, total, temperature))
+        return readings
+
+    def close(self):
+        self.nvml.nvmlShutdown()
+
+
+class SysfsBackend(GpuBackend):
+    """
+    AMD and Intel GPUs through /sys/class/drm. The attribute files are opened once and
+    re-read with pread at offset 0, which makes the kernel regenerate their contents.
+    """
+
+    name = "sysfs"
+    VENDORS = {"0x1002": "AMD", "0x8086": "Intel", "0x10de": "NVIDIA"}
+    ATTRIBUTES = {
+        "load_percent": "gpu_busy_percent",
+        "memory_used": "mem_info_vram_used",
+        "memory_total": "mem_info_vram_total",
+    }
+
+    def __init__(self, root="/sys/class/drm"):
+        """
+        Open the devices
+
+        Args:
+            root: The drm class directory (overridable so the backend can be pointed at a copy)
+        """
+        super().__init__()
+        self.devices = []  # per device: {field: fd}
+        for card in sorted(glob.glob(os.path.join(root, "card[0-9]*"))):
+            if "-" in os.path.basename(card):
+                continue  # connectors such as card0-DP-1
+            device = os.path.join(card, "device")
+            fds = {}
+            for field, attribute in self.ATTRIBUTES.items():
+                fd = self._open(os.path.join(device, attribute))
+                if fd is not None:
+                    fds[field] = fd
+            sensors = sorted(glob.glob(os.path.join(device, "hwmon", "hwmon*", "temp1_input")))
+            if sensors:
+                fd = self._open(sensors[0])
+                if fd is not None:
+                    fds["temperature"] = fd
+            if not fds:
+                continue
+            self.devices.append(fds)
+            self.device_names.append(self._device_name(device, os.path.basename(card)))
+        if not self.devices:
+            raise GpuBackendUnavailable(f"No readable GPUs under {root}")
+
+    @staticmethod
+    def _open(path):
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    def _device_name(self, device, card):
+        try:
+            with open(os.path.join(device, "product_name"), encoding="utf-8") as f:
+                name = f.read().strip()
+            if name:
+                return name
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(device, "vendor"), encoding="utf-8") as f:
+                return f"{self.VENDORS.get(f.read().strip(), 'GPU')} {card}"
+        except OSError:
+            return card
+
+    @staticmethod
+    def _read_int(fd):
+        try:
+            return int(os.pread(fd, 64, 0))
+        except (OSError, ValueError):
+            return None
+
+    def read(self):
+        readings = []
+        for index, fds in enumerate(self.devices):
+            values = {field: self._read_int(fd) for field, fd in fds.items()}
+            temperature = values.get("temperature")
+            readings.append(GpuReading(
+                index, self.device_names[index], values.get("load_percent"), values.get("memory_used"),
+                values.get("memory_total"), temperature / 1000 if temperature is not None else None))
+        return readings
+
+    def close(self):
+        for fds in self.devices:
+            for fd in fds.values():
+                os.close(fd)
+        self.devices = []
+
+
+class FakeBackend(GpuBackend):
+    """Synthetic GPUs with smoothly varying load, for GPU-less machines and for exercising the UI"""
+
+    name = "fake"
+
+    def __init__(self, count=2, memory_total=8 * 1024 ** 3):
+        """
+        Initialize the fake devices
+
+        Args:
+            count: Number of devices reported
+            memory_total: Memory size of each device in bytes
+        """
+        super().__init__()
+        self.memory_total = memory_total
+        self.device_names = [f"Fake GPU {i}" for i in range(count)]
+        self.started = time.monotonic()
+
+    def read(self):
+        elapsed = time.monotonic() - self.started
+        readings = []
+        for index, name in enumerate(self.device_names):
+            phase = elapsed / 10 + index
+            load = 50 + 45 * math.sin(phase)
+            used = int(self.memory_total * (0.4 + 0.3 * math.sin(phase / 3)))
+            readings.append(GpuReading(index, name, load, used, self.memory_total, 40 + load / 3))
+        return readings
+
+
+BACKENDS = {"nvml": NvmlBackend, "sysfs": SysfsBackend, "fake": FakeBackend, "none": NullBackend}
+
+
+def open_gpu_backend(preferred=None):
+    """
+    Returns the first backend that finds a GPU: NVML, then sysfs, otherwise NullBackend.
+
+    Args:
+        preferred (str, optional): Backend name to use instead of probing; defaults to the
+            OLLAMA_GUI_GPU_BACKEND environment variable
+    """
+    preferred = (preferred or os.environ.get(BACKEND_ENV) or "").lower()
+    order = [preferred] if preferred in BACKENDS else ["nvml", "sysfs"]
+    for name in order:
+        try:
+            return BACKENDS[name]()
+        except GpuBackendUnavailable:
+            continue
+    return NullBackend()
@@ -1,26 +1,40 @@
 import tkinter as tk
 from tkinter import scrolledtext, Listbox, ttk
-import base64
 import queue
 import re
-import webbrowser
 import os
 import platform
+import shlex
+import logging
 import time  # Adding time import at the top level
+import uuid
 from tkinter import simpledialog
 
-from ollama_commands import pull_model, create_model, serve_ollama, run_selected_model, list_models, show_model, ps_models, cp_model, rm_model
+from ollama_commands import pull_model, create_model, serve_ollama, run_selected_model, list_models, show_model, ps_models, cp_model, rm_model, pull_job_updated, pull_job_finished, pulls_finished, batch_started, batch_finished, warm_up_model, warmup_finished
 from ollama_functions import get_ollama_models, get_running_ollama_models, get_model_information, find_ollama
 from ollama_gui_styling import configure_styles
 from ollama_gui_widgets import create_widgets
 from ollama_gui_events import bind_events, show_command_info, stop_selected_model, on_resize
 from ollama_functions import start_search, search_ollama_thread, cancel_search, search_complete, log_message, save_ollama_location, populate_models_list, populate_running_models_list, run_command
 from ollama_gui_listbox import show_model_information as listbox_show_model_information, show_running_model_information as listbox_show_running_model_information, display_model_information
+from ollama_inventory import ModelInventory, ModelDetailsCache
+from ollama_tasks import TaskRunner
+from ollama_output import OutputSink
+from ollama_chat import ChatStreamRenderer, ChatWorker, ChatCancelled, Conversation
+from ollama_pull import PullManager
+from ollama_batch import BatchRunner, BatchDialog
+from ollama_warmup import ModelWarmer
+from ollama_history import ChatHistoryStore, HistoryBrowser, message_metrics
+from ollama_location import load_location
+from ollama_profiling import profile_phase, profile_mark, finish_profiling
 
 MAX_DEPTH = 5  # Limit the search depth
 
 class OllamaFinderGUI:
     def __init__(self, master):
+        self.startup_started = time.perf_counter()  # for the time-to-first-paint / time-to-populated log
+        self.first_paint_ms = None
+        self.populated_ms = None
         self.master = master
         self.master.title("Ollama Finder")
         self.master.geometry("900x650")
@@ -40,7 +54,8 @@ class OllamaFinderGUI:
         self.is_dark_mode = False         # Start with light mode by default
         
         # Configure the styles with our new color scheme
-        configure_styles(self.style, self.bg_color, self.text_color, self.button_color, self.button_text_color, self.listbox_select_color)
+        with profile_phase("styles"):
+            configure_styles(self.style, self.bg_color, self.text_color, self.button_color, self.button_text_color, self.listbox_select_color)
 
         self.master.configure(bg=self.bg_color)
         self.master.rowconfigure(0, weight=1)
@@ -63,21 +78,63 @@ class OllamaFinderGUI:
         self.right_frame.grid(row=1, column=0, sticky="nsew")
         
         # Create widgets in their respective frames
-        create_widgets(self, self.master)
+        with profile_phase("widgets"):
+            create_widgets(self, self.master)
 
         # --- Variables and Initialization ---
-        self.ollama_location = None
+        cached_location = load_location()
+        self.ollama_location = cached_location["path"] if cached_location else None
         self.searching = False
         self.search_thread = None
         self.selected_model = None
         self.selected_running_model = None
         self.queue = queue.Queue()  # Queue for real-time output
+        self.active_chat = None  # ChatWorker for the reply being generated
+        self.running_commands = set()  # CommandRunners for child processes still running
         
         # Model monitoring variables
-        self.previous_running_models = []
+        self.inventory = ModelInventory()  # Shared model list cache read by every consumer
+        self.details_cache = ModelDetailsCache()  # 'ollama show' text keyed by model digest
+        self.tasks = TaskRunner(self.master)  # Worker pool for blocking server calls
+        self.scrollback_lines = 5000  # Lines kept in each text pane before the oldest are dropped
+        self.output_spill_path = os.path.join("logs", "output.log")  # Full command output, size-rotated; None disables
+        self.output_sink = OutputSink(self.output_text, post=self.tasks.post,  # Batched writes to the output pane
+                                      max_lines=self.scrollback_lines, spill_path=self.output_spill_path)
+        self.chat_sink = OutputSink(self.chat_text, post=self.tasks.post, max_lines=self.scrollback_lines)
         self.model_statuses = {}  # Store model status information
         self.monitor_active = True
         self.monitor_interval = 3000  # Check every 3 seconds
+        self.monitor_future = None  # In-flight background inventory poll
+        self.notifications_unavailable = False  # set once plyer turns out to be missing
+        self.pull_concurrency = 2  # Models downloaded at the same time
+        self.pull_manager = PullManager(  # Queue behind Pull Model and the pull panel
+            self.tasks,
+            max_concurrent=self.pull_concurrency,
+            on_update=lambda job: pull_job_updated(self, job),
+            on_finished=lambda job: pull_job_finished(self, job),
+            on_all_done=lambda jobs: pulls_finished(self, jobs)
+        )
+        self.pull_panel = None
+        self.selected_models = []  # Every model selected in the models list
+        self.batch_workers = 4  # Models a batch operation processes at the same time
+        self.batch_active = False  # Monitor polls are held off while a batch changes the inventory
+        self.warmup_keep_alive = "10m"  # How long a warmed-up model stays loaded
+        self.benchmark_store = None  # Opened the first time the benchmark window is shown
+        self.model_warmer = ModelWarmer(  # Preloads models so the first chat skips the load
+            self.tasks,
+            keep_alive=self.warmup_keep_alive,
+            on_update=lambda record: warmup_finished(self, record)
+        )
+        self.chat_history = ChatHistoryStore()  # Every chat message, opened on first use by a worker
+        self.chat_conversation_id = None  # Key of the conversation new messages are stored under
+        self.history_browser = HistoryBrowser(  # Pages stored conversations into the History tab
+            self.history_listbox, self.history_scrollbar, self.chat_history, self.tasks,
+            on_error=lambda e: self.log_message(f"Failed to read chat history: {e}", self.not_found_color)
+        )
+        self.history_search_job = None  # Pending after() call that runs the typed search
+        self.chat_system_prompt = "You are the ship's AI assistant responding to crew queries."
+        self.chat_context_tokens = 1536  # Prompt token budget per chat request; below num_ctx so the reply fits
+        self.conversation = self.new_conversation()  # Turns sent to the model with each message
         
         # Properly integrate the indicator light and system message into the status bar
         self.status_bar = ttk.Frame(self.master, style="TFrame")
@@ -101,16 +158,17 @@ class OllamaFinderGUI:
         self.status_indicator.pack(side=tk.RIGHT, padx=5)
         self.status_indicator.create_oval(2, 2, 10, 10, fill=self.found_color, outline="")
 
-        populate_models_list(self)
-        populate_running_models_list(self)
-        # Automatically select a running model if available
-        from ollama_functions import get_running_ollama_models
-        running_models = get_running_ollama_models()
-        if (running_models):
-            self.selected_running_model = running_models[0]
-            self.previous_running_models = running_models.copy()
+        # Paint the window straight away; the model lists are filled in by one combined
+        # inventory snapshot taken in the background and shared by every consumer
+        self.show_loading_state()
+        self.master.bind("<Map>", self.on_first_map, add="+")
+        self.tasks.submit(
+            self.inventory.refresh, True,
+            on_done=self.apply_startup_snapshot,
+            on_error=self.apply_startup_snapshot
+        )
+        self.history_browser.reload()
         self.process_queue()
-        self.monitor_running_models()  # Start continuous monitoring
 
         # Adjust layout to eliminate the gap above the Tab features
         self.main_frame.pack_configure(pady=0)
@@ -118,6 +176,56 @@ class OllamaFinderGUI:
         # Remove any unintended outline or padding
         self.main_frame.configure(relief="flat", borderwidth=0)
 
+    def show_loading_state(self):
+        """Fills the model lists and status bar with placeholders until the first snapshot arrives."""
+        self.models_listbox.delete(0, tk.END)
+        self.models_listbox.insert(tk.END, "Loading models...")
+        self.running_models_listbox.delete(0, tk.END)
+        self.running_models_listbox.insert(tk.END, "Checking running models...")
+        self.status_message.config(text="Model monitoring: Connecting to Ollama...")
+
+    def on_first_map(self, event):
+        """Logs time-to-first-paint once the main window is first mapped."""
+        if event.widget is not self.master or self.first_paint_ms is not None:
+            return
+        def painted():
+            self.first_paint_ms = (time.perf_counter() - self.startup_started) * 1000
+            logging.info(f"Startup: first paint after {self.first_paint_ms:.0f} ms")
+            profile_mark("first paint")
+            if self.populated_ms is not None:
+                finish_profiling()
+        self.first_paint_ms = -1  # the redraw itself happens once Tk is idle
+        self.master.after_idle(painted)
+
+    def apply_startup_snapshot(self, result):
+        """
+        Populates every consumer from the startup inventory snapshot, reports
+        time-to-populated and starts the monitor. result is the InventoryDiff (empty
+        on the first load) or the exception the snapshot failed with.
+        """
+        if isinstance(result, Exception):
+            self.log_message(f"Could not reach Ollama: {result}", self.not_found_color)
+        elif self.inventory.last_error is not None:
+            self.log_message(f"Could not reach Ollama: {self.inventory.last_error}", self.not_found_color)
+        populate_models_list(self)
+        populate_running_models_list(self)
+        # Automatically select a running model if available
+        running_models = self.inventory.running_names()
+        self.model_metrics.update_resident_sizes(self.inventory.running_models())
+        if (running_models):
+            self.selected_running_model = running_models[0]
+            self.status_message.config(text=f"SYSTEM STATUS: {len(running_models)} neural core(s) operational")
+        else:
+            self.status_message.config(text="Model monitoring: Active")
+        self.populated_ms = (time.perf_counter() - self.startup_started) * 1000
+        logging.info(f"Startup: model lists populated after {self.populated_ms:.0f} ms "
+                     f"({len(self.inventory.available_names())} available, {len(running_models)} running)")
+        profile_mark("first data")
+        if self.first_paint_ms is not None and self.first_paint_ms >= 0:
+            finish_profiling()
+        # Start continuous monitoring; the snapshot above is still fresh, so wait one interval
+        self.monitor_task = self.master.after(self.monitor_interval, self.monitor_running_models)
+
     def process_queue(self):
         """
         Processes the output queue and displays the output in the text widget.
@@ -305,16 +413,22 @@ class OllamaFinderGUI:
         """
         rm_model(self)
 
-    def run_command(self, command):
+    def run_command(self, command, on_complete=None):
         """
         Wrapper method that delegates to the run_command function in the ollama_functions module.
         This avoids duplicating code while maintaining compatibility with existing function calls.
         
         Args:
-            command (list): The command to run as a list of strings
+            command (list): The command to run as a list of strings, or the Return key
+                event from the command entry, in which case the entry text is run
+            on_complete (callable, optional): Called with the exit code when the command ends
         """
+        if isinstance(command, tk.Event):
+            command = shlex.split(self.command_entry.get())
+            if not command:
+                return
         from ollama_functions import run_command
-        run_command(self, command)
+        return run_command(self, command, on_complete)
 
     def open_more_models(self):
         """
@@ -336,146 +450,213 @@ class OllamaFinderGUI:
 
     def send_chat(self):
         """
-        Handles sending a chat message to the running Ollama model using the non-streaming API.
+        Handles sending a chat message to the running Ollama model. The request runs on a
+        background worker; the reply streams in when the Stream option is checked.
         Implements radiation shielding protocols for deep space communications.
         """
         # System safeguard check - verify life support systems
         user_message = self.chat_entry.get("1.0", tk.END).strip()
         if user_message:
+            if self.active_chat and self.active_chat.is_active():
+                self.chat_sink.write("SYSTEM: Transmission in progress - press Stop to abort it first\n", "system")
+                return
             if not self.selected_running_model:
                 import tkinter.messagebox as messagebox
                 messagebox.showwarning("ALERT: MODEL OFFLINE", "CRITICAL: No running neural core detected. Initiate model startup sequence immediately.")
                 return
                 
             # Log message with quantum encryption
-            self.chat_text.config(state=tk.NORMAL)
-            self.chat_text.insert(tk.END, "CREW: ", "user")
-            self.chat_text.insert(tk.END, user_message + "\n", "user")
-            self.chat_text.config(state=tk.DISABLED)
+            self.chat_sink.write("CREW: " + user_message + "\n", "user")
             self.chat_entry.delete("1.0", tk.END)
 
             # Populate the model dropdown list with available models
-            available_models = get_ollama_models()
+            available_models = self.inventory.available_names()
             self.chat_model_dropdown["values"] = available_models
             if available_models:
                 self.chat_model_var.set(available_models[0])  # Set the first model as default
             
-            import requests
-            payload = {
-                "prompt": user_message,
-                "model": self.selected_running_model,
-                "system": "You are the ship's AI assistant responding to crew queries."
-            }
+            conversation = self.conversation
+            conversation.add("user", user_message)
+            payload, context = conversation.build_payload(
+                self.selected_running_model,
+                # Without this the request would reset a warmed or hot model to the server's default
+                keep_alive=self.model_warmer.keep_alive_for(self.selected_running_model)
+            )
+            context_line = (f"~{context['tokens']} tokens in {context['messages']} message(s)"
+                            + (f", {context['dropped']} older dropped" if context["dropped"] else ""))
+            logging.info(f"Chat request to {payload['model']}: {context_line}")
             
             # Transmission metadata - encode with shield frequency
             debug_info = (
                 "    TRANSMISSION DATA:\n"
                 "        Neural endpoint: http://localhost:11434/api/chat\n"
-                "        Payload encryption: " + str(payload) + "\n"
+                "        Payload encryption: " + str({k: v for k, v in payload.items() if k != "messages"}) + "\n"
+                "        Context sent: " + context_line + "\n"
             )
             
-            self.chat_text.config(state=tk.NORMAL)
-            self.chat_text.insert(tk.END, debug_info, "debug")
-            self.chat_text.insert(tk.END, "\n")
-            self.chat_text.config(state=tk.DISABLED)
+            self.chat_sink.write(debug_info, "debug")
+            self.chat_sink.write("\n")
             
-            try:
-                # Engage subspace communications
-                self.chat_text.config(state=tk.NORMAL)
-                self.chat_text.insert(tk.END, "SYSTEM: Establishing neural link... stand by...\n", "system")
-                self.chat_text.config(state=tk.DISABLED)
-                self.chat_text.see(tk.END)  # Auto-scroll
-                self.master.update()  # Force UI update to show waiting message
-                
-                # Implement radiation shield with 3-layer retry logic
-                max_retries = 3
-                retry_count = 0
-                while retry_count < max_retries:
-                    try:
-                        response = requests.post(
-                            "http://localhost:11434/api/chat",
-                            json=payload,
-                            headers={"Content-Type": "application/json"},
-                            timeout=60
-                        )
-                        response.raise_for_status()
-                        break  # Success, exit retry loop
-                    except (requests.ConnectionError, requests.Timeout) as e:
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            self.chat_text.config(state=tk.NORMAL)
-                            self.chat_text.insert(tk.END, f"SYSTEM: Communication interference detected. Remodulating shields. Retry {retry_count}/{max_retries}...\n", "system")
-                            self.chat_text.config(state=tk.DISABLED)
-                            self.chat_text.see(tk.END)
-                            self.master.update()
-                            import time
-                            time.sleep(1)  # Wait before retry
-                        else:
-                            raise  # Re-raise if max retries reached
-                
-                data = response.json()
-                # Extract neural core response
-                content = data.get("message", {}).get("content", "")
-                if not content:
-                    content = "<No neural response received - check core status>"
-                    
-                # Display AI response with appropriate signal encoding
-                self.chat_text.config(state=tk.NORMAL)
-                self.chat_text.insert(tk.END, "SHIP AI: ", "ai")
-                self.chat_text.insert(tk.END, content + "\n", "ai")
-                
-                # Add transmission verification data
-                final_debug = (
-                    "    TRANSMISSION VERIFICATION:\n"
-                    f"        Response integrity: {response.status_code}\n"
-                    f"        Quantum fingerprint: {hash(response.text) & 0xFFFFFFFF:08X}\n"
-                )
-                self.chat_text.insert(tk.END, final_debug, "debug")
-                self.chat_text.insert(tk.END, "\n")
-                self.chat_text.config(state=tk.DISABLED)
-                self.chat_text.see(tk.END)
-                
-            except Exception as e:
-                # Critical system alert with emergency protocols
-                error_class = e.__class__.__name__
-                self.chat_text.config(state=tk.NORMAL)
-                self.chat_text.insert(tk.END, "ALERT: ", "error")
-                self.chat_text.insert(tk.END, f"Neural core communication failure - {error_class}\n", "error")
-                
-                # System diagnostic and recovery protocols
-                error_debug = (
-                    f"    EMERGENCY DIAGNOSTIC:\n"
-                    f"        Exception type: {error_class}\n"
-                    f"        Error message: {str(e)}\n"
-                    f"        Recovery protocol: Restart neural core or check connection integrity\n"
-                )
-                self.chat_text.insert(tk.END, error_debug, "debug")
-                self.chat_text.insert(tk.END, "\n")
-                self.chat_text.config(state=tk.DISABLED)
-                self.chat_text.see(tk.END)
+            # Engage subspace communications
+            self.chat_sink.write("SYSTEM: Establishing neural link... stand by...\n", "system")
+            
+            new_conversation = self.chat_conversation_id is None
+            if new_conversation:
+                self.chat_conversation_id = uuid.uuid4().hex
+            stored = self.chat_history.add_message(self.chat_conversation_id, "user", user_message, payload["model"],
+                                                   params={k: v for k, v in payload.items() if k not in ("model", "messages")})
+            if new_conversation:
+                stored.add_done_callback(lambda f: self.tasks.post(self.history_browser.reload))
+            self.start_chat_request(payload, stream=self.stream_chat_var.get(),
+                                    conversation_id=self.chat_conversation_id, conversation=conversation)
+
+    def new_conversation(self):
+        return Conversation(self.chat_system_prompt, token_budget=self.chat_context_tokens)
+
+    def start_chat_request(self, payload, stream=True, conversation_id=None, conversation=None):
+        """
+        Runs the chat request for payload on a ChatWorker and renders the reply.
+        The Tk thread never blocks: tokens are appended in per-frame batches (or all
+        at once when not streaming) and the Stop button cancels the worker.
+        Time-to-first-token is reported separately from the total time.
+        The reply is stored in the chat history under conversation_id, if given,
+        and appended to conversation so the next request includes it.
+        """
+        self.chat_sink.write("SHIP AI: ", "ai")
+        
+        renderer = ChatStreamRenderer(self.chat_sink, tag="ai")
+        renderer.start()
+        worker = ChatWorker(payload, renderer, stream=stream)
+        
+        def announce_retry(retry_count):
+            # Written to the sink directly so the notice isn't counted as (or stored with) the reply
+            self.chat_sink.write(f"\nSYSTEM: Communication interference detected. Remodulating shields. Retry {retry_count}/{worker.max_retries}...\n", "system")
+        
+        def on_done(final_chunk):
+            renderer.finish()
+            timings = renderer.timings()
+            first_token = timings["first_token_ms"]
+            first_visible = timings["first_visible_ms"]
+            if renderer.tokens_received == 0:
+                self.chat_sink.write("<No neural response received - check core status>", "ai")
+            if first_token is not None:
+                first_token_line = f"        First token: {first_token:.0f} ms (visible {first_visible:.0f} ms)\n"
+            else:
+                first_token_line = "        First token: none received\n"
+            final_debug = (
+                "\n    TRANSMISSION VERIFICATION:\n"
+                + first_token_line +
+                f"        Total time: {timings['total_ms']:.0f} ms\n"
+                f"        Tokens: {final_chunk.get('eval_count', renderer.tokens_received)} in {renderer.frames} frame(s)\n"
+            )
+            if final_chunk.get("prompt_eval_count") is not None:
+                # Excludes any prefix the server still had cached from the previous turn
+                final_debug += f"        Prompt tokens evaluated: {final_chunk['prompt_eval_count']}\n"
+            if final_chunk.get("load_duration") is not None:
+                final_debug += f"        {self.model_warmer.describe_chat_load(payload['model'], final_chunk)}\n"
+            self.chat_sink.write(final_debug, "debug")
+            self.chat_sink.write("\n")
+            if final_chunk:
+                self.model_metrics.record_response(payload["model"], final_chunk, first_token)
+            if conversation is not None:
+                if renderer.tokens_received:
+                    conversation.add("assistant", renderer.text, tokens=final_chunk.get("eval_count"))
+                else:
+                    conversation.discard_unanswered()
+            if conversation_id and renderer.tokens_received:
+                self.chat_history.add_message(conversation_id, "assistant", renderer.text, payload["model"],
+                                              metrics=message_metrics(final_chunk, first_token, timings["total_ms"]))
+        
+        def on_error(e):
+            renderer.finish()
+            self.chat_sink.write("\n")
+            if conversation is not None:
+                conversation.discard_unanswered()
+            if isinstance(e, ChatCancelled):
+                self.chat_sink.write("SYSTEM: Transmission aborted by crew\n\n", "system")
+            else:
+                self.show_chat_error(e)
+        
+        self.active_chat = worker.start(self.tasks, on_done=on_done, on_error=on_error, on_retry=announce_retry)
+
+    def show_chat_error(self, e):
+        """Writes the diagnostic block for a failed chat request into the chat pane."""
+        # Critical system alert with emergency protocols
+        error_class = e.__class__.__name__
+        self.chat_sink.write(f"ALERT: Neural core communication failure - {error_class}\n", "error")
+        
+        # System diagnostic and recovery protocols
+        error_debug = (
+            f"    EMERGENCY DIAGNOSTIC:\n"
+            f"        Exception type: {error_class}\n"
+            f"        Error message: {str(e)}\n"
+            f"        Recovery protocol: Restart neural core or check connection integrity\n"
+        )
+        self.chat_sink.write(error_debug, "debug")
+        self.chat_sink.write("\n")
 
     def monitor_running_models(self):
         """
         CRITICAL SHIPBOARD SYSTEM: Neural Core Monitoring Array
         Provides continuous surveillance of all neural cores and model integrity.
-        Implements automatic recovery procedures for core fluctuations.
+        The inventory poll runs on a worker thread; only the resulting diff is
+        applied on the Tk thread, so a slow server never freezes the window.
         """
         if not self.monitor_active:
             return
-            
+        
+        # Skip this tick if the previous poll is still waiting on the server, or while a
+        # batch operation is changing the inventory (it refreshes once when it finishes)
+        if not self.batch_active and (self.monitor_future is None or self.monitor_future.done()):
+            self.monitor_future = self.tasks.submit(
+                self.poll_inventory,
+                on_done=self.apply_inventory_changes,
+                on_error=self.report_monitor_failure
+            )
+        
+        # Schedule next check using a different approach to reduce flickering
+        self.monitor_task = self.master.after(self.monitor_interval, self.monitor_running_models)
+
+    def poll_inventory(self):
+        """
+        Worker-thread half of the monitor: refreshes the inventory (both lists are
+        fetched concurrently) and returns the diff plus the current name lists.
+        """
+        diff = self.inventory.refresh()
+        return diff, self.inventory.running_names(), self.inventory.available_names()
+
+    def notify(self, title, message):
+        """Shows a desktop notification from a worker thread if plyer is installed."""
+        if self.notifications_unavailable:
+            return  # don't repeat a failed import search for every event
+        def send():
+            try:
+                from plyer import notification
+                notification.notify(title=title, message=message, app_name="Ship Mainframe", timeout=5)
+            except ImportError:
+                self.notifications_unavailable = True
+        self.tasks.submit(send)
+
+    def report_monitor_failure(self, e):
+        error_class = e.__class__.__name__
+        self.log_message(f"\nCRITICAL: Neural monitoring subsystem failure - {error_class}\n", self.not_found_color)
+        self.log_message(f"Error details: {str(e)}", self.not_found_color)
+
+    def apply_inventory_changes(self, result):
+        """
+        Tk-thread half of the monitor: applies a diff computed by poll_inventory.
+        Does no I/O, so its cost is bounded by the number of changed models.
+        """
+        diff, current_running_models, current_available_models = result
         try:
-            # Get current models state
-            current_running_models = get_running_ollama_models()
-            current_available_models = get_ollama_models()
-            
             # Initialize if needed
-            if not hasattr(self, 'previous_available_models'):
-                self.previous_available_models = current_available_models.copy()
+            if not getattr(self, 'monitor_initialized', False):
+                self.monitor_initialized = True
                 self.log_message("\nSTATUS: Neural core monitoring systems initialized\n", self.status_color)
             
             # Detect changes to reduce UI updates and flickering
-            running_models_changed = set(current_running_models) != set(self.previous_running_models)
-            available_models_changed = set(current_available_models) != set(self.previous_available_models)
+            running_models_changed = bool(diff.started or diff.stopped)
+            available_models_changed = bool(diff.added or diff.removed or diff.changed)
             
             # Only update status indicators when necessary
             if running_models_changed:
@@ -489,79 +670,47 @@ class OllamaFinderGUI:
                     self.status_message.config(text="ALERT: No neural cores active - ship AI functionality limited")
             
             # Monitor for newly started models
-            for model in current_running_models:
-                if model not in self.previous_running_models:
-                    self.log_message(f"\nSYSTEM: Neural core '{model}' initialization sequence complete\n", self.found_color)
-                    try:
-                        from plyer import notification
-                        notification.notify(
-                            title="Neural Core Online",
-                            message=f"Core '{model}' is now operational",
-                            app_name="Ship Mainframe", 
-                            timeout=5
-                        )
-                    except ImportError:
-                        pass
+            for model in diff.started:
+                self.log_message(f"\nSYSTEM: Neural core '{model}' initialization sequence complete\n", self.found_color)
+                self.notify("Neural Core Online", f"Core '{model}' is now operational")
             
             # Monitor for stopped models
-            for model in self.previous_running_models:
-                if model not in current_running_models:
-                    self.log_message(f"\nALERT: Neural core '{model}' has gone offline\n", self.cancelled_color)
-                    
-                    # Handle selection changes only when necessary
-                    if self.selected_running_model == model:
-                        self.selected_running_model = None
-                        if current_running_models:
-                            self.selected_running_model = current_running_models[0]
-                            self.log_message(f"\nSYSTEM: Emergency neural pathway established via core: {self.selected_running_model}\n", self.status_color)
-                    
-                    try:
-                        from plyer import notification
-                        notification.notify(
-                            title="Neural Core Offline",
-                            message=f"Core '{model}' requires maintenance",
-                            app_name="Ship Mainframe",
-                            timeout=5
-                        )
-                    except ImportError:
-                        pass
+            for model in diff.stopped:
+                self.log_message(f"\nALERT: Neural core '{model}' has gone offline\n", self.cancelled_color)
+                
+                # Handle selection changes only when necessary
+                if self.selected_running_model == model:
+                    self.selected_running_model = None
+                    if current_running_models:
+                        self.selected_running_model = current_running_models[0]
+                        self.log_message(f"\nSYSTEM: Emergency neural pathway established via core: {self.selected_running_model}\n", self.status_color)
+                
+                self.notify("Neural Core Offline", f"Core '{model}' requires maintenance")
             
             # Monitor for new available models
-            for model in current_available_models:
-                if model not in self.previous_available_models:
-                    self.log_message(f"\nDATA: New neural pattern detected: '{model}' added to template library\n", self.status_color)
-                    try:
-                        from plyer import notification
-                        notification.notify(
-                            title="Neural Pattern Added",
-                            message=f"Pattern '{model}' available for core initialization",
-                            app_name="Ship Mainframe",
-                            timeout=5
-                        )
-                    except ImportError:
-                        pass
+            for model in diff.added:
+                self.log_message(f"\nDATA: New neural pattern detected: '{model}' added to template library\n", self.status_color)
+                self.notify("Neural Pattern Added", f"Pattern '{model}' available for core initialization")
+            
+            # Monitor for models whose digest changed (re-pulled or re-created)
+            for model in diff.changed:
+                self.log_message(f"\nDATA: Neural pattern '{model}' updated in template library\n", self.status_color)
             
             # Monitor for removed available models
-            for model in self.previous_available_models:
-                if model not in current_available_models:
-                    self.log_message(f"\nALERT: Neural pattern '{model}' has been removed from template library\n", self.cancelled_color)
-                    
-                    if self.selected_model == model:
-                        self.selected_model = None
-                        if current_available_models:
-                            self.selected_model = current_available_models[0]
-                            self.log_message(f"\nSYSTEM: Automatic pattern selection: {self.selected_model}\n", self.status_color)
-                    
-                    try:
-                        from plyer import notification
-                        notification.notify(
-                            title="Neural Pattern Removed",
-                            message=f"Pattern '{model}' no longer available",
-                            app_name="Ship Mainframe",
-                            timeout=5
-                        )
-                    except ImportError:
-                        pass
+            for model in diff.removed:
+                self.log_message(f"\nALERT: Neural pattern '{model}' has been removed from template library\n", self.cancelled_color)
+                
+                if self.selected_model == model:
+                    self.selected_model = None
+                    if current_available_models:
+                        self.selected_model = current_available_models[0]
+                        self.log_message(f"\nSYSTEM: Automatic pattern selection: {self.selected_model}\n", self.status_color)
+                
+                self.notify("Neural Pattern Removed", f"Pattern '{model}' no longer available")
+            
+            # Resident sizes come from the /api/ps records the poll just cached
+            self.model_metrics.update_resident_sizes(
+                [record for record in map(self.inventory.get_record, current_running_models) if record])
             
             # Only update UI components when actually needed
             if running_models_changed:
@@ -577,18 +726,9 @@ class OllamaFinderGUI:
                 
                 if current_available_models and not self.selected_model and not self.selected_running_model:
                     self.selected_model = current_available_models[0]
-            
-            # Store current state for next comparison
-            self.previous_running_models = current_running_models.copy()
-            self.previous_available_models = current_available_models.copy()
         
         except Exception as e:
-            error_class = e.__class__.__name__
-            self.log_message(f"\nCRITICAL: Neural monitoring subsystem failure - {error_class}\n", self.not_found_color)
-            self.log_message(f"Error details: {str(e)}", self.not_found_color)
-        
-        # Schedule next check using a different approach to reduce flickering
-        self.monitor_task = self.master.after(self.monitor_interval, self.monitor_running_models)
+            self.report_monitor_failure(e)
 
     def toggle_monitoring(self):
         """
@@ -670,12 +810,10 @@ class OllamaFinderGUI:
                 ollama_path = ollama_in_path
         
         # If still not found, look for the saved location
-        if not ollama_path and os.path.exists("ollam-ah.dat"):
-            try:
-                with open("ollam-ah.dat", "r") as f:
-                    ollama_path = f.read().strip()
-            except Exception as e:
-                self.log_message(f"Error reading Ollama location: {e}", self.not_found_color)
+        if not ollama_path:
+            cached = load_location()
+            if cached:
+                ollama_path = cached["path"]
         
         # Extract directory from path if found
         if ollama_path:
@@ -695,9 +833,14 @@ class OllamaFinderGUI:
 
     def stop_current_operation(self, event=None):
         """Stop the current operation (model execution, etc.)"""
-        # This is a placeholder for handling Escape key presses
-        # The actual implementation would depend on what operation is running
         self.log_message("Stopping current operation...", self.cancelled_color)
+        if self.active_chat and self.active_chat.is_active():
+            # Closes the open stream so the server frees the model slot right away
+            self.active_chat.cancel()
+            self.log_message("Chat generation cancelled.", self.cancelled_color)
+        for runner in list(self.running_commands):
+            runner.terminate()
+            self.log_message(f"Terminating: {' '.join(runner.command)}", self.cancelled_color)
 
     def search_models(self):
         """Search for models based on the input in the search bar."""
@@ -707,7 +850,7 @@ class OllamaFinderGUI:
             return
 
         # Perform the search (placeholder logic)
-        matching_models = [model for model in self.previous_available_models if search_query.lower() in model.lower()]
+        matching_models = [model for model in self.inventory.available_names() if search_query.lower() in model.lower()]
 
         if matching_models:
             self.log_message(f"Found {len(matching_models)} matching models:", self.found_color)
@@ -796,21 +939,52 @@ class OllamaFinderGUI:
         finally:
             self.models_context_menu.grab_release()
 
-    def show_batch_operations(self):
-        """Display a dialog for batch operations on models."""
-        try:
-            # Placeholder logic for batch operations
-            batch_window = tk.Toplevel(self.master)
-            batch_window.title("Batch Operations")
-            batch_window.geometry("400x300")
+    def warm_up_selected_model(self):
+        """Loads the selected model in the background so the first chat message doesn't wait for it."""
+        selected_model = self.models_listbox.get(tk.ACTIVE)
+        if selected_model:
+            warm_up_model(self, selected_model, force=True)
+        else:
+            self.log_message("No model selected to warm up.", self.not_found_color)
 
-            label = ttk.Label(batch_window, text="Batch operations are under development.", font=("Segoe UI", 10))
-            label.pack(pady=20)
+    def toggle_hot_model(self):
+        """Mark the selected model hot (kept loaded until unmarked) or return it to the normal keep-alive."""
+        selected_model = self.models_listbox.get(tk.ACTIVE)
+        if selected_model:
+            hot = not self.model_warmer.is_hot(selected_model)
+            self.model_warmer.set_hot(selected_model, hot)
+            status = "marked hot - keeping it loaded" if hot else f"no longer hot - it unloads after {self.warmup_keep_alive} idle"
+            self.log_message(f"Model '{selected_model}' {status}.", self.found_color)
+        else:
+            self.log_message("No model selected to mark hot.", self.not_found_color)
 
-            close_button = ttk.Button(batch_window, text="Close", command=batch_window.destroy)
-            close_button.pack(pady=10)
+    def open_benchmark(self):
+        """Open the benchmark window for the models selected in the models list."""
+        models = [m for m in self.selected_models if m in self.inventory.available_names()]
+        if not models:
+            self.log_message("Select one or more models to benchmark.", self.not_found_color)
+            return
+        try:
+            from ollama_benchmark import BenchmarkStore, BenchmarkDialog
+            if self.benchmark_store is None:
+                self.benchmark_store = BenchmarkStore()
+            BenchmarkDialog(self, models, self.benchmark_store)
+        except Exception as e:
+            self.log_message(f"Failed to open benchmark window: {e}", self.not_found_color)
 
-            self.log_message("Opened batch operations dialog.", self.found_color)
+    def show_batch_operations(self):
+        """Display a dialog for batch operations on the models selected in the models list."""
+        try:
+            models = [m for m in self.selected_models if m in self.inventory.available_names()]
+            if not models:
+                self.log_message("Select one or more models (Shift/Ctrl-click) for batch operations.", self.not_found_color)
+                return
+            runner = BatchRunner(self.tasks, max_workers=self.batch_workers)
+            BatchDialog(self, models, runner,
+                        on_pull=self.pull_manager.enqueue,
+                        on_started=lambda operation: batch_started(self, operation),
+                        on_finished=lambda operation, results: batch_finished(self, operation, results))
+            self.log_message(f"Opened batch operations dialog for {len(models)} model(s).", self.found_color)
         except Exception as e:
             self.log_message(f"Failed to open batch operations dialog: {e}", self.not_found_color)
 
@@ -831,53 +1005,78 @@ class OllamaFinderGUI:
         except Exception as e:
             self.log_message(f"Failed to open parameter presets management dialog: {e}", self.not_found_color)
 
+    def search_chat_history(self, event=None):
+        """Re-runs the History search a moment after the user stops typing."""
+        if self.history_search_job is not None:
+            self.master.after_cancel(self.history_search_job)
+        self.history_search_job = self.master.after(250, self.run_history_search)
+
+    def run_history_search(self):
+        self.history_search_job = None
+        query = self.history_search_var.get().strip()
+        if query != self.history_browser.query:
+            self.history_browser.reload(query)
+
     def load_chat_history(self, event=None):
-        """Load the selected chat history from the history listbox."""
-        selected_history = self.history_listbox.get(tk.ACTIVE)
-        if selected_history:
-            try:
-                # Placeholder logic for loading chat history
-                self.chat_text.config(state=tk.NORMAL)
-                self.chat_text.delete(1.0, tk.END)
-                self.chat_text.insert(tk.END, f"Loaded chat history for: {selected_history}\n")
-                self.chat_text.config(state=tk.DISABLED)
-                self.log_message(f"Chat history for '{selected_history}' loaded successfully.", self.found_color)
-            except Exception as e:
-                self.log_message(f"Failed to load chat history: {e}", self.not_found_color)
-        else:
+        """Load the conversation selected in the history listbox into the chat pane."""
+        summary = self.history_browser.selected()
+        if summary is None:
             self.log_message("No chat history selected to load.", self.not_found_color)
+            return
+        self.tasks.submit(self.chat_history.messages, summary.id,
+                          on_done=lambda messages: self.show_stored_conversation(summary, messages),
+                          on_error=lambda e: self.log_message(f"Failed to load chat history: {e}", self.not_found_color))
+
+    def show_stored_conversation(self, summary, messages):
+        """Replays stored messages into the chat pane; new messages continue the same conversation."""
+        self.chat_sink.clear()
+        for message in messages:
+            if message.role == "user":
+                self.chat_sink.write("CREW: " + message.content + "\n", "user")
+            elif message.role == "assistant":
+                self.chat_sink.write("SHIP AI: ", "ai")
+                self.chat_sink.write(message.content + "\n\n", "ai")
+        self.chat_conversation_id = summary.id
+        self.conversation = self.new_conversation()
+        for message in messages:
+            if message.role == "user":
+                # The history also keeps questions that got no reply; only answered ones are context
+                self.conversation.discard_unanswered()
+                self.conversation.add("user", message.content)
+            elif message.role == "assistant":
+                self.conversation.add("assistant", message.content, tokens=message.eval_tokens)
+        self.conversation.discard_unanswered()
+        self.log_message(f"Chat history '{summary.title}' loaded ({len(messages)} messages).", self.found_color)
 
     def save_chat_history(self):
-        """Save the current chat history to a file."""
-        file_path = simpledialog.askstring("Save Chat History", "Enter the file path to save the chat history:", parent=self.master)
-        if file_path:
-            try:
-                # Placeholder logic for saving chat history
-                with open(file_path, 'w') as file:
-                    chat_content = self.chat_text.get(1.0, tk.END).strip()
-                    file.write(chat_content)
-                self.log_message(f"Chat history saved to {file_path}", self.found_color)
-            except Exception as e:
-                self.log_message(f"Failed to save chat history: {e}", self.not_found_color)
+        """Name the current conversation; its messages are stored as they are sent and received."""
+        if self.chat_conversation_id is None:
+            self.log_message("No chat messages to save yet.", self.not_found_color)
+            return
+        title = simpledialog.askstring("Save Chat History", "Enter a title for this conversation:", parent=self.master)
+        if title and title.strip():
+            future = self.chat_history.rename_conversation(self.chat_conversation_id, title.strip())
+            future.add_done_callback(lambda f: self.tasks.post(self.history_browser.reload))
+            self.log_message(f"Chat history saved as '{title.strip()}'.", self.found_color)
         else:
             self.log_message("Save chat history canceled.", self.not_found_color)
 
     def delete_chat_history(self):
-        """Delete the selected chat history from the history listbox."""
-        selected_history = self.history_listbox.get(tk.ACTIVE)
-        if selected_history:
-            confirm = tk.messagebox.askyesno("Delete Chat History", f"Are you sure you want to delete the chat history for '{selected_history}'?")
-            if confirm:
-                try:
-                    # Placeholder logic for deleting chat history
-                    self.history_listbox.delete(tk.ACTIVE)
-                    self.log_message(f"Chat history for '{selected_history}' deleted successfully.", self.found_color)
-                except Exception as e:
-                    self.log_message(f"Failed to delete chat history: {e}", self.not_found_color)
-            else:
-                self.log_message("Delete chat history canceled.", self.not_found_color)
-        else:
+        """Delete the conversation selected in the history listbox."""
+        summary = self.history_browser.selected()
+        if summary is None:
             self.log_message("No chat history selected to delete.", self.not_found_color)
+            return
+        confirm = tk.messagebox.askyesno("Delete Chat History", f"Are you sure you want to delete the chat history '{summary.title}'?")
+        if confirm:
+            self.chat_history.delete_conversation(summary.id)
+            self.history_browser.remove(summary.id)
+            if self.chat_conversation_id == summary.id:
+                self.chat_conversation_id = None
+                self.conversation = self.new_conversation()
+            self.log_message(f"Chat history '{summary.title}' deleted successfully.", self.found_color)
+        else:
+            self.log_message("Delete chat history canceled.", self.not_found_color)
 
     def toggle_theme(self):
         """Toggle between light and dark themes."""
@@ -951,9 +1150,7 @@ class OllamaFinderGUI:
     def clear_chat(self):
         """Clear the chat content in the chat text widget."""
         try:
-            self.chat_text.config(state=tk.NORMAL)
-            self.chat_text.delete(1.0, tk.END)
-            self.chat_text.config(state=tk.DISABLED)
+            self.chat_sink.clear()
             self.log_message("Chat cleared successfully.", self.found_color)
         except Exception as e:
             self.log_message(f"Failed to clear chat: {e}", self.not_found_color)
@@ -989,9 +1186,10 @@ class OllamaFinderGUI:
     def start_new_chat(self):
         """Start a new chat by clearing the chat text widget and resetting the state."""
         try:
-            self.chat_text.config(state=tk.NORMAL)
-            self.chat_text.delete(1.0, tk.END)
-            self.chat_text.config(state=tk.DISABLED)
+            self.chat_sink.clear()
+            self.chat_conversation_id = None
+            self.conversation = self.new_conversation()
+            self.history_browser.reload()  # the previous conversation moves to the top
             self.log_message("New chat started.", self.found_color)
         except Exception as e:
             self.log_message(f"Failed to start new chat: {e}", self.not_found_color)
@@ -1007,10 +1205,11 @@ class OllamaFinderGUI:
     def filter_models_by_category(self, category):
         """Filter the models displayed in the listbox by the selected category."""
         # Placeholder logic for filtering models
+        available_models = self.inventory.available_names()
         if category == "All":
-            filtered_models = self.previous_available_models
+            filtered_models = available_models
         else:
-            filtered_models = [model for model in self.previous_available_models if category.lower() in model.lower()]
+            filtered_models = [model for model in available_models if category.lower() in model.lower()]
 
         # Update the models listbox with the filtered models
         self.models_listbox.delete(0, tk.END)
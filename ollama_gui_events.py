@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox
 import subprocess
 from ollama_functions import get_model_information
+from ollama_commands import refresh_inventory
 from ollama_gui_listbox import show_model_information, show_running_model_information, display_model_information
 
 def bind_events(self, master):
@@ -19,18 +20,29 @@ def show_command_info(self, message):
     self.model_info_text.config(state=tk.DISABLED)
 
 def stop_selected_model(self):
+    """
+    Stops the selected running model. 'ollama stop' and the inventory refresh run on the
+    task pool, so a server that is slow to unload the model doesn't freeze the window.
+    """
     if self.selected_running_model:
-        try:
-            subprocess.run(["ollama", "stop", self.selected_running_model], check=True)
-            self.log_message(f"Stopping model: {self.selected_running_model}", self.cancelled_color)
-            self.populate_running_models_list()  # Refresh the list
-            self.stop_button.config(state=tk.DISABLED)
-            self.selected_running_model = None
-            display_model_information(self, "")
-        except FileNotFoundError:
-            messagebox.showerror("Error", "Ollama not found. Please ensure it is installed and in your PATH.")
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"Error stopping model: {e}")
+        model_name = self.selected_running_model
+
+        def stopped(result):
+            self.log_message(f"Stopped model: {model_name}", self.cancelled_color)
+            refresh_inventory(self, available=False)  # repaints the running list
+
+        def failed(e):
+            if isinstance(e, FileNotFoundError):
+                messagebox.showerror("Error", "Ollama not found. Please ensure it is installed and in your PATH.")
+            else:
+                messagebox.showerror("Error", f"Error stopping model: {e}")
+
+        self.log_message(f"Stopping model: {model_name}", self.cancelled_color)
+        self.tasks.submit(subprocess.run, ["ollama", "stop", model_name], check=True,
+                          on_done=stopped, on_error=failed)
+        self.stop_button.config(state=tk.DISABLED)
+        self.selected_running_model = None
+        display_model_information(self, "")
     else:
         messagebox.showinfo("Info", "No running model selected. Please select a model from the list.")
 
@@ -1,13 +1,47 @@
 import tkinter as tk
 from tkinter import messagebox
-from ollama_functions import get_model_information, get_running_instance_info
+from ollama_functions import get_model_information
+from ollama_api import RunningModelRecord, format_running_instance
+from ollama_commands import warm_up_model
+
+def lookup_model_information(self, model_name, on_ready):
+    """
+    Calls on_ready(model_info) with the 'ollama show' text for a model.
+    Served from the digest-keyed details cache when possible; otherwise fetched
+    on a worker thread and cached under the model's current digest.
+    """
+    record = self.inventory.get_record(model_name)
+    digest = record.digest if record else None
+    if digest:
+        cached = self.details_cache.get(digest)
+        if cached is not None:
+            on_ready(cached)
+            return
+
+    def fetch():
+        model_info = get_model_information(model_name)
+        if model_info and digest:
+            self.details_cache.put(digest, model_info)
+        return model_info
+
+    self.tasks.submit(fetch, on_done=on_ready)
 
 def show_model_information(self, event):
     selection = self.models_listbox.curselection()
+    self.selected_models = [self.models_listbox.get(i) for i in selection]
     if selection:
-        self.selected_model = self.models_listbox.get(selection[0])
-        model_info = get_model_information(self.selected_model)
-        display_model_information(self, model_info)
+        model_name = self.models_listbox.get(selection[0])
+        self.selected_model = model_name
+
+        def render(model_info):
+            # Ignore results for a row the user has already moved away from
+            if self.selected_model == model_name:
+                display_model_information(self, model_info)
+
+        display_model_information(self, "Loading model information...")
+        lookup_model_information(self, model_name, render)
+        if self.warm_on_select_var.get() and len(selection) == 1:
+            warm_up_model(self, model_name)
         # Enable the Run button if it exists
         if hasattr(self, 'run_button'):
             self.run_button.config(state=tk.NORMAL)
@@ -20,20 +54,26 @@ def show_model_information(self, event):
 def show_running_model_information(self, event):
     selection = self.running_models_listbox.curselection()
     if selection:
-        self.selected_running_model = self.running_models_listbox.get(selection[0])
-        base_info = get_model_information(self.selected_running_model)
-        instance_info = get_running_instance_info(self.selected_running_model)
-        model_info = base_info if base_info else ""
-        model_info += f"\n\n{instance_info}" if instance_info else ""
-
-        # Output to output_text instead of model_info_text
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete("1.0", tk.END)
-        if model_info:
-            self.output_text.insert(tk.END, model_info)
-        else:
-            self.output_text.insert(tk.END, "Could not retrieve model information.")
-        self.output_text.config(state=tk.DISABLED)
+        model_name = self.running_models_listbox.get(selection[0])
+        self.selected_running_model = model_name
+
+        def render(base_info):
+            if self.selected_running_model != model_name:
+                return
+            # Instance details come from the cached /api/ps records
+            record = self.inventory.get_record(model_name)
+            instance_info = format_running_instance(record) if isinstance(record, RunningModelRecord) else ""
+            model_info = base_info if base_info else ""
+            model_info += f"\n\n{instance_info}" if instance_info else ""
+
+            # Output to output_text instead of model_info_text
+            self.output_sink.clear()
+            if model_info:
+                self.output_sink.write(model_info)
+            else:
+                self.output_sink.write("Could not retrieve model information.")
+
+        lookup_model_information(self, model_name, render)
 
         # Enable the Stop button if it exists
         if hasattr(self, 'stop_button'):
@@ -44,10 +84,8 @@ def show_running_model_information(self, event):
             self.stop_button.config(state=tk.DISABLED)
         self.selected_running_model = None
 
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert(tk.END, "No running model selected.")
-        self.output_text.config(state=tk.DISABLED)
+        self.output_sink.clear()
+        self.output_sink.write("No running model selected.")
 
 def display_model_information(self, model_info):
     self.model_info_text.config(state=tk.NORMAL)
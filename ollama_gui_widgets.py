@@ -1,9 +1,9 @@
 import tkinter as tk
 from tkinter import scrolledtext, Listbox, ttk, filedialog, simpledialog
-import webbrowser
 import os
 import json
 from ollama_system_monitor import SystemMonitor, ModelMetricsMonitor
+from ollama_profiling import profile_phase
 
 class HoverTooltip:
     """
@@ -66,6 +66,7 @@ class HoverTooltip:
     def _on_tooltip_click(self, event):
         # Check if ALT is held
         if (event.state & 0x20000) != 0 and self.link_url:
+            import webbrowser
             webbrowser.open(self.link_url)
 
 def create_left_frame(self):
@@ -116,6 +117,8 @@ def create_left_frame(self):
     # Models listbox with scrollbar
     self.models_listbox = tk.Listbox(
         models_tab,
+        selectmode=tk.EXTENDED,  # Shift/Ctrl-click to select several models for batch operations
+        exportselection=False,
         bg="#ffffff",
         fg="#333333",
         selectbackground=self.listbox_select_color,
@@ -142,6 +145,11 @@ def create_left_frame(self):
     self.models_context_menu.add_command(label="Tag Model", command=self.tag_selected_model)
     self.models_context_menu.add_command(label="Toggle Favorite", command=self.toggle_favorite)
     self.models_context_menu.add_separator()
+    self.models_context_menu.add_command(label="Warm Up Now", command=self.warm_up_selected_model)
+    self.models_context_menu.add_command(label="Toggle Hot (Keep Loaded)", command=self.toggle_hot_model)
+    self.warm_on_select_var = tk.BooleanVar(value=False)  # Warm models up as soon as they are selected
+    self.models_context_menu.add_checkbutton(label="Warm Up on Select", variable=self.warm_on_select_var)
+    self.models_context_menu.add_separator()
     self.models_context_menu.add_command(label="Export Configuration", command=self.export_model_config)
     self.models_context_menu.add_separator()
     self.models_context_menu.add_command(label="Create Model", command=self.open_modelfile_builder)
@@ -167,6 +175,9 @@ def create_left_frame(self):
     batch_btn = ttk.Button(model_actions_frame, text="Batch...", width=button_width//2, style="Secondary.TButton", command=self.show_batch_operations)
     batch_btn.pack(side=tk.LEFT, padx=2, pady=0)
     
+    benchmark_btn = ttk.Button(model_actions_frame, text="Benchmark...", width=button_width//2, style="Secondary.TButton", command=self.open_benchmark)
+    benchmark_btn.pack(side=tk.LEFT, padx=2, pady=0)
+    
     # Running Models Tab
     running_tab = ttk.Frame(model_notebook)
     model_notebook.add(running_tab, text="Running")
@@ -229,6 +240,12 @@ def create_left_frame(self):
     history_tab = ttk.Frame(model_notebook)
     model_notebook.add(history_tab, text="History")
     
+    # Search box: filters the stored conversations by message text
+    self.history_search_var = tk.StringVar()
+    history_search_entry = ttk.Entry(history_tab, textvariable=self.history_search_var, font=("Segoe UI", 8))
+    history_search_entry.pack(fill=tk.X, padx=0, pady=(5, 0))
+    history_search_entry.bind('<KeyRelease>', self.search_chat_history)
+    
     # Chat history listbox
     self.history_listbox = tk.Listbox(
         history_tab,
@@ -245,9 +262,9 @@ def create_left_frame(self):
     self.history_listbox.pack(fill=tk.BOTH, expand=True, padx=0, pady=5)
     
     # Scrollbar for history listbox
-    history_scrollbar = ttk.Scrollbar(history_tab, orient=tk.VERTICAL, command=self.history_listbox.yview)
-    history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    self.history_listbox.config(yscrollcommand=history_scrollbar.set)
+    # (the listbox's yscrollcommand is set by the HistoryBrowser, which pages in rows as it scrolls)
+    self.history_scrollbar = ttk.Scrollbar(history_tab, orient=tk.VERTICAL, command=self.history_listbox.yview)
+    self.history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
     
     # Bind double-click to load history
     self.history_listbox.bind('<Double-1>', self.load_chat_history)
@@ -405,7 +422,7 @@ def create_right_frame(self):
     cmd_button_frame.pack(fill=tk.X, padx=0, pady=5)
     
     # Initialize the clear button
-    self.clear_button = ttk.Button(cmd_button_frame, text="Clear", width=10, style="Secondary.TButton", command=lambda e=None: self.output_text.delete(1.0, tk.END))
+    self.clear_button = ttk.Button(cmd_button_frame, text="Clear", width=10, style="Secondary.TButton", command=lambda e=None: self.output_sink.clear())
     self.clear_button.pack(side=tk.LEFT, padx=5, pady=5)
     
     # Initialize the question mark button
@@ -495,6 +512,11 @@ def create_right_frame(self):
     self.chat_model_dropdown = ttk.Combobox(system_frame, textvariable=self.chat_model_var, width=15, font=("Segoe UI", 9))
     self.chat_model_dropdown.pack(side=tk.LEFT, padx=2, pady=0)
     
+    # Stream replies token by token instead of waiting for the full completion
+    self.stream_chat_var = tk.BooleanVar(value=True)
+    stream_check = ttk.Checkbutton(system_frame, text="Stream", variable=self.stream_chat_var)
+    stream_check.pack(side=tk.LEFT, padx=2, pady=0)
+    
     # Chat input area
     chat_input_frame = ttk.Frame(self.chat_frame)
     chat_input_frame.pack(fill=tk.X, padx=0, pady=5)
@@ -565,8 +587,9 @@ def create_widgets(self, master):
     # Create tooltip handler
     self.tooltip = HoverTooltip(self)
     
-    # Create system monitor - passing self as the parent application instance
-    self.system_monitor = SystemMonitor(self)
-    
-    # Model metrics (initialized but updated later)
-    self.model_metrics = ModelMetricsMonitor(self)
\ No newline at end of file
+    with profile_phase("monitors"):
+        # Create system monitor - passing self as the parent application instance
+        self.system_monitor = SystemMonitor(self)
+        
+        # Model metrics (initialized but updated later)
+        self.model_metrics = ModelMetricsMonitor(self)
\ No newline at end of file
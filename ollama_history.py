@@ -0,0 +1,380 @@
+"""
+Chat history for Ollama GUI
+Stores every chat message with its model, request parameters and timings in a SQLite
+database (WAL mode, full-text indexed with FTS5 where available) and shows the stored
+conversations in the History tab a page at a time
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import tkinter as tk
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ollama_location import user_data_dir
+
+ConversationSummary = namedtuple("ConversationSummary", [
+    "id", "title", "model", "created", "updated", "message_count", "snippet",
+])
+
+StoredMessage = namedtuple("StoredMessage", [
+    "role", "content", "model", "params", "created", "first_token_ms", "total_ms",
+    "prompt_tokens", "eval_tokens", "eval_ms", "load_ms",
+])
+
+# Timing fields of StoredMessage, filled from the chat's final chunk
+METRIC_FIELDS = StoredMessage._fields[5:]
+
+TITLE_LENGTH = 60
+
+
+def message_metrics(final_chunk, first_token_ms=None, total_ms=None):
+    """
+    Returns the timing metadata stored with an assistant message
+
+    Args:
+        final_chunk (dict): Last chunk of the chat stream
+        first_token_ms: Time to first token measured by the client
+        total_ms: Wall time of the whole request
+    """
+    def ms(field):
+        value = final_chunk.get(field)
+        return value / 1e6 if value is not None else None
+    return {
+        "first_token_ms": first_token_ms,
+        "total_ms": total_ms,
+        "prompt_tokens": final_chunk.get("prompt_eval_count"),
+        "eval_tokens": final_chunk.get("eval_count"),
+        "eval_ms": ms("eval_duration"),
+        "load_ms": ms("load_duration"),
+    }
+
+
+def fts_query(text):
+    """Turns free text into an FTS5 query matching every word as a prefix"""
+    words = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class ChatHistoryStore:
+    """
+    SQLite file holding conversations and their messages.
+    Writes are queued to a single writer thread so they keep their order and never block
+    the Tk thread; reads use a second connection, which WAL lets run alongside a write.
+    Both connections are opened on first use, keeping the database off the startup path.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            model TEXT,
+            created REAL NOT NULL,
+            updated REAL NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS conversations_updated ON conversations(updated DESC, id);
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY,
+            conversation_id TEXT NOT NULL REFERENCES conversations(id),
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            model TEXT,
+            params TEXT,
+            created REAL NOT NULL,
+            first_token_ms REAL,
+            total_ms REAL,
+            prompt_tokens INTEGER,
+            eval_tokens INTEGER,
+            eval_ms REAL,
+            load_ms REAL
+        );
+        CREATE INDEX IF NOT EXISTS messages_conversation ON messages(conversation_id, id);
+    """
+
+    # External-content index: the text lives only in messages, the triggers keep it in step
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            content, content='messages', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END;
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize the store
+
+        Args:
+            path (str, optional): Database file, defaults to chat_history.db in the user data directory
+        """
+        self.path = path or os.path.join(user_data_dir(), "chat_history.db")
+        self.has_fts = None  # known once the database is opened
+        self._lock = threading.Lock()
+        self._reader = None
+        self._writer = None
+        self._write_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-history")
+
+    def _open(self):
+        """Opens both connections and creates the schema; called under the lock"""
+        if self._writer is not None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        writer = sqlite3.connect(self.path, check_same_thread=False)
+        writer.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints: a crash can lose the last messages, not corrupt the file
+        writer.execute("PRAGMA synchronous=NORMAL")
+        with writer:
+            writer.executescript(self.SCHEMA)
+        try:
+            with writer:
+                writer.executescript(self.FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False  # SQLite built without FTS5; search falls back to LIKE
+        self._writer = writer
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+
+    def _read(self, sql, parameters=()):
+        with self._lock:
+            self._open()
+            return self._reader.execute(sql, parameters).fetchall()
+
+    def _write(self, func, *args):
+        """Queues func(connection, *args) on the writer thread; returns its Future"""
+        def run():
+            with self._lock:
+                self._open()
+                writer = self._writer
+            # The writer connection is only used from this thread, so the write itself runs unlocked
+            with writer:
+                return func(writer, *args)
+        return self._write_queue.submit(run)
+
+    def add_message(self, conversation_id, role, content, model=None, params=None, metrics=None):
+        """
+        Queues a message for storage, creating its conversation on the first message.
+
+        Args:
+            conversation_id (str): Key chosen by the caller for the conversation
+            role (str): "user", "assistant" or "system"
+            content (str): The message text
+            model (str, optional): Model the message was sent to or came from
+            params (dict, optional): Request parameters (options, keep_alive, ...)
+            metrics (dict, optional): Timing fields, see message_metrics
+
+        Returns:
+            concurrent.futures.Future that completes once the row is written
+        """
+        now = time.time()
+        metrics = metrics or {}
+        row = (conversation_id, role, content, model, json.dumps(params) if params else None, now,
+               *(metrics.get(field) for field in METRIC_FIELDS))
+        title = " ".join(content.split())[:TITLE_LENGTH] or "(empty)"
+
+        def insert(connection):
+            connection.execute(
+                "INSERT OR IGNORE INTO conversations (id, title, model, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, title, model, now, now))
+            connection.execute(
+                f"INSERT INTO messages (conversation_id, role, content, model, params, created, "
+                f"{', '.join(METRIC_FIELDS)}) VALUES ({', '.join('?' * len(row))})", row)
+            connection.execute(
+                "UPDATE conversations SET updated = ?, message_count = message_count + 1, "
+                "model = COALESCE(?, model) WHERE id = ?", (now, model, conversation_id))
+        return self._write(insert)
+
+    def rename_conversation(self, conversation_id, title):
+        return self._write(lambda connection: connection.execute(
+            "UPDATE conversations SET title = ? WHERE id = ?", (title, conversation_id)))
+
+    def delete_conversation(self, conversation_id):
+        def delete(connection):
+            connection.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+            connection.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+        return self._write(delete)
+
+    def list_conversations(self, limit=100, after=None):
+        """
+        Returns one page of conversations, most recently updated first.
+
+        Args:
+            limit: Page size
+            after (ConversationSummary, optional): Last row of the previous page; paging by
+                key instead of OFFSET keeps every page as cheap as the first
+        """
+        columns = "id, title, model, created, updated, message_count, NULL"
+        if after is None:
+            rows = self._read(f"SELECT {columns} FROM conversations ORDER BY updated DESC, id LIMIT ?", (limit,))
+        else:
+            rows = self._read(
+                f"SELECT {columns} FROM conversations WHERE updated < ? OR (updated = ? AND id > ?) "
+                f"ORDER BY updated DESC, id LIMIT ?", (after.updated, after.updated, after.id, limit))
+        return [ConversationSummary(*row) for row in rows]
+
+    def search(self, text, limit=100, offset=0):
+        """
+        Returns one page of the conversations with a message containing every word of
+        text (as a word prefix), best match first, each with a snippet of that message
+        """
+        query = fts_query(text)
+        if not query:
+            return []
+        with self._lock:
+            self._open()
+        if not self.has_fts:
+            words = text.split()
+            rows = self._read(
+                f"SELECT c.id, c.title, c.model, c.created, c.updated, c.message_count, NULL "
+                f"FROM conversations c WHERE EXISTS (SELECT 1 FROM messages m WHERE m.conversation_id = c.id AND "
+                f"{' AND '.join('m.content LIKE ?' for _ in words)}) ORDER BY c.updated DESC LIMIT ? OFFSET ?",
+                (*(f"%{word}%" for word in words), limit, offset))
+            return [ConversationSummary(*row) for row in rows]
+        rows = self._read(
+            "SELECT c.id, c.title, c.model, c.created, c.updated, c.message_count, NULL "
+            "FROM (SELECT m.conversation_id, MIN(messages_fts.rank) AS rank "
+            "      FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+            "      WHERE messages_fts MATCH ? GROUP BY m.conversation_id) hit "
+            "JOIN conversations c ON c.id = hit.conversation_id "
+            "ORDER BY hit.rank, c.updated DESC LIMIT ? OFFSET ?", (query, limit, offset))
+        if not rows:
+            return []
+        # snippet() can't be used in an aggregate query, so the page's snippets are a second query
+        snippets = {}
+        for conversation_id, snippet in self._read(
+                f"SELECT m.conversation_id, snippet(messages_fts, 0, '[', ']', '...', 8) "
+                f"FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                f"WHERE messages_fts MATCH ? AND m.conversation_id IN ({', '.join('?' * len(rows))}) "
+                f"ORDER BY messages_fts.rank", (query, *(row[0] for row in rows))):
+            snippets.setdefault(conversation_id, snippet)
+        return [ConversationSummary(*row[:6], snippets.get(row[0])) for row in rows]
+
+    def messages(self, conversation_id):
+        """Returns the StoredMessages of a conversation in the order they were written"""
+        rows = self._read(
+            f"SELECT {', '.join(StoredMessage._fields)} FROM messages WHERE conversation_id = ? ORDER BY id",
+            (conversation_id,))
+        return [StoredMessage(*row[:3], json.loads(row[3]) if row[3] else {}, *row[4:]) for row in rows]
+
+    def flush(self):
+        """Waits until every queued write is stored"""
+        self._write_queue.submit(lambda: None).result()
+
+    def close(self):
+        self._write_queue.shutdown(wait=True)
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._reader.close()
+                self._writer = self._reader = None
+
+
+def format_conversation(summary):
+    """Renders a conversation as one History list row"""
+    when = datetime.fromtimestamp(summary.updated).strftime("%Y-%m-%d %H:%M")
+    text = f"{when}  {summary.title}  ({summary.model or '?'}, {summary.message_count} msgs)"
+    if summary.snippet:
+        text += f"  {' '.join(summary.snippet.split())}"
+    return text
+
+
+class HistoryBrowser:
+    """
+    Fills the History listbox with stored conversations a page at a time. The next page
+    is fetched on a worker once the list is scrolled near its end, so the tab opens
+    immediately however many conversations are stored. Runs on the Tk thread.
+    """
+
+    def __init__(self, listbox, scrollbar, store, tasks, page_size=100, on_error=None):
+        """
+        Initialize the browser
+
+        Args:
+            listbox (tk.Listbox): The History list
+            scrollbar (ttk.Scrollbar): The list's scrollbar
+            store (ChatHistoryStore): Where the conversations are read from
+            tasks (TaskRunner): Runs the queries off the Tk thread
+            page_size: Rows fetched per query
+            on_error: Called on the Tk thread with the exception when a query fails
+        """
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.store = store
+        self.tasks = tasks
+        self.page_size = page_size
+        self.on_error = on_error
+        self.rows = []  # ConversationSummary per listbox line
+        self.query = ""
+        self.exhausted = False
+        self.loading = False
+        self.generation = 0  # bumped on reload so a page for a stale query is dropped
+        listbox.config(yscrollcommand=self._scrolled)
+
+    def reload(self, query=None):
+        """Clears the list and loads the first page, of the search results if query is set"""
+        if query is not None:
+            self.query = query.strip()
+        self.generation += 1
+        self.rows = []
+        self.exhausted = False
+        self.loading = False
+        self.listbox.delete(0, tk.END)
+        self.load_next_page()
+
+    def load_next_page(self):
+        if self.loading or self.exhausted:
+            return
+        self.loading = True
+        generation = self.generation
+        if self.query:
+            call = (self.store.search, self.query, self.page_size, len(self.rows))
+        else:
+            call = (self.store.list_conversations, self.page_size, self.rows[-1] if self.rows else None)
+        self.tasks.submit(*call,
+                          on_done=lambda rows: self._page_loaded(generation, rows),
+                          on_error=lambda e: self._page_failed(generation, e))
+
+    def _page_loaded(self, generation, rows):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = len(rows) < self.page_size
+        self.rows.extend(rows)
+        self.listbox.insert(tk.END, *map(format_conversation, rows))
+
+    def _page_failed(self, generation, error):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = True
+        if self.on_error:
+            self.on_error(error)
+
+    def _scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        # Also fires after a page is inserted, so a page shorter than the list keeps it filling
+        if float(last) > 0.9:
+            self.load_next_page()
+
+    def selected(self):
+        """Returns the ConversationSummary of the active row, or None"""
+        selection = self.listbox.curselection()
+        index = selection[0] if selection else None
+        if index is None or index >= len(self.rows):
+            return None
+        return self.rows[index]
+
+    def remove(self, conversation_id):
+        for index, row in enumerate(self.rows):
+            if row.id == conversation_id:
+                del self.rows[index]
+                self.listbox.delete(index)
+                return
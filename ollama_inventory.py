@@ -0,0 +1,214 @@
+"""
+Shared model inventory cache for Ollama GUI
+Holds the last /api/tags and /api/ps results behind a TTL so every consumer reads the
+same snapshot, and reports which models were added, removed or changed by digest
+"""
+
+import sys
+import threading
+import time
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ollama_api import get_client, OllamaAPIError
+
+InventoryDiff = namedtuple("InventoryDiff", ["added", "removed", "changed", "started", "stopped"])
+
+
+def _diff_records(old, new):
+    """Compares two name -> record maps and returns (added, removed, changed) name lists"""
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    changed = [name for name in new if name in old and new[name].digest != old[name].digest]
+    return added, removed, changed
+
+
+class ModelInventory:
+    """Caches the available and running model lists with change detection"""
+
+    def __init__(self, available_ttl=30.0, running_ttl=2.5, client_factory=get_client):
+        """
+        Initialize the inventory
+
+        Args:
+            available_ttl: Seconds before the /api/tags result is considered stale
+            running_ttl: Seconds before the /api/ps result is considered stale
+            client_factory: Callable returning the OllamaClient to query
+        """
+        self.ttl = {"available": available_ttl, "running": running_ttl}
+        self.client_factory = client_factory
+        self.records = {"available": {}, "running": {}}
+        self.fetched_at = {"available": None, "running": None}
+        self.fetch_counts = {"available": 0, "running": 0}
+        self.errors = {"available": None, "running": None}  # error of each list's last fetch
+        # Fetches of a list are numbered as they start; a result older than one already
+        # applied is dropped, so overlapping refreshes can't put back an outdated snapshot
+        self._fetches_started = {"available": 0, "running": 0}
+        self._fetch_applied = {"available": 0, "running": 0}
+        self._lock = threading.RLock()
+        self._pending = self._empty_pending()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ollama-inventory")
+
+    @staticmethod
+    def _empty_pending():
+        return {"added": [], "removed": [], "changed": [], "started": [], "stopped": []}
+
+    @property
+    def last_error(self):
+        """The error the last fetch of either list failed with, or None if both succeeded"""
+        return self.errors["running"] or self.errors["available"]
+
+    def is_stale(self, kind):
+        fetched_at = self.fetched_at[kind]
+        return fetched_at is None or time.monotonic() - fetched_at > self.ttl[kind]
+
+    def invalidate(self, available=True, running=True):
+        """Marks the cached lists stale so the next refresh() fetches them"""
+        with self._lock:
+            if available:
+                self.fetched_at["available"] = None
+            if running:
+                self.fetched_at["running"] = None
+
+    def _fetch(self, kind):
+        client = self.client_factory()
+        try:
+            records = client.list_models() if kind == "available" else client.running_models()
+            error = None
+        except OllamaAPIError as e:
+            records, error = [], e
+        return {record.name: record for record in records}, error
+
+    def _update(self, kind, force=False):
+        """Fetches one list if stale and folds the changes into the pending diff"""
+        if not force and not self.is_stale(kind):
+            return
+        with self._lock:
+            self._fetches_started[kind] += 1
+            generation = self._fetches_started[kind]
+        # The round trip happens outside the lock, so a reader on the Tk thread never waits for it
+        new, error = self._fetch(kind)
+        with self._lock:
+            if generation < self._fetch_applied[kind]:
+                return  # a fetch that started later has already landed
+            self._fetch_applied[kind] = generation
+            self.errors[kind] = error
+            if error is not None:
+                # Keep the last good records: an empty list here would report every model as
+                # removed now and added again on the next success. The list is marked stale
+                # so the next refresh retries it.
+                self.fetched_at[kind] = None
+                return
+            first_load = not self.fetch_counts[kind]
+            self.fetch_counts[kind] += 1
+            old = self.records[kind]
+            self.records[kind] = new
+            self.fetched_at[kind] = time.monotonic()
+            if first_load:
+                return  # the initial snapshot is a baseline, not a change
+            added, removed, changed = _diff_records(old, new)
+            if kind == "available":
+                self._pending["added"] += added
+                self._pending["removed"] += removed
+                self._pending["changed"] += changed
+            else:
+                self._pending["started"] += added + changed
+                self._pending["stopped"] += removed
+
+    def available_models(self):
+        """
+        Returns the cached ModelRecord list. Never contacts the server, so it is safe on the
+        Tk thread; the lists are brought up to date by refresh() on a worker.
+        """
+        with self._lock:
+            return list(self.records["available"].values())
+
+    def running_models(self):
+        """Returns the cached RunningModelRecord list without contacting the server"""
+        with self._lock:
+            return list(self.records["running"].values())
+
+    def available_names(self):
+        return [record.name for record in self.available_models()]
+
+    def running_names(self):
+        return [record.name for record in self.running_models()]
+
+    def get_record(self, name):
+        """Returns the cached record for a model name, preferring the running entry"""
+        with self._lock:
+            return self.records["running"].get(name) or self.records["available"].get(name)
+
+    def refresh(self, force=False):
+        """
+        Refreshes whichever lists are stale and returns an InventoryDiff of everything
+        that changed since the previous call to refresh().
+        """
+        stale = [kind for kind in ("running", "available") if force or self.is_stale(kind)]
+        if len(stale) == 2:
+            # Fetch both lists concurrently so a tick costs one round trip, not two
+            other = self._executor.submit(self._update, stale[1], True)
+            self._update(stale[0], True)
+            other.result()
+        elif stale:
+            self._update(stale[0], True)
+        with self._lock:
+            pending, self._pending = self._pending, self._empty_pending()
+        return InventoryDiff(**pending)
+
+
+class ModelDetailsCache:
+    """Bounded LRU cache of formatted model details keyed by model digest"""
+
+    def __init__(self, max_entries=64, max_bytes=2 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of models to keep
+            max_bytes: Approximate memory cap for the cached text
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # digest -> (details, size)
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        """Returns the cached details for a digest, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, digest, details):
+        """Stores details for a digest, evicting least recently used entries over the caps"""
+        size = sys.getsizeof(details)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[digest] = (details, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, digest):
+        with self._lock:
+            entry = self._entries.pop(digest, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+
+    def __len__(self):
+        return len(self._entries)
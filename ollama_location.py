@@ -0,0 +1,148 @@
+"""
+Ollama executable location cache
+Remembers where the executable is, together with its inode/mtime/size, the version it
+reported and the server URL in use, so startup can confirm it with a single stat
+instead of probing PATH and running the CLI
+"""
+
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+
+from ollama_api import resolve_base_url
+
+CACHE_VERSION = 1
+LEGACY_LOCATION_FILE = "ollam-ah.dat"
+
+
+def user_data_dir():
+    """Returns the per-user directory the application keeps its files in"""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "OllamaGUI")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "ollama-gui")
+
+
+def default_cache_path():
+    """Returns the per-user location of the cache file"""
+    return os.path.join(user_data_dir(), "location.json")
+
+
+def _fingerprint(path):
+    """Returns the stat fields that change when the executable is replaced or upgraded"""
+    st = os.stat(path)
+    return {"inode": st.st_ino, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def probe_version(path, timeout=10):
+    """
+    Runs '<path> --version' as a self-test and returns the reported version.
+    Returns None if the executable can't be run or exits with an error.
+    """
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.error(f"Ollama self-test failed for {path}: {e}")
+        return None
+    if result.returncode != 0:
+        logging.error(f"Ollama self-test failed for {path}: {result.stderr.strip()}")
+        return None
+    # e.g. "ollama version is 0.5.7"; a warning about the server may precede it
+    for line in (result.stdout + result.stderr).splitlines():
+        if "version" in line:
+            return line.rsplit(" ", 1)[-1].strip()
+    return ""
+
+
+def save_location(path, version=None, server_url=None, cache_file=None):
+    """
+    Writes the structured cache entry for an executable and returns it.
+
+    Args:
+        path (str): Path of the Ollama executable
+        version (str, optional): Version reported by the executable
+        server_url (str, optional): Server URL, defaults to the OLLAMA_HOST resolution
+        cache_file (str, optional): Cache location, defaults to default_cache_path()
+    """
+    cache_file = cache_file or default_cache_path()
+    entry = {
+        "cache_version": CACHE_VERSION,
+        "path": os.path.abspath(path),
+        "version": version,
+        "server_url": server_url or resolve_base_url(),
+        **_fingerprint(path),
+    }
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    temp_file = cache_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(entry, f, indent=2)
+    os.replace(temp_file, cache_file)  # never leave a half-written cache behind
+    return entry
+
+
+def load_location(cache_file=None):
+    """
+    Returns the cached entry, or None if there is no usable cache.
+    A legacy ollam-ah.dat (a bare path) is migrated the first time it is seen.
+    """
+    cache_file = cache_file or default_cache_path()
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return _migrate_legacy_file(cache_file)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable Ollama location cache {cache_file}: {e}")
+        return None
+    required = ("path", "inode", "mtime_ns", "size")
+    if not isinstance(entry, dict) or entry.get("cache_version") != CACHE_VERSION or not all(k in entry for k in required):
+        logging.warning(f"Ignoring Ollama location cache {cache_file} with an unknown layout")
+        return None
+    return entry
+
+
+def _migrate_legacy_file(cache_file):
+    try:
+        with open(LEGACY_LOCATION_FILE, encoding="utf-8") as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    if not path or not os.path.isfile(path):
+        return None
+    # No version yet; the next rediscovery fills it in
+    return save_location(path, cache_file=cache_file)
+
+
+def location_is_current(entry):
+    """Checks an entry against the executable on disk with a single stat"""
+    try:
+        return _fingerprint(entry["path"]) == {k: entry[k] for k in ("inode", "mtime_ns", "size")}
+    except OSError:
+        return False
+
+
+def discover_location(cached=None, cache_file=None):
+    """
+    Finds the executable on PATH (or at the previously cached path), self-tests it and
+    rewrites the cache. Blocking; meant for startup without a cache or a background thread.
+
+    Returns:
+        The new cache entry, or None if no working executable was found
+    """
+    candidates = [shutil.which("ollama")]
+    if cached:
+        candidates.append(cached.get("path"))
+    for path in candidates:
+        if not path or not os.path.isfile(path):
+            continue
+        version = probe_version(path)
+        if version is not None:
+            entry = save_location(path, version, cache_file=cache_file)
+            logging.info(f"Ollama {version or '(unknown version)'} located at {entry['path']}")
+            return entry
+    return None
@@ -0,0 +1,262 @@
+"""
+Batched Text-widget output for Ollama GUI
+Collects lines written to an output pane and inserts them in one call per frame,
+merging runs of the same tag, instead of redrawing the widget for every line.
+Keeps the widget to a bounded scrollback, optionally spilling the full stream to disk.
+Regions let a writer redraw its last few lines in place (terminal progress bars).
+"""
+
+import logging
+import os
+import itertools
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+
+def open_spill_log(path, max_bytes, backups):
+    """Returns a logger that appends raw text to a size-rotated file"""
+    from logging.handlers import RotatingFileHandler  # pulls in socket/pickle, so only when spilling
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    logger = logging.getLogger(f"ollama_gui.spill.{os.path.abspath(path)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.terminator = ""  # the text carries its own newlines
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+class OutputSink:
+    """Buffers (text, tag) writes and flushes them to a Text widget at a capped frame rate"""
+
+    def __init__(self, widget, post=None, max_fps=30, rate_window=5.0,
+                 max_lines=5000, trim_chunk=500, spill_path=None, spill_max_bytes=5 * 1024 * 1024, spill_backups=3):
+        """
+        Initialize the sink
+
+        Args:
+            widget: The tk.Text widget to write to
+            post: Callable that runs a function on the Tk thread, used when writing from workers
+            max_fps: Maximum number of flushes per second
+            rate_window: Seconds of history used for the lines-per-second counter
+            max_lines: Scrollback cap for the widget; None keeps everything
+            trim_chunk: Lines allowed past the cap before the oldest are deleted in one go
+            spill_path: Optional file receiving the full untrimmed stream
+            spill_max_bytes: Size at which the spill file is rotated
+            spill_backups: Number of rotated spill files to keep
+        """
+        self.widget = widget
+        self.post = post
+        self.frame_interval = max(1, int(1000 / max_fps))
+        self.rate_window = rate_window
+        self.max_lines = max_lines
+        self.trim_chunk = trim_chunk
+        self.trimmed_lines = 0
+        self.spill = open_spill_log(spill_path, spill_max_bytes, spill_backups) if spill_path else None
+        self.total_lines = 0
+        self.flushes = 0
+        self._pending = []  # (text, tag) appends, or (None, key) where a region was first touched
+        self._regions = {}  # key -> [committed pairs, live pairs, closed] queued since the last flush
+        self._region_marks = {}  # key -> (start mark, end mark) of regions shown in the widget
+        self._region_live = {}  # key -> live pairs a shown region currently displays
+        self._region_ids = itertools.count()
+        self._after_flush = []
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+        self._tag_options = {}
+        self._configured_tags = set()
+        self._flush_history = deque()  # (timestamp, lines) per flush
+
+    def define_tag(self, tag, **options):
+        """Registers display options for a tag; applied on the Tk thread at the next flush"""
+        with self._lock:
+            if self._tag_options.get(tag) != options:
+                self._tag_options[tag] = options
+                self._configured_tags.discard(tag)
+
+    def write(self, text, tag=None, on_flush=None):
+        """
+        Queues text for the next flush; safe to call from any thread.
+        on_flush, if given, runs on the Tk thread right after the text reaches the widget.
+        """
+        if not text:
+            return
+        with self._lock:
+            self._pending.append((text, tag))
+            if on_flush:
+                self._after_flush.append(on_flush)
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule:
+            self._schedule_flush()
+
+    def update_region(self, key, committed, live):
+        """
+        Redraws the in-place region identified by key; safe to call from any thread.
+        The region is created at the end of the widget the first time it is written.
+
+        Args:
+            key: Any hashable identifying the writer, e.g. a CommandRunner
+            committed (list): (text, tag) pairs that become permanent text above the region
+            live (list): (text, tag) pairs replacing the region's current content
+        """
+        self._queue_region(key, committed, live, closed=False)
+
+    def close_region(self, key):
+        """Leaves the region's current content in place as permanent text and stops tracking it"""
+        self._queue_region(key, [], None, closed=True)
+
+    def _queue_region(self, key, committed, live, closed):
+        with self._lock:
+            region = self._regions.get(key)
+            if region is None:
+                region = self._regions[key] = [[], None, False]
+                self._pending.append((None, key))
+            region[0].extend(committed)
+            if live is not None:
+                region[1] = live
+            region[2] = closed
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if threading.current_thread() is threading.main_thread() or self.post is None:
+            self.widget.after(self.frame_interval, self.flush)
+        else:
+            self.post(lambda: self.widget.after(self.frame_interval, self.flush))
+
+    def flush(self):
+        """Writes everything queued so far, with a single insert call per run of appends"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            regions, self._regions = self._regions, {}
+            callbacks, self._after_flush = self._after_flush, []
+            self._flush_scheduled = False
+            new_tags = [(tag, options) for tag, options in self._tag_options.items() if tag not in self._configured_tags]
+            self._configured_tags.update(tag for tag, _ in new_tags)
+        for tag, options in new_tags:
+            self.widget.tag_config(tag, **options)
+        if not pending:
+            return
+
+        self.widget.config(state=tk.NORMAL)
+        written = []  # text that is now permanent, for the spill file and line counts
+        appends = []
+        for text, tag in pending:
+            if text is not None:
+                appends.append((text, tag))
+                continue
+            if appends:
+                self.widget.insert(tk.END, *self._merge_runs(appends))
+                written += appends
+                appends = []
+            committed, live, closed = regions[tag]
+            self._redraw_region(tag, committed, live, closed)
+            written += committed
+            if live is not None:
+                self._region_live[tag] = live
+            if closed:
+                written += self._region_live.pop(tag, [])  # the region's last state stays on screen for good
+        if appends:
+            self.widget.insert(tk.END, *self._merge_runs(appends))
+            written += appends
+        self._trim()
+        self.widget.config(state=tk.DISABLED)
+        self.widget.see(tk.END)
+
+        text = "".join(text for text, _ in written)
+        if self.spill and text:
+            self.spill.info(text)
+        lines = text.count("\n")
+        self.total_lines += lines
+        self.flushes += 1
+        self._flush_history.append((time.monotonic(), lines))
+
+        for callback in callbacks:
+            callback()
+
+    @staticmethod
+    def _merge_runs(pairs):
+        """Turns (text, tag) pairs into insert() arguments, merging consecutive writes that share a tag"""
+        args = []
+        run_text, run_tag = [pairs[0][0]], pairs[0][1]
+        for text, tag in pairs[1:]:
+            if tag == run_tag:
+                run_text.append(text)
+            else:
+                args += ["".join(run_text), run_tag or ()]
+                run_text, run_tag = [text], tag
+        args += ["".join(run_text), run_tag or ()]
+        return args
+
+    def _redraw_region(self, key, committed, live, closed):
+        """
+        Replaces a region's content between its two marks. Both marks keep left gravity so
+        appends at the end of the widget land after the region; the end mark is switched to
+        right gravity only while the region's own text is inserted.
+        """
+        marks = self._region_marks.get(key)
+        if marks is None:
+            region_id = next(self._region_ids)
+            marks = (f"region{region_id}_start", f"region{region_id}_end")
+            for mark in marks:
+                self.widget.mark_set(mark, "end-1c")
+                self.widget.mark_gravity(mark, tk.LEFT)
+            self._region_marks[key] = marks
+        start, end = marks
+
+        if live is not None:
+            self.widget.delete(start, end)
+            self.widget.mark_gravity(end, tk.RIGHT)
+            if committed:
+                self.widget.insert(start, *self._merge_runs(committed))
+                self.widget.mark_set(start, end)
+            if live:
+                self.widget.insert(start, *self._merge_runs(live))
+            self.widget.mark_gravity(end, tk.LEFT)
+
+        if closed:
+            self.widget.mark_unset(start, end)
+            del self._region_marks[key]
+
+    def _trim(self):
+        """Deletes the oldest lines once the widget is trim_chunk lines past the scrollback cap"""
+        if not self.max_lines:
+            return
+        line_count = int(self.widget.index("end-1c").split(".")[0])
+        if line_count > self.max_lines + self.trim_chunk:
+            excess = line_count - self.max_lines
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self.trimmed_lines += excess
+
+    def clear(self):
+        """Drops queued output and empties the widget; call on the Tk thread"""
+        with self._lock:
+            self._pending = []
+            self._regions = {}
+            callbacks, self._after_flush = self._after_flush, []
+        for callback in callbacks:
+            callback()
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete("1.0", tk.END)
+        for marks in self._region_marks.values():
+            self.widget.mark_unset(*marks)
+        self._region_marks = {}
+        self._region_live = {}
+        self.widget.config(state=tk.DISABLED)
+
+    @property
+    def lines_per_second(self):
+        """Lines written per second over the last rate_window seconds"""
+        cutoff = time.monotonic() - self.rate_window
+        while self._flush_history and self._flush_history[0][0] < cutoff:
+            self._flush_history.popleft()
+        return sum(lines for _, lines in self._flush_history) / self.rate_window
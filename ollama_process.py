@@ -0,0 +1,99 @@
+"""
+Child process runner for Ollama GUI
+Reads stdout and stderr concurrently on reader threads and drains both through a single
+Tk after() pump, so long-running commands never block the UI thread. The output is run
+through a TerminalScreen, so carriage-return progress bars are redrawn in place.
+"""
+
+import codecs
+import queue
+import subprocess
+import threading
+
+from ollama_terminal import TerminalScreen
+
+
+class CommandRunner:
+    """Runs one command and reports its output and exit code on the Tk thread"""
+
+    def __init__(self, master, command, on_output, on_exit, poll_interval=50, max_items_per_poll=500):
+        """
+        Initialize the runner
+
+        Args:
+            master: Tk root used to schedule the pump
+            command (list): The command to run
+            on_output: Called on the Tk thread as on_output(committed, live) whenever the screen
+                changed; both are lists of (text, tag) pairs, tag being "output" or "error".
+                committed lines are final, live is the redrawable region that replaces the last one.
+            on_exit: Called on the Tk thread with the exit code once both pipes are drained
+            poll_interval: Milliseconds between pump runs
+            max_items_per_poll: Upper bound on reads handled per pump run, keeps each run short
+        """
+        self.master = master
+        self.command = command
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.poll_interval = poll_interval
+        self.max_items_per_poll = max_items_per_poll
+        self.process = None
+        self.returncode = None
+        self.screen = TerminalScreen()
+        self._queue = queue.SimpleQueue()
+        self._open_streams = 0
+
+    def start(self):
+        """
+        Launches the process and returns immediately.
+        Raises FileNotFoundError (or OSError) if the command can't be started.
+        """
+        self.process = subprocess.Popen(
+            self.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0  # unbuffered, so a progress update without a newline arrives immediately
+        )
+        # One reader per pipe so a chatty stderr can never fill up and stall the child
+        for pipe, stream in ((self.process.stdout, "output"), (self.process.stderr, "error")):
+            self._open_streams += 1
+            threading.Thread(target=self._read_pipe, args=(pipe, stream), daemon=True).start()
+        self.master.after(self.poll_interval, self._pump)
+        return self
+
+    def _read_pipe(self, pipe, stream):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            for data in iter(lambda: pipe.read(65536), b''):
+                self._queue.put((stream, decoder.decode(data)))
+            self._queue.put((stream, decoder.decode(b'', final=True)))
+        finally:
+            pipe.close()
+            self._queue.put((stream, None))  # end-of-stream marker
+
+    def _pump(self):
+        for _ in range(self.max_items_per_poll):
+            try:
+                stream, text = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if text is None:
+                self._open_streams -= 1
+            elif text:
+                self.screen.feed(text, stream)
+
+        if self._open_streams == 0 and self.process.poll() is not None:
+            self.returncode = self.process.returncode
+            self.on_output(self.screen.finish(), [])
+            self.on_exit(self.returncode)
+            return
+        if self.screen.changed:
+            self.on_output(self.screen.take_committed(), self.screen.live_segments())
+        self.master.after(self.poll_interval, self._pump)
+
+    def is_running(self):
+        return self.process is not None and self.returncode is None
+
+    def terminate(self):
+        """Asks the process to exit; output and the exit code still arrive through the pump"""
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
@@ -0,0 +1,134 @@
+"""
+Startup profiling for Ollama GUI
+Records a per-module import-time breakdown and the time spent in each startup phase,
+then writes both to a report file. Enabled with 'python main.py --profile-startup'.
+"""
+
+import builtins
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Times module imports (like python -X importtime) and named startup phases"""
+
+    def __init__(self, report_path):
+        """
+        Initialize the profiler
+
+        Args:
+            report_path (str): File the report is written to
+        """
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.imports = []  # (order, depth, module, self seconds, cumulative seconds)
+        self.phases = []  # (name, depth, start offset seconds, seconds)
+        self.marks = []  # (name, offset seconds)
+        self._phase_depth = 0
+        self._import_stack = []
+        self._original_import = None
+        self._thread = threading.get_ident()  # only main-thread imports are on the startup path
+        self.reported = False
+
+    def install(self):
+        """Starts timing imports; call before the application modules are imported"""
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+        order = len(self.imports)
+        self.imports.append(None)  # keep the slot so the report lists modules in load order
+        self._import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1] += cumulative
+            self.imports[order] = (order, len(self._import_stack), name, cumulative - children, cumulative)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        depth = self._phase_depth
+        self._phase_depth += 1
+        try:
+            yield
+        finally:
+            self._phase_depth -= 1
+            self.phases.append((name, depth, start - self.started, time.perf_counter() - start))
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def write_report(self):
+        """Writes the phase timings and the import breakdown (slowest first) to report_path"""
+        self.uninstall()
+        imports = [entry for entry in self.imports if entry]
+        lines = ["Startup profile", "", "Phases (ms from start / duration ms):"]
+        for name, depth, offset, seconds in sorted(self.phases, key=lambda p: p[2]):
+            lines.append(f"  {offset * 1000:9.1f}  {seconds * 1000:9.1f}  {'  ' * depth}{name}")
+        for name, offset in self.marks:
+            lines.append(f"  {offset * 1000:9.1f}  {'':>9}  {name}")
+        total_import = sum(entry[3] for entry in imports)
+        lines += ["", f"Imports: {len(imports)} modules, {total_import * 1000:.1f} ms total",
+                  "  self ms  cumul ms  module (slowest self time first)"]
+        for _, depth, name, self_seconds, cumulative in sorted(imports, key=lambda e: -e[3]):
+            lines.append(f"  {self_seconds * 1000:7.1f}  {cumulative * 1000:8.1f}  {name}")
+        lines += ["", "Import tree (load order):"]
+        for _, depth, name, self_seconds, cumulative in imports:
+            lines.append(f"  {cumulative * 1000:8.1f}  {'  ' * depth}{name}")
+
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self.reported = True
+        logging.info(f"Startup profile written to {self.report_path}")
+
+
+_profiler = None
+
+
+def start_profiling(report_path):
+    """Creates the process-wide profiler and starts timing imports"""
+    global _profiler
+    _profiler = StartupProfiler(report_path)
+    _profiler.install()
+    return _profiler
+
+
+@contextmanager
+def profile_phase(name):
+    """Times a startup phase when profiling is enabled; a no-op otherwise"""
+    if _profiler is None or _profiler.reported:
+        yield
+    else:
+        with _profiler.phase(name):
+            yield
+
+
+def profile_mark(name):
+    """Records a point in time (e.g. first paint) when profiling is enabled"""
+    if _profiler is not None and not _profiler.reported:
+        _profiler.mark(name)
+
+
+def finish_profiling():
+    """Writes the report once startup is complete; later calls do nothing"""
+    if _profiler is not None and not _profiler.reported:
+        _profiler.write_report()
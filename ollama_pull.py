@@ -0,0 +1,364 @@
+"""
+Pull queue for Ollama GUI
+Pulls models through the streaming /api/pull endpoint with a concurrency limit,
+per-model byte progress and throughput, and retries that resume partial downloads
+"""
+
+import threading
+import time
+import tkinter as tk
+from collections import OrderedDict, deque
+from tkinter import ttk
+
+from ollama_api import get_client, iter_json_lines, format_size, OllamaAPIError, OllamaConnectionError
+
+QUEUED = "queued"
+ACTIVE = "pulling"
+RETRYING = "retrying"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class PullCancelled(Exception):
+    """Raised inside a pull worker when the pull was cancelled from the panel"""
+
+
+class PullJob:
+    """State of one model pull; written by its worker thread, read on the Tk thread"""
+
+    def __init__(self, name, rate_window=5.0):
+        """
+        Initialize the job
+
+        Args:
+            name (str): Model to pull
+            rate_window: Seconds of progress history used for the throughput figure
+        """
+        self.name = name
+        self.state = QUEUED
+        self.status = "waiting"
+        self.error = None
+        self.attempts = 0
+        self.layers = {}  # digest -> (total, completed); only touched by the worker
+        self._total = 0  # running sums over layers, so the Tk thread never iterates the dict
+        self._completed = 0
+        self.started_at = None
+        self.finished_at = None
+        self.rate_window = rate_window
+        self.cancelled = threading.Event()
+        self.response = None
+        self._samples = deque()  # (timestamp, completed bytes)
+        self._last_notified = 0.0
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def completed(self):
+        return self._completed
+
+    @property
+    def fraction(self):
+        total = self.total
+        return self.completed / total if total else 0.0
+
+    @property
+    def rate(self):
+        """Download speed in bytes per second over the last rate_window seconds"""
+        samples = list(self._samples)
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            return 0.0
+        return (samples[-1][1] - samples[0][1]) / (samples[-1][0] - samples[0][0])
+
+    def record_progress(self, digest, total, completed):
+        """Worker thread: updates one layer's byte counts"""
+        old_total, old_completed = self.layers.get(digest, (0, 0))
+        self.layers[digest] = (total, completed)
+        self._total += total - old_total
+        self._completed += completed - old_completed
+        now = time.monotonic()
+        self._samples.append((now, self.completed))
+        while self._samples and self._samples[0][0] < now - self.rate_window:
+            self._samples.popleft()
+
+    def describe(self):
+        """Returns (progress, size, speed) strings for display"""
+        total = self.total
+        progress = f"{self.fraction * 100:.0f}%" if total else ""
+        size = f"{format_size(self.completed)} / {format_size(total)}" if total else ""
+        rate = self.rate
+        speed = ""
+        if self.state == ACTIVE and rate > 0:
+            remaining = (total - self.completed) / rate
+            speed = f"{format_size(rate)}/s, {remaining // 60:.0f}m{remaining % 60:02.0f}s left"
+        return progress, size, speed
+
+    def cancel(self):
+        self.cancelled.set()
+        response = self.response
+        if response is not None:
+            response.close()
+
+
+class PullManager:
+    """
+    Runs queued pulls, at most max_concurrent at a time, each on its own worker thread.
+    Scheduling happens on the Tk thread; workers report back through tasks.post.
+    """
+
+    def __init__(self, tasks, max_concurrent=2, max_retries=5, retry_delay=2.0,
+                 on_update=None, on_finished=None, on_all_done=None, update_interval=0.25, client=None):
+        """
+        Initialize the manager
+
+        Args:
+            tasks (TaskRunner): Used to post updates to the Tk thread
+            max_concurrent: Number of pulls running at once
+            max_retries: Reconnect attempts per pull before it is marked failed
+            retry_delay: Seconds before the first retry; doubled on each further retry
+            on_update: Called on the Tk thread with a PullJob whenever it changes; the job is
+                live, so its state may already be past the change that triggered the call
+            on_finished: Called on the Tk thread exactly once per job, when it is done, failed or cancelled
+            on_all_done: Called on the Tk thread with the finished jobs once the queue is empty
+            update_interval: Minimum seconds between progress updates for one job
+            client: OllamaClient to use, defaults to the shared client
+        """
+        self.tasks = tasks
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_update = on_update
+        self.on_finished = on_finished
+        self.on_all_done = on_all_done
+        self.update_interval = update_interval
+        self.client = client
+        self.jobs = OrderedDict()  # name -> PullJob, in the order they were queued
+        self._queue = deque()
+        self._active = 0
+        self._batch = []  # jobs finished since the queue was last empty
+
+    def enqueue(self, names):
+        """Queues models for pulling; names already queued or pulling are skipped. Returns the new jobs."""
+        added = []
+        for name in names:
+            job = self.jobs.get(name)
+            if job is not None and job.state not in FINISHED_STATES:
+                continue
+            job = PullJob(name)
+            self.jobs[name] = job
+            self.jobs.move_to_end(name)
+            self._queue.append(job)
+            added.append(job)
+            self._notify(job, force=True)
+        self._start_next()
+        return added
+
+    def set_concurrency(self, max_concurrent):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._start_next()
+
+    def cancel(self, name):
+        job = self.jobs.get(name)
+        if job is None or job.state in FINISHED_STATES:
+            return
+        if job.state == QUEUED:
+            self._queue.remove(job)
+            job.state, job.status = CANCELLED, "cancelled before starting"
+            self._job_finished(job)
+        else:
+            job.cancel()  # the worker notices and reports back
+
+    def cancel_all(self):
+        for name in list(self.jobs):
+            self.cancel(name)
+
+    def clear_finished(self):
+        for name in [name for name, job in self.jobs.items() if job.state in FINISHED_STATES]:
+            del self.jobs[name]
+
+    def pending_count(self):
+        return len(self._queue) + self._active
+
+    def _start_next(self):
+        while self._active < self.max_concurrent and self._queue:
+            job = self._queue.popleft()
+            job.state = ACTIVE
+            job.started_at = time.monotonic()
+            self._active += 1
+            self._notify(job, force=True)
+            threading.Thread(target=self._run, args=(job,), name=f"pull-{job.name}", daemon=True).start()
+
+    def _notify(self, job, force=False):
+        """Posts job to on_update, at most once per update_interval unless forced"""
+        now = time.monotonic()
+        if self.on_update and (force or now - job._last_notified >= self.update_interval):
+            job._last_notified = now
+            self.tasks.post(self.on_update, job)
+
+    def _run(self, job):
+        """Worker thread: pulls job.name, reconnecting after network failures"""
+        try:
+            self._pull_with_retries(job)
+            job.state, job.status = DONE, "success"
+        except PullCancelled:
+            job.state, job.status = CANCELLED, "cancelled"
+        except OllamaAPIError as e:
+            job.state, job.status, job.error = FAILED, "failed", str(e)
+        except Exception as e:
+            job.state, job.status, job.error = FAILED, "failed", f"{e.__class__.__name__}: {e}"
+        job.finished_at = time.monotonic()
+        self.tasks.post(self._worker_finished, job)
+
+    def _pull_with_retries(self, job):
+        client = self.client or get_client()
+        while True:
+            job.attempts += 1
+            try:
+                self._pull_once(client, job)
+                return
+            except OllamaConnectionError as e:
+                if job.cancelled.is_set():
+                    raise PullCancelled()
+                if job.attempts > self.max_retries:
+                    raise
+                delay = min(30.0, self.retry_delay * 2 ** (job.attempts - 1))
+                job.state, job.status = RETRYING, f"connection lost, resuming in {delay:.0f}s"
+                self._notify(job, force=True)
+                # Waiting on the event lets Cancel interrupt the back-off
+                if job.cancelled.wait(delay):
+                    raise PullCancelled()
+                job.state = ACTIVE
+
+    def _pull_once(self, client, job):
+        """One /api/pull request; the server resumes any layer downloaded on an earlier attempt"""
+        response = client.pull(job.name)
+        job.response = response
+        try:
+            if job.cancelled.is_set():
+                raise PullCancelled()
+            for chunk in iter_json_lines(response):
+                if job.cancelled.is_set():
+                    raise PullCancelled()
+                job.status = chunk.get("status", job.status)
+                if chunk.get("digest") and chunk.get("total"):
+                    job.record_progress(chunk["digest"], chunk["total"], chunk.get("completed", 0))
+                if job.status == "success":
+                    return
+                self._notify(job)
+        except (PullCancelled, OllamaAPIError):
+            raise
+        except Exception:
+            # Closing the response from cancel() surfaces here as a read error
+            if job.cancelled.is_set():
+                raise PullCancelled()
+            raise
+        finally:
+            job.response = None
+            response.close()
+        if job.cancelled.is_set():
+            raise PullCancelled()
+        raise OllamaConnectionError("Pull stream ended before the model was complete")
+
+    def _worker_finished(self, job):
+        self._active -= 1
+        self._job_finished(job)
+        self._start_next()
+
+    def _job_finished(self, job):
+        self._batch.append(job)
+        self._notify(job, force=True)
+        if self.on_finished:
+            self.on_finished(job)
+        if not self._queue and self._active == 0:
+            batch, self._batch = self._batch, []
+            if self.on_all_done:
+                self.on_all_done(batch)
+
+
+class PullPanel:
+    """Window listing queued, active and finished pulls"""
+
+    COLUMNS = (("state", "State", 80), ("progress", "Progress", 70), ("size", "Downloaded", 150),
+               ("speed", "Speed", 170), ("attempts", "Attempts", 70))
+
+    def __init__(self, parent, manager, on_close=None):
+        """
+        Initialize the panel
+
+        Args:
+            parent: Parent application reference (provides master and colours)
+            manager (PullManager): The pull queue to show and control
+            on_close: Called when the window is closed
+        """
+        self.parent = parent
+        self.manager = manager
+        self.on_close = on_close
+        self.window = tk.Toplevel(parent.master)
+        self.window.title("Model Pulls")
+        self.window.geometry("760x320")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=8, pady=6)
+        ttk.Label(controls, text="Models:").pack(side=tk.LEFT)
+        self.names_entry = ttk.Entry(controls, width=40)
+        self.names_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.names_entry.bind("<Return>", lambda event: self.queue_entered())
+        ttk.Button(controls, text="Queue", command=self.queue_entered).pack(side=tk.LEFT, padx=5)
+        ttk.Label(controls, text="Parallel:").pack(side=tk.LEFT, padx=(10, 0))
+        self.concurrency_var = tk.IntVar(value=manager.max_concurrent)
+        ttk.Spinbox(controls, from_=1, to=8, width=3, textvariable=self.concurrency_var,
+                    command=lambda: manager.set_concurrency(self.concurrency_var.get())).pack(side=tk.LEFT, padx=5)
+
+        self.tree = ttk.Treeview(self.window, columns=[c[0] for c in self.COLUMNS], selectmode="extended")
+        self.tree.heading("#0", text="Model")
+        self.tree.column("#0", width=180)
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=tk.W)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=8)
+
+        buttons = ttk.Frame(self.window)
+        buttons.pack(fill=tk.X, padx=8, pady=6)
+        ttk.Button(buttons, text="Cancel Selected", command=self.cancel_selected).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Cancel All", command=manager.cancel_all).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Clear Finished", command=self.clear_finished).pack(side=tk.LEFT)
+
+        for job in manager.jobs.values():
+            self.update_job(job)
+
+    def queue_entered(self):
+        names = self.names_entry.get().replace(",", " ").split()
+        if names:
+            self.manager.enqueue(names)
+            self.names_entry.delete(0, tk.END)
+
+    def update_job(self, job):
+        """Adds or refreshes the row for job"""
+        progress, size, speed = job.describe()
+        state = job.state if job.state != FAILED else f"failed: {job.error}"
+        if job.state in (ACTIVE, RETRYING) and not speed:
+            speed = job.status
+        values = (state, progress, size, speed, job.attempts)
+        if self.tree.exists(job.name):
+            self.tree.item(job.name, values=values)
+        else:
+            self.tree.insert("", tk.END, iid=job.name, text=job.name, values=values)
+
+    def cancel_selected(self):
+        for name in self.tree.selection():
+            self.manager.cancel(name)
+
+    def clear_finished(self):
+        self.manager.clear_finished()
+        for name in self.tree.get_children():
+            if name not in self.manager.jobs:
+                self.tree.delete(name)
+
+    def close(self):
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
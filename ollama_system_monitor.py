@@ -3,31 +3,318 @@ System resource monitoring module for Ollama GUI
 Provides real-time tracking of CPU, RAM, and GPU usage with visualization
 """
 
+import csv
+import logging
+import math
+import os
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import threading
 import time
-import psutil
-try:
-    import GPUtil
-    HAS_GPU = True
-except ImportError:
-    HAS_GPU = False
+from array import array
+from collections import deque, namedtuple
+from datetime import datetime
+
+from ollama_api import get_client, format_size, OllamaAPIError
+from ollama_gpu import open_gpu_backend
+
+
+class MetricHistory:
+    """
+    Fixed-size ring buffer of samples: one timestamp column and one float32 column per
+    metric, preallocated so recording a sample never allocates. Missing values are NaN.
+    """
+
+    def __init__(self, metrics, capacity):
+        """
+        Initialize the history
+
+        Args:
+            metrics (list): Metric names, in CSV column order
+            capacity: Number of samples kept; older samples are overwritten
+        """
+        self.metrics = list(metrics)
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0]) * capacity
+        self.columns = {name: array('f', [math.nan]) * capacity for name in self.metrics}
+        self.next = 0  # slot the next sample is written to
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def record(self, timestamp, values):
+        """Stores one sample; values maps metric names to numbers, absent metrics become NaN"""
+        slot = self.next
+        self.timestamps[slot] = timestamp
+        for name, column in self.columns.items():
+            value = values.get(name)
+            column[slot] = math.nan if value is None else value
+        self.next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _ordered(self, buffer, last=None):
+        count = self.count if last is None else min(last, self.count)
+        start = (self.next - count) % self.capacity
+        if start + count <= self.capacity:
+            return buffer[start:start + count]
+        return buffer[start:] + buffer[:(start + count) % self.capacity]
+
+    def series(self, name, last=None):
+        """Returns the metric's samples, oldest first, as an array; last limits it to the newest ones"""
+        return self._ordered(self.columns[name], last)
+
+    def export_csv(self, path):
+        """Writes every buffered sample to path, one row per sample, oldest first"""
+        timestamps = self._ordered(self.timestamps)
+        columns = [self._ordered(self.columns[name]) for name in self.metrics]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp"] + self.metrics)
+            for i, timestamp in enumerate(timestamps):
+                row = [datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds")]
+                row += ["" if math.isnan(column[i]) else f"{column[i]:.2f}" for column in columns]
+                writer.writerow(row)
+        return len(timestamps)
+
+
+def draw_sparkline(canvas, item, values, maximum=None):
+    """
+    Redraws a sparkline by moving the points of an existing line item, which is much
+    cheaper than recreating it. Values are bucketed down to one point per pixel
+    (keeping each bucket's peak, so short spikes stay visible); NaN gaps are skipped.
+
+    Args:
+        canvas: The tk.Canvas holding the line
+        item: Id of the line item to update
+        values: Samples, oldest first
+        maximum: Value drawn at the top edge; defaults to the largest sample
+    """
+    width = int(canvas.cget("width"))
+    height = int(canvas.cget("height"))
+    points = [v for v in values if not math.isnan(v)]
+    if len(points) < 2:
+        canvas.coords(item, 0, height, 0, height)
+        return
+    buckets = min(width, len(points))
+    per_bucket = len(points) / buckets
+    peaks = [max(points[int(i * per_bucket):max(int((i + 1) * per_bucket), int(i * per_bucket) + 1)])
+             for i in range(buckets)]
+    top = maximum or max(peaks) or 1
+    step = (width - 1) / (buckets - 1) if buckets > 1 else 0
+    coords = []
+    for i, value in enumerate(peaks):
+        coords += [i * step, height - 1 - min(value, top) / top * (height - 2)]
+    canvas.coords(item, *coords)
+
+
+OllamaProcessSample = namedtuple("OllamaProcessSample", [
+    "role", "pid", "model", "rss", "cpu_percent", "threads", "read_bytes", "write_bytes", "open_files",
+])
+
+
+def _blob_name(path):
+    """sha256-<hex> file name of a model blob path, or None"""
+    name = os.path.basename(path or "")
+    return name if name.startswith("sha256") else None
+
+
+class OllamaProcessTracker:
+    """
+    Finds the 'ollama serve' process and its model runner children and samples their
+    resource use. psutil.Process handles are cached by pid, which keeps per-process CPU%
+    meaningful (it is measured between two calls on the same handle) and avoids a full
+    process scan on every tick. Runners are matched to loaded models through the weights
+    blob they were started with. Call sample() from one thread only.
+    """
+
+    def __init__(self, psutil, running_models=None, client_factory=get_client, rescan_interval=10.0):
+        """
+        Initialize the tracker
+
+        Args:
+            psutil: The psutil module (imported lazily by the caller)
+            running_models: Callable returning the cached RunningModelRecord list
+            client_factory: Callable returning the OllamaClient used to look up model blobs
+            rescan_interval: Seconds between process table scans while no server is found
+        """
+        self.psutil = psutil
+        self.running_models = running_models or (lambda: [])
+        self.client_factory = client_factory
+        self.rescan_interval = rescan_interval
+        self.cpu_count = psutil.cpu_count() or 1
+        self.server = None
+        self.handles = {}  # pid -> psutil.Process
+        self.blobs = {}  # model digest -> weights blob name (None if it couldn't be determined)
+        self._last_scan = None
+
+    def _find_server(self):
+        now = time.monotonic()
+        if self._last_scan is not None and now - self._last_scan < self.rescan_interval:
+            return None
+        self._last_scan = now
+        fallback = None
+        for proc in self.psutil.process_iter(["name", "cmdline"]):
+            name = (proc.info["name"] or "").lower()
+            if name not in ("ollama", "ollama.exe"):
+                continue
+            if "serve" in (proc.info["cmdline"] or []):
+                return proc
+            fallback = fallback or proc
+        return fallback
+
+    @staticmethod
+    def _runner_blob(cmdline):
+        """Returns the blob a runner was started with, or False if the process isn't a runner"""
+        if not cmdline:
+            return False
+        executable = os.path.basename(cmdline[0]).lower()
+        if not (executable.startswith("ollama_llama_server") or "runner" in cmdline[1:3]):
+            return False
+        if "--model" in cmdline[:-1]:
+            return _blob_name(cmdline[cmdline.index("--model") + 1])
+        return None
+
+    def _model_blobs(self, records):
+        """Maps the weights blob of each loaded model to its name, asking /api/show once per digest"""
+        mapping = {}
+        for record in records:
+            if record.digest not in self.blobs:
+                blob = None
+                try:
+                    modelfile = self.client_factory().show_model(record.name).get("modelfile", "")
+                    for line in modelfile.splitlines():
+                        if line.startswith("FROM "):
+                            blob = _blob_name(line[5:].strip())
+                            break
+                except OllamaAPIError:
+                    pass
+                self.blobs[record.digest] = blob
+            if self.blobs[record.digest] is not None:
+                mapping[self.blobs[record.digest]] = record.name
+        return mapping
+
+    def _handle(self, pid):
+        handle = self.handles.get(pid)
+        if handle is None:
+            handle = self.handles[pid] = self.psutil.Process(pid)
+            handle.cpu_percent(None)  # first call only sets the baseline
+        return handle
+
+    def _measure(self, handle, role, model):
+        psutil = self.psutil
+        with handle.oneshot():
+            memory = handle.memory_info()
+            cpu = handle.cpu_percent(None) / self.cpu_count
+            threads = handle.num_threads()
+            try:
+                io = handle.io_counters()
+                read_bytes, write_bytes = io.read_bytes, io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                read_bytes = write_bytes = None  # not available on macOS
+            try:
+                open_files = len(handle.open_files())
+            except psutil.AccessDenied:
+                open_files = None
+        return OllamaProcessSample(role, handle.pid, model, memory.rss, cpu, threads, read_bytes, write_bytes, open_files)
+
+    def sample(self):
+        """Returns an OllamaProcessSample for the server and each runner; empty if no server is running"""
+        psutil = self.psutil
+        if self.server is None or not self.server.is_running():
+            self.server = self._find_server()
+            self.handles.clear()
+            if self.server is None:
+                return []
+        try:
+            server = self._handle(self.server.pid)
+            children = server.children(recursive=True)
+            samples = [self._measure(server, "server", None)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.server = None
+            return []
+
+        runners = []
+        for child in children:
+            try:
+                blob = self._runner_blob(child.cmdline())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if blob is not False:
+                runners.append((child.pid, blob))
+        live = {self.server.pid} | {pid for pid, _ in runners}
+        for pid in [pid for pid in self.handles if pid not in live]:
+            del self.handles[pid]  # runners that exited
+
+        loaded = self.running_models() if runners else []
+        models = self._model_blobs(loaded)
+        for pid, blob in runners:
+            model = models.get(blob)
+            if model is None and len(runners) == 1 and len(loaded) == 1:
+                model = loaded[0].name  # a single runner can only be serving the single loaded model
+            try:
+                samples.append(self._measure(self._handle(pid), "runner", model))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.handles.pop(pid, None)
+        return samples
+
+
+def format_process_sample(sample):
+    """One display line for an OllamaProcessSample"""
+    label = "serve" if sample.role == "server" else sample.model or "runner"
+    parts = [f"{label} ({sample.pid}): {format_size(sample.rss)}", f"{sample.cpu_percent:.1f}% CPU",
+             f"{sample.threads} thr"]
+    if sample.open_files is not None:
+        parts.append(f"{sample.open_files} files")
+    if sample.read_bytes is not None:
+        parts.append(f"{format_size(sample.read_bytes)} read")
+    return ", ".join(parts)
+
+
+def format_gpu_reading(reading):
+    """One display line for a GpuReading"""
+    parts = [f"{reading.index} {reading.name}:"]
+    if reading.load_percent is not None:
+        parts.append(f"{reading.load_percent:.0f}%")
+    if reading.memory_total:
+        parts.append(f"{format_size(reading.memory_used)} / {format_size(reading.memory_total)}")
+    if reading.temperature is not None:
+        parts.append(f"{reading.temperature:.0f}\u00b0C")
+    return " ".join(parts)
+
 
 class SystemMonitor:
     """Monitors and displays system resource usage"""
     
-    def __init__(self, parent, update_interval=1000):
+    # Columns of the history and its CSV export
+    METRICS = ("cpu_percent", "ram_percent", "swap_percent", "gpu_percent", "gpu_mem_percent", "token_rate",
+               "ollama_cpu_percent", "ollama_rss_mb")
+    
+    def __init__(self, parent, update_interval=1000, history_seconds=600):
         """
         Initialize the system monitor
         
         Args:
             parent: Parent application reference
             update_interval: Update interval in milliseconds
+            history_seconds: Seconds of samples kept for the sparklines and CSV export
         """
         self.parent = parent
         self.update_interval = update_interval
         self.running = True
+        self.history = MetricHistory(self.METRICS, max(2, int(history_seconds * 1000 / update_interval)))
+        self.history_lock = threading.Lock()  # recorded by the sampler, drawn and exported on the Tk thread
+        self.sparklines = {}  # metric -> (canvas, line item)
+        self.pending_token_rate = None  # set by the model metrics panel, recorded with the next sample
+        # The sampler replaces this with each new sample; the UI reads it on its own schedule,
+        # so samples taken while the Tk loop is busy are simply superseded, never queued
+        self.latest_sample = None
+        self.reported_errors = set()  # sampling failures already logged, so each is logged once
+        self.shown_sample = None
+        self.sampling = threading.Event()  # cleared while the window is minimized or the panel hidden
+        self.sampling.set()
+        self.wake = threading.Event()  # interrupts the sampler's wait on stop()
+        self.gpu_widgets_built = False
         
         # Create main frame
         self.frame = tk.LabelFrame(
@@ -67,6 +354,7 @@ class SystemMonitor:
             font=("TkDefaultFont", 7, "bold")
         )
         self.cpu_percentage.pack(side=tk.LEFT, padx=5)
+        self._add_sparkline(self.cpu_frame, "cpu_percent")
         
         # RAM monitor
         self.ram_frame = tk.Frame(self.frame, bg=parent.bg_color)
@@ -97,17 +385,104 @@ class SystemMonitor:
             font=("TkDefaultFont", 7, "bold")
         )
         self.ram_percentage.pack(side=tk.LEFT, padx=5)
+        self._add_sparkline(self.ram_frame, "ram_percent")
+        
+        # Swap monitor
+        self.swap_frame = tk.Frame(self.frame, bg=parent.bg_color)
+        self.swap_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.swap_label = ttk.Label(
+            self.swap_frame, 
+            text="Swap Usage:", 
+            background=parent.bg_color,
+            foreground=parent.text_color,
+            font=("TkDefaultFont", 7)
+        )
+        self.swap_label.pack(side=tk.LEFT)
+        
+        self.swap_progress = ttk.Progressbar(
+            self.swap_frame, 
+            orient=tk.HORIZONTAL, 
+            length=150, 
+            mode='determinate'
+        )
+        self.swap_progress.pack(side=tk.LEFT, padx=5)
+        
+        self.swap_percentage = ttk.Label(
+            self.swap_frame, 
+            text="0%", 
+            background=parent.bg_color,
+            foreground=parent.found_color,
+            font=("TkDefaultFont", 7, "bold")
+        )
+        self.swap_percentage.pack(side=tk.LEFT, padx=5)
+        self._add_sparkline(self.swap_frame, "swap_percent")
         
         # GPU monitor (if available)
         self.gpu_frame = tk.Frame(self.frame, bg=parent.bg_color)
         self.gpu_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        if HAS_GPU:
+        # The GPU backend is opened by the monitor thread; the GPU rows are built once it reports back
+        self.gpu_backend = None
+        self.has_gpu = None
+        self.gpu_status = ttk.Label(
+            self.gpu_frame, 
+            text="Detecting GPU...", 
+            background=parent.bg_color,
+            foreground=parent.text_color,
+            font=("TkDefaultFont", 7)
+        )
+        self.gpu_status.pack(side=tk.LEFT)
+        
+        # Ollama server and runner processes
+        self.ollama_frame = tk.Frame(self.frame, bg=parent.bg_color)
+        self.ollama_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.ollama_processes = ttk.Label(
+            self.ollama_frame, 
+            text="Ollama processes: searching...", 
+            background=parent.bg_color,
+            foreground=parent.text_color,
+            font=("TkDefaultFont", 7),
+            justify=tk.LEFT
+        )
+        self.ollama_processes.pack(side=tk.LEFT)
+        self._add_sparkline(self.ollama_frame, "ollama_cpu_percent")
+        
+        # Token rate history (fed by the model metrics panel) and CSV export
+        self.history_frame = tk.Frame(self.frame, bg=parent.bg_color)
+        self.history_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.token_history_label = ttk.Label(
+            self.history_frame, 
+            text="Tokens/s:", 
+            background=parent.bg_color,
+            foreground=parent.text_color,
+            font=("TkDefaultFont", 7)
+        )
+        self.token_history_label.pack(side=tk.LEFT)
+        self._add_sparkline(self.history_frame, "token_rate")
+        
+        self.export_button = ttk.Button(self.history_frame, text="Export CSV...", command=self.export_history)
+        self.export_button.pack(side=tk.RIGHT)
+        
+        self.frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        # Start monitoring thread
+        self.update_thread = threading.Thread(target=self._monitor_resources, name="system-monitor", daemon=True)
+        self.update_thread.start()
+        self.ui_task = self.parent.master.after(self.update_interval, self._show_latest_sample)
+    
+    def _build_gpu_widgets(self, has_gpu):
+        """Replaces the detection placeholder with the GPU rows, or with a notice if no GPU can be read"""
+        self.gpu_status.destroy()
+        if has_gpu:
+            device_count = len(self.gpu_backend.device_names)
             self.gpu_label = ttk.Label(
                 self.gpu_frame, 
-                text="GPU Usage:", 
-                background=parent.bg_color,
-                foreground=parent.text_color,
+                text=f"GPU Usage ({device_count}):" if device_count > 1 else "GPU Usage:", 
+                background=self.parent.bg_color,
+                foreground=self.parent.text_color,
                 font=("TkDefaultFont", 7)
             )
             self.gpu_label.pack(side=tk.LEFT)
@@ -123,21 +498,22 @@ class SystemMonitor:
             self.gpu_percentage = ttk.Label(
                 self.gpu_frame, 
                 text="0%", 
-                background=parent.bg_color,
-                foreground=parent.found_color,
+                background=self.parent.bg_color,
+                foreground=self.parent.found_color,
                 font=("TkDefaultFont", 7, "bold")
             )
             self.gpu_percentage.pack(side=tk.LEFT, padx=5)
+            self._add_sparkline(self.gpu_frame, "gpu_percent")
             
             # GPU Memory
-            self.gpu_mem_frame = tk.Frame(self.frame, bg=parent.bg_color)
+            self.gpu_mem_frame = tk.Frame(self.frame, bg=self.parent.bg_color)
             self.gpu_mem_frame.pack(fill=tk.X, padx=10, pady=5)
             
             self.gpu_mem_label = ttk.Label(
                 self.gpu_mem_frame, 
                 text="GPU Memory:", 
-                background=parent.bg_color,
-                foreground=parent.text_color,
+                background=self.parent.bg_color,
+                foreground=self.parent.text_color,
                 font=("TkDefaultFont", 7)
             )
             self.gpu_mem_label.pack(side=tk.LEFT)
@@ -153,58 +529,199 @@ class SystemMonitor:
             self.gpu_mem_percentage = ttk.Label(
                 self.gpu_mem_frame, 
                 text="0%", 
-                background=parent.bg_color,
-                foreground=parent.found_color,
+                background=self.parent.bg_color,
+                foreground=self.parent.found_color,
                 font=("TkDefaultFont", 7, "bold")
             )
             self.gpu_mem_percentage.pack(side=tk.LEFT, padx=5)
+            self._add_sparkline(self.gpu_mem_frame, "gpu_mem_percent")
+            
+            # One line per device
+            self.gpu_devices = ttk.Label(
+                self.frame, 
+                text="", 
+                background=self.parent.bg_color,
+                foreground=self.parent.text_color,
+                font=("TkDefaultFont", 7),
+                justify=tk.LEFT
+            )
+            self.gpu_devices.pack(fill=tk.X, padx=10)
+            # Keep the process and token rate rows below the GPU rows
+            for frame in (self.ollama_frame, self.history_frame):
+                frame.pack_forget()
+                frame.pack(fill=tk.X, padx=10, pady=5)
         else:
             self.gpu_status = ttk.Label(
                 self.gpu_frame, 
-                text="GPU monitoring unavailable (install GPUtil package)", 
-                background=parent.bg_color,
-                foreground=parent.not_found_color,
+                text="GPU monitoring unavailable (no NVML driver or readable /sys/class/drm GPU)", 
+                background=self.parent.bg_color,
+                foreground=self.parent.not_found_color,
                 font=("TkDefaultFont", 7)
             )
             self.gpu_status.pack(side=tk.LEFT)
-        
-        # Start monitoring thread
-        self.update_thread = threading.Thread(target=self._monitor_resources, daemon=True)
-        self.update_thread.start()
     
     def _monitor_resources(self):
-        """Background thread for resource monitoring"""
+        """
+        Background thread for resource monitoring. Samples on a fixed cadence using
+        non-blocking counter deltas and never touches Tk: each sample is published as
+        latest_sample and picked up by _show_latest_sample.
+        """
+        # Loaded here rather than at import time to keep them off the startup path
+        import psutil
+        # The inventory is created after the widgets, so it is looked up on each call
+        self.process_tracker = OllamaProcessTracker(
+            psutil, running_models=lambda: self.parent.inventory.running_models())
+        self.gpu_backend = open_gpu_backend()
+        self.has_gpu = bool(self.gpu_backend.device_names)
+        
+        interval = self.update_interval / 1000
+        psutil.cpu_percent(None)  # sets the baseline for the first delta
+        next_tick = time.monotonic() + interval
         while self.running:
+            if not self.sampling.is_set():
+                self.sampling.wait()
+                if not self.running:
+                    break
+                # Counters accumulated over the whole pause; take a fresh baseline instead
+                psutil.cpu_percent(None)
+                next_tick = time.monotonic() + interval
+            
+            # Sleep until the next tick on a fixed grid, so the time spent sampling doesn't
+            # stretch the period; after a long stall, skip the missed ticks rather than burst
+            delay = next_tick - time.monotonic()
+            if delay > 0 and self.wake.wait(delay):
+                break
+            next_tick += interval
+            if next_tick < time.monotonic():
+                next_tick = time.monotonic() + interval
+            
             try:
-                # Get CPU usage
-                cpu_percent = psutil.cpu_percent(interval=0.5)
+                sample = {"timestamp": time.time()}
                 
-                # Get RAM usage
-                ram = psutil.virtual_memory()
-                ram_percent = ram.percent
+                # Get CPU usage since the previous tick
+                sample["cpu_percent"] = psutil.cpu_percent(None)
                 
-                # Update UI in main thread
-                self.parent.master.after(0, lambda: self._update_ui(cpu_percent, ram_percent))
+                # Get RAM and swap usage
+                sample["ram_percent"] = psutil.virtual_memory().percent
+                sample["swap_percent"] = psutil.swap_memory().percent
                 
-                # Get GPU usage if available
-                if HAS_GPU:
+                # Get GPU usage of every device if available
+                if self.has_gpu:
                     try:
-                        gpus = GPUtil.getGPUs()
-                        if gpus:
-                            gpu = gpus[0]  # Get primary GPU
-                            gpu_percent = gpu.load * 100
-                            gpu_mem_percent = gpu.memoryUtil * 100
-                            self.parent.master.after(0, lambda: self._update_gpu_ui(gpu_percent, gpu_mem_percent))
+                        gpus = self.gpu_backend.read()
                     except Exception as e:
-                        pass
+                        self._report_sampling_error("GPU read", e)
+                        gpus = []
+                    sample["gpus"] = gpus
+                    loads = [gpu.load_percent for gpu in gpus if gpu.load_percent is not None]
+                    used = sum(gpu.memory_used for gpu in gpus if gpu.memory_total)
+                    total = sum(gpu.memory_total for gpu in gpus if gpu.memory_total)
+                    if loads:
+                        sample["gpu_percent"] = max(loads)  # the busiest device is the bottleneck
+                    if total:
+                        sample["gpu_mem_percent"] = used / total * 100
                 
-                # Sleep until next update
-                time.sleep(self.update_interval / 1000)
+                # Get the Ollama server and runner processes
+                try:
+                    processes = self.process_tracker.sample()
+                except psutil.Error:
+                    processes = []
+                sample["processes"] = processes
+                if processes:
+                    sample["ollama_cpu_percent"] = sum(p.cpu_percent for p in processes)
+                    sample["ollama_rss_mb"] = sum(p.rss for p in processes) / (1024 * 1024)
+                
+                # Record every sample, even if the UI never shows it
+                with self.history_lock:
+                    sample["token_rate"], self.pending_token_rate = self.pending_token_rate, None
+                    self.history.record(sample["timestamp"], sample)
+                self.latest_sample = sample
             except Exception as e:
                 # Avoid crashing the thread on errors
-                pass
+                self._report_sampling_error("Resource sample", e)
+        self.gpu_backend.close()
+    
+    def _report_sampling_error(self, what, error):
+        """Logs a sampling failure the first time it occurs; runs on the sampler thread"""
+        key = (what, error.__class__.__name__)
+        if key not in self.reported_errors:
+            self.reported_errors.add(key)
+            logging.warning(f"System monitor: {what} failed: {error.__class__.__name__}: {error}")
+    
+    def _add_sparkline(self, row, metric):
+        """Adds a sparkline canvas for metric at the right of a row"""
+        canvas = tk.Canvas(row, width=90, height=16, bg=self.parent.bg_color, highlightthickness=0)
+        canvas.pack(side=tk.RIGHT, padx=5)
+        line = canvas.create_line(0, 15, 0, 15, fill=self.parent.found_color, width=1)
+        self.sparklines[metric] = (canvas, line)
+    
+    def note_token_rate(self, token_rate):
+        """Called by the model metrics panel on the Tk thread when a response finishes"""
+        with self.history_lock:
+            self.pending_token_rate = token_rate
     
-    def _update_ui(self, cpu_percent, ram_percent):
+    def _panel_visible(self):
+        """False while the window is minimized or the panel is scrolled/tabbed out of view"""
+        master = self.parent.master
+        return master.state() != "iconic" and bool(self.frame.winfo_viewable())
+    
+    def _show_latest_sample(self):
+        """
+        Tk-thread poll: shows the newest sample if there is one it hasn't shown yet, and
+        pauses or resumes the sampler as the panel's visibility changes
+        """
+        if not self.running:
+            return
+        try:
+            if self._panel_visible():
+                self.sampling.set()
+                if self.has_gpu is not None and not self.gpu_widgets_built:
+                    self.gpu_widgets_built = True
+                    self._build_gpu_widgets(self.has_gpu)
+                sample = self.latest_sample
+                if sample is not None and sample is not self.shown_sample:
+                    self.shown_sample = sample
+                    self._apply_sample(sample)
+            else:
+                self.sampling.clear()
+        except tk.TclError:
+            return  # the window is being destroyed
+        self.ui_task = self.parent.master.after(self.update_interval, self._show_latest_sample)
+    
+    def _apply_sample(self, sample):
+        """Updates the bars and sparklines from a sample (Tk thread)"""
+        self._update_ui(sample["cpu_percent"], sample["ram_percent"], sample["swap_percent"])
+        if sample.get("gpus"):
+            self._update_gpu_ui(sample.get("gpu_percent", 0), sample.get("gpu_mem_percent", 0))
+            self.gpu_devices.config(text="\n".join(map(format_gpu_reading, sample["gpus"])))
+        if sample["processes"]:
+            self.ollama_processes.config(text="\n".join(map(format_process_sample, sample["processes"])))
+        else:
+            self.ollama_processes.config(text="Ollama processes: server not running")
+        with self.history_lock:
+            series = {metric: self.history.series(metric) for metric in self.sparklines}
+        for metric, (canvas, line) in self.sparklines.items():
+            draw_sparkline(canvas, line, series[metric], None if metric == "token_rate" else 100)
+    
+    def export_history(self):
+        """Asks for a file name and writes the sample history to it as CSV"""
+        path = filedialog.asksaveasfilename(
+            parent=self.parent.master,
+            title="Export Resource History",
+            defaultextension=".csv",
+            initialfile=f"ollama-resources-{datetime.now():%Y%m%d-%H%M%S}.csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with self.history_lock:
+                rows = self.history.export_csv(path)
+            self.parent.log_message(f"Exported {rows} resource samples to {path}", self.parent.found_color)
+        except OSError as e:
+            self.parent.log_message(f"Failed to export resource history: {e}", self.parent.not_found_color)
+    
+    def _update_ui(self, cpu_percent, ram_percent, swap_percent=0):
         """Update the UI with current system resource usage"""
         # Update CPU
         self.cpu_progress['value'] = cpu_percent
@@ -229,10 +746,20 @@ class SystemMonitor:
             self.ram_percentage.config(foreground=self.parent.checking_color)
         else:
             self.ram_percentage.config(foreground=self.parent.found_color)
+        
+        # Update swap; any sustained use means the model no longer fits in RAM
+        self.swap_progress['value'] = swap_percent
+        self.swap_percentage.config(text=f"{swap_percent:.1f}%")
+        if swap_percent > 50:
+            self.swap_percentage.config(foreground=self.parent.not_found_color)
+        elif swap_percent > 10:
+            self.swap_percentage.config(foreground=self.parent.checking_color)
+        else:
+            self.swap_percentage.config(foreground=self.parent.found_color)
     
     def _update_gpu_ui(self, gpu_percent, gpu_mem_percent):
         """Update the UI with GPU usage information"""
-        if not HAS_GPU:
+        if not self.has_gpu:
             return
             
         # Update GPU usage
@@ -262,20 +789,71 @@ class SystemMonitor:
     def stop(self):
         """Stop the monitoring thread"""
         self.running = False
+        self.wake.set()
+        self.sampling.set()  # release a paused sampler so it can exit
         if hasattr(self, 'update_thread') and self.update_thread.is_alive():
             self.update_thread.join(timeout=1.0)
 
+def percentile(values, fraction):
+    """Returns the fraction (0-1) percentile of values, interpolating between ranks"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def metrics_from_response(final_chunk, first_token_ms=None):
+    """
+    Extracts one request's timings from the final chunk of a chat or generate response.
+
+    Args:
+        final_chunk (dict): Last chunk of the response (the one with done=True)
+        first_token_ms (float, optional): Client-measured time to first token
+
+    Returns:
+        dict with load_ms, prompt_eval_ms, eval_ms, prompt_tokens, eval_tokens, token_rate
+        and latency_ms; metrics the response doesn't carry are None
+    """
+    def ms(key):
+        value = final_chunk.get(key)
+        return value / 1e6 if value is not None else None
+
+    load_ms, prompt_eval_ms, eval_ms = ms("load_duration"), ms("prompt_eval_duration"), ms("eval_duration")
+    eval_tokens = final_chunk.get("eval_count") or 0
+    latency_ms = None
+    if eval_tokens:
+        # Prefer what the user actually waited for; otherwise the server-side equivalent
+        latency_ms = first_token_ms if first_token_ms is not None else (load_ms or 0) + (prompt_eval_ms or 0)
+    return {
+        "load_ms": load_ms,
+        "prompt_eval_ms": prompt_eval_ms,
+        "eval_ms": eval_ms,
+        "prompt_tokens": final_chunk.get("prompt_eval_count") or 0,
+        "eval_tokens": eval_tokens,
+        "token_rate": eval_tokens / (eval_ms / 1000) if eval_tokens and eval_ms else None,
+        "latency_ms": latency_ms,
+    }
+
+
 class ModelMetricsMonitor:
     """Monitors and displays Ollama model metrics"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, window=50):
         """
         Initialize the model metrics monitor
         
         Args:
             parent: Parent application reference
+            window: Number of recent requests per model the averages and percentiles cover
         """
         self.parent = parent
+        self.window = window
+        self.samples = {}  # model -> deque of metrics_from_response() dicts
+        self.resident_mb = {}  # model -> resident size in MB from /api/ps
+        self.current_model = None
         
         # Create main frame
         self.frame = tk.LabelFrame(
@@ -351,6 +929,78 @@ class ModelMetricsMonitor:
             font=("TkDefaultFont", 7, "bold")
         )
         self.memory_value.pack(side=tk.LEFT, padx=5)
+        
+        # Percentiles over the rolling window
+        self.detail_value = ttk.Label(
+            self.frame,
+            text="No requests yet",
+            background=parent.bg_color,
+            foreground=parent.text_color,
+            font=("TkDefaultFont", 7),
+            wraplength=260
+        )
+        self.detail_value.pack(fill=tk.X, padx=10, pady=(0, 5))
+        
+        self.frame.pack(fill=tk.X, padx=5, pady=5)
+    
+    def record_response(self, model, final_chunk, first_token_ms=None):
+        """
+        Adds a finished chat/generate response to the model's rolling window and shows it.
+        Call on the Tk thread.
+        
+        Args:
+            model (str): Model that produced the response
+            final_chunk (dict): Last chunk of the response
+            first_token_ms (float, optional): Client-measured time to first token
+        """
+        samples = self.samples.get(model)
+        if samples is None:
+            samples = self.samples[model] = deque(maxlen=self.window)
+        sample = metrics_from_response(final_chunk, first_token_ms)
+        samples.append(sample)
+        self.current_model = model
+        system_monitor = getattr(self.parent, "system_monitor", None)
+        if system_monitor is not None and sample["token_rate"] is not None:
+            system_monitor.note_token_rate(sample["token_rate"])
+        self.refresh()
+    
+    def update_resident_sizes(self, records):
+        """
+        Records the resident size of each loaded model.
+        
+        Args:
+            records (list): RunningModelRecord entries from /api/ps
+        """
+        self.resident_mb = {record.name: record.size / (1024 * 1024) for record in records}
+        if self.current_model is not None:
+            self.refresh()
+    
+    def stats(self, model, key):
+        """Returns (average, p50, p95) of one metric over the model's window, or None without samples"""
+        values = [sample[key] for sample in self.samples.get(model, ()) if sample[key] is not None]
+        if not values:
+            return None
+        return sum(values) / len(values), percentile(values, 0.5), percentile(values, 0.95)
+    
+    def refresh(self):
+        """Redraws the panel for the model that served the most recent request"""
+        model = self.current_model
+        rate = self.stats(model, "token_rate")
+        latency = self.stats(model, "latency_ms")
+        self.update_metrics(rate[0] if rate else 0, latency[0] if latency else 0, self.resident_mb.get(model, 0))
+        
+        count = len(self.samples.get(model, ()))
+        self.frame.config(text=f"Model Performance Metrics - {model} (last {count})")
+        parts = []
+        if rate:
+            parts.append(f"speed p50 {rate[1]:.1f} p95 {rate[2]:.1f} tok/s")
+        if latency:
+            parts.append(f"latency p50 {latency[1]:.0f} p95 {latency[2]:.0f} ms")
+        for key, name in (("load_ms", "load"), ("prompt_eval_ms", "prompt eval")):
+            values = self.stats(model, key)
+            if values:
+                parts.append(f"{name} p50 {values[1]:.0f} p95 {values[2]:.0f} ms")
+        self.detail_value.config(text=" | ".join(parts) or "No timings reported")
     
     def update_metrics(self, token_rate=0, latency=0, memory_usage=0):
         """
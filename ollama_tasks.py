@@ -0,0 +1,77 @@
+"""
+Background task runner for Ollama GUI
+Runs blocking work on a thread pool and hands the results back on the Tk thread
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskRunner:
+    """Thread pool whose completion callbacks are delivered through a Tk after() pump"""
+
+    def __init__(self, master, max_workers=4, poll_interval=20):
+        """
+        Initialize the task runner
+
+        Args:
+            master: Tk root used to schedule the pump
+            max_workers: Size of the worker thread pool
+            poll_interval: Milliseconds between pump runs on the Tk thread
+        """
+        self.master = master
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ollama-gui")
+        self._callbacks = queue.SimpleQueue()
+        self._running = True
+        self._poll()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the pool.
+
+        Args:
+            fn: Callable to run off the Tk thread
+            on_done: Called on the Tk thread with the return value
+            on_error: Called on the Tk thread with the exception, if fn raised
+
+        Returns:
+            concurrent.futures.Future for the call
+        """
+        future = self.executor.submit(fn, *args, **kwargs)
+
+        def deliver(done_future):
+            if done_future.cancelled():
+                return
+            error = done_future.exception()
+            if error is not None:
+                if on_error:
+                    self.post(on_error, error)
+            elif on_done:
+                self.post(on_done, done_future.result())
+
+        future.add_done_callback(deliver)
+        return future
+
+    def post(self, callback, *args):
+        """Queues callback(*args) to run on the Tk thread; safe to call from any thread"""
+        self._callbacks.put((callback, args))
+
+    def _poll(self):
+        if not self._running:
+            return
+        while True:
+            try:
+                callback, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in UI callback {getattr(callback, '__name__', callback)}: {e}")
+        self.master.after(self.poll_interval, self._poll)
+
+    def shutdown(self):
+        """Stops the pump and the worker pool without waiting for running tasks"""
+        self._running = False
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,172 @@
+"""
+Terminal output interpreter for Ollama GUI
+Applies carriage returns, cursor movement and erase sequences the way a terminal would,
+so progress bars that redraw themselves (e.g. 'ollama pull') update in place instead of
+turning every refresh into a new line
+"""
+
+import re
+
+# CSI sequences (ESC [ params final), OSC strings (window titles), other two-character
+# escapes, and the control characters that move the cursor
+CONTROL_RE = re.compile(r'\x1b\[([0-9;?]*)([@-~])|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b[^\[\]]|[\r\n\b]')
+# An escape sequence cut off at the end of a read; held back until the rest arrives
+INCOMPLETE_ESCAPE_RE = re.compile(r'\x1b(?:\[[0-9;?]*|\][^\x07\x1b]*)?\Z')
+
+
+class TerminalScreen:
+    """
+    Keeps the last few lines of a command's output as an editable screen.
+    Lines that scroll more than max_live_lines above the cursor can no longer change
+    and are handed out as committed text; the rest is the live region, redrawn in place.
+    """
+
+    def __init__(self, max_live_lines=24):
+        """
+        Initialize the screen
+
+        Args:
+            max_live_lines: Number of lines the cursor can still move back into
+        """
+        self.max_live_lines = max_live_lines
+        self.lines = [""]
+        self.tags = [None]  # tag of the stream that last wrote each line
+        self.row = 0
+        self.col = 0
+        self.changed = False
+        self._committed = []
+        self._tail = ""
+
+    def feed(self, text, tag=None):
+        """Interprets a chunk of output written by the stream identified by tag"""
+        text = self._tail + text
+        match = INCOMPLETE_ESCAPE_RE.search(text)
+        if match:
+            text, self._tail = text[:match.start()], text[match.start():]
+        else:
+            self._tail = ""
+
+        pos = 0
+        for match in CONTROL_RE.finditer(text):
+            if match.start() > pos:
+                self._put(text[pos:match.start()], tag)
+            self._control(match)
+            pos = match.end()
+        if pos < len(text):
+            self._put(text[pos:], tag)
+        self._scroll()
+
+    def _put(self, text, tag):
+        line = self.lines[self.row]
+        if len(line) < self.col:
+            line += " " * (self.col - len(line))
+        self.lines[self.row] = line[:self.col] + text + line[self.col + len(text):]
+        self.tags[self.row] = tag
+        self.col += len(text)
+        self.changed = True
+
+    def _move_to(self, row):
+        while len(self.lines) <= row:
+            self.lines.append("")
+            self.tags.append(None)
+        self.row = max(0, row)
+
+    def _control(self, match):
+        token = match.group(0)
+        if token == "\n":
+            self._move_to(self.row + 1)
+            self.col = 0
+        elif token == "\r":
+            self.col = 0
+        elif token == "\b":
+            self.col = max(0, self.col - 1)
+        elif match.group(2):
+            params, final = match.group(1), match.group(2)
+            if params.startswith("?"):
+                return  # private modes such as cursor hide/show
+            args = [int(p) if p else 0 for p in params.split(";")] if params else []
+            n = args[0] if args and args[0] else 1
+            if final == "A":
+                self.row = max(0, self.row - n)
+            elif final == "B":
+                self._move_to(self.row + n)
+            elif final == "C":
+                self.col += n
+            elif final == "D":
+                self.col = max(0, self.col - n)
+            elif final == "E":
+                self._move_to(self.row + n)
+                self.col = 0
+            elif final == "F":
+                self.row = max(0, self.row - n)
+                self.col = 0
+            elif final == "G":
+                self.col = n - 1
+            elif final in "Hf":
+                self._move_to(n - 1)
+                self.col = (args[1] or 1) - 1 if len(args) > 1 else 0
+            elif final == "K":
+                self._erase_line(args[0] if args else 0)
+            elif final == "J":
+                self._erase_display(args[0] if args else 0)
+            # Anything else (colours, scroll regions, ...) has no effect on the text
+        # OSC strings and other escapes carry nothing to display
+
+    def _erase_line(self, mode):
+        line = self.lines[self.row]
+        if mode == 0:
+            line = line[:self.col]
+        elif mode == 1:
+            line = " " * (self.col + 1) + line[self.col + 1:]
+        else:
+            line = ""
+        self.lines[self.row] = line
+        self.changed = True
+
+    def _erase_display(self, mode):
+        if mode == 0:
+            self.lines[self.row] = self.lines[self.row][:self.col]
+            del self.lines[self.row + 1:]
+            del self.tags[self.row + 1:]
+        else:
+            self.lines = [""] * len(self.lines)
+        self.changed = True
+
+    def _scroll(self):
+        excess = self.row - self.max_live_lines + 1
+        if excess > 0:
+            for line, tag in zip(self.lines[:excess], self.tags[:excess]):
+                self._committed.append((line.rstrip(" ") + "\n", tag))
+            del self.lines[:excess]
+            del self.tags[:excess]
+            self.row -= excess
+            self.changed = True
+
+    def take_committed(self):
+        """Returns (text, tag) pairs for lines that left the live region since the last call"""
+        committed, self._committed = self._committed, []
+        return committed
+
+    def live_segments(self):
+        """Returns the live region as (text, tag) pairs and clears the changed flag"""
+        self.changed = False
+        last = len(self.lines) - 1
+        segments = []
+        for i, (line, tag) in enumerate(zip(self.lines, self.tags)):
+            text = line.rstrip(" ") + ("\n" if i < last else "")
+            if text:
+                segments.append((text, tag))
+        return segments
+
+    def finish(self):
+        """Commits the whole screen, e.g. once the process has exited, and returns the committed pairs"""
+        self._tail = ""  # an escape sequence the process never finished
+        if self.lines[-1] == "":
+            self.lines.pop()
+            self.tags.pop()
+        for line, tag in zip(self.lines, self.tags):
+            self._committed.append((line.rstrip(" ") + "\n", tag))
+        self.lines, self.tags = [""], [None]
+        self.row = self.col = 0
+        self.changed = False
+        return self.take_committed()
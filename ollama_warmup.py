@@ -0,0 +1,127 @@
+"""
+Model warm-up for Ollama GUI
+Loads a model's weights in the background before the first chat message is sent, so
+the chat no longer pays the load time, and reports how much load_duration that saved
+"""
+
+import time
+
+from ollama_api import get_client
+
+WARMING = "warming"
+WARM = "warm"
+FAILED = "failed"
+
+
+def _ms(nanoseconds):
+    return (nanoseconds or 0) / 1e6
+
+
+class WarmupRecord:
+    """Outcome of one warm-up request"""
+
+    def __init__(self, model, keep_alive):
+        self.model = model
+        self.keep_alive = keep_alive
+        self.state = WARMING
+        self.error = None
+        self.started = time.perf_counter()
+        self.wall_ms = None  # round trip of the warm-up request
+        self.load_ms = None  # load_duration reported by the server for the warm-up
+        self.reply = None  # the server's response
+
+
+class ModelWarmer:
+    """
+    Sends empty load requests with a keep_alive so a model is resident before it is used.
+    Models marked hot are kept loaded until they are unmarked. All methods and callbacks
+    run on the Tk thread; only the request itself runs on the task pool.
+    """
+
+    def __init__(self, tasks, keep_alive="10m", hot_keep_alive=-1, on_update=None, client=None):
+        """
+        Initialize the warmer
+
+        Args:
+            tasks (TaskRunner): Runs the load requests
+            keep_alive: How long a warmed model stays loaded, e.g. "10m"
+            hot_keep_alive: keep_alive used for hot models (-1 means until unmarked)
+            on_update: Called on the Tk thread with a WarmupRecord when a warm-up finishes
+            client: OllamaClient to use, defaults to the shared client
+        """
+        self.tasks = tasks
+        self.keep_alive = keep_alive
+        self.hot_keep_alive = hot_keep_alive
+        self.on_update = on_update
+        self.client = client
+        self.records = {}  # model -> latest WarmupRecord
+        self.hot = set()
+        self.cold_load_ms = {}  # model -> load_duration of the last request that had to load it
+
+    def warm(self, model, keep_alive=None):
+        """Starts loading model unless a warm-up for it is already running; returns its record"""
+        record = self.records.get(model)
+        if record is not None and record.state == WARMING:
+            return record
+        if keep_alive is None:
+            keep_alive = self.keep_alive_for(model)
+        record = WarmupRecord(model, keep_alive)
+        self.records[model] = record
+        client = self.client or get_client()
+        self.tasks.submit(client.load_model, model, keep_alive,
+                          on_done=lambda reply: self._loaded(record, reply),
+                          on_error=lambda e: self._failed(record, e))
+        return record
+
+    def set_hot(self, model, hot):
+        """Marks model hot (loaded until unmarked) or back to the normal keep_alive, and applies it"""
+        if hot:
+            self.hot.add(model)
+        else:
+            self.hot.discard(model)
+        return self.warm(model)
+
+    def is_hot(self, model):
+        return model in self.hot
+
+    def keep_alive_for(self, model):
+        """keep_alive to send with requests for model so they don't shorten its residency"""
+        return self.hot_keep_alive if model in self.hot else self.keep_alive
+
+    def _loaded(self, record, reply):
+        record.state = WARM
+        record.reply = reply
+        record.wall_ms = (time.perf_counter() - record.started) * 1000
+        record.load_ms = _ms(reply.get("load_duration"))
+        if record.load_ms >= 1:
+            self.cold_load_ms[record.model] = record.load_ms
+        if self.on_update:
+            self.on_update(record)
+
+    def _failed(self, record, error):
+        record.state = FAILED
+        record.error = str(error)
+        record.wall_ms = (time.perf_counter() - record.started) * 1000
+        if self.on_update:
+            self.on_update(record)
+
+    def describe_chat_load(self, model, final_chunk):
+        """
+        Returns a line comparing the load_duration of a chat reply with the model's cold load.
+
+        Args:
+            model (str): Model the chat used
+            final_chunk (dict): Last chunk of the chat stream
+        """
+        load_ms = _ms(final_chunk.get("load_duration"))
+        cold_ms = self.cold_load_ms.get(model)
+        if load_ms >= 1:
+            # This request loaded the model itself; it becomes the baseline for the next one
+            self.cold_load_ms[model] = load_ms
+            record = self.records.get(model)
+            if record is not None and record.state == WARMING:
+                return f"Model load: {load_ms:.0f} ms (warm-up still in progress)"
+            return f"Model load: {load_ms:.0f} ms (cold; warm the model up to skip this)"
+        if cold_ms:
+            return f"Model load: {load_ms:.0f} ms (resident; saved {cold_ms - load_ms:.0f} ms vs a {cold_ms:.0f} ms cold load)"
+        return f"Model load: {load_ms:.0f} ms (already resident)"
@@ -0,0 +1,82 @@
+"""
+Shared fixtures: a FakeOllamaServer per test and a stand-in for the TaskRunner, so the
+client, inventory and worker classes run against a local server without Tk
+"""
+
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ollama_api import OllamaClient
+from ollama_fake_server import FakeOllamaServer, FakeOllamaState, make_model
+
+
+class QueuedTasks:
+    """Collects callbacks posted from worker threads and runs them when drained, like the Tk loop"""
+
+    def __init__(self):
+        self.callbacks = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=8)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Runs fn on a worker and posts on_done/on_error, like TaskRunner.submit"""
+        def run():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if on_error:
+                    self.post(on_error, e)
+                raise
+            if on_done:
+                self.post(on_done, result)
+            return result
+        return self.executor.submit(run)
+
+    def post(self, callback, *args):
+        self.callbacks.put((callback, args))
+
+    def run_until(self, condition, timeout=10):
+        """Runs posted callbacks on the calling thread until condition() is true"""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("condition not reached")
+            try:
+                callback, args = self.callbacks.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                continue
+            callback(*args)
+
+
+@pytest.fixture
+def fake_state():
+    state = FakeOllamaState(models=[make_model("alpha:1b"), make_model("beta:3b", size=3_000_000_000)])
+    state.load_duration = 0.0  # no simulated model load, keeps the tests fast
+    return state
+
+
+@pytest.fixture
+def fake_server(fake_state):
+    with FakeOllamaServer(state=fake_state) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake_server):
+    client = OllamaClient(fake_server.base_url)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def tasks():
+    tasks = QueuedTasks()
+    yield tasks
+    tasks.executor.shutdown(wait=True, cancel_futures=True)
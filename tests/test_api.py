@@ -0,0 +1,117 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ollama_api import OllamaAPIError, OllamaClient, OllamaConnectionError, iter_json_lines, resolve_base_url
+
+
+def test_resolve_base_url(monkeypatch):
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    assert resolve_base_url() == "http://localhost:11434"
+    assert resolve_base_url("127.0.0.1") == "http://127.0.0.1:11434"
+    assert resolve_base_url("http://box:8080/") == "http://box:8080"
+    monkeypatch.setenv("OLLAMA_HOST", "gpu-box:11500")
+    assert resolve_base_url() == "http://gpu-box:11500"
+
+
+def test_list_and_running_models(client, fake_state):
+    assert [m.name for m in client.list_models()] == ["alpha:1b", "beta:3b"]
+    assert client.running_models() == []
+    fake_state.running.add("beta:3b")
+    running = client.running_models()
+    assert [m.name for m in running] == ["beta:3b"]
+    assert running[0].size_vram == 3_000_000_000
+
+
+def test_show_model_and_missing_model(client):
+    assert client.show_model("alpha:1b")["modelfile"] == "FROM alpha:1b\n"
+    with pytest.raises(OllamaAPIError, match="not found"):
+        client.show_model("missing")
+
+
+def test_chat_streams_tokens_and_final_chunk(client, fake_state):
+    payload = {"model": "alpha:1b", "messages": [{"role": "user", "content": "hello there"}]}
+    response = client.chat(payload, stream=True)
+    chunks = list(iter_json_lines(response))
+    text = "".join(chunk["message"]["content"] for chunk in chunks)
+    assert text == fake_state.reply
+    assert chunks[-1]["done"] and chunks[-1]["eval_count"] == len(fake_state.tokens())
+    assert "alpha:1b" in fake_state.running
+
+
+def test_copy_and_delete(client, fake_state):
+    client.copy_model("alpha:1b", "alpha:copy")
+    assert "alpha:copy" in fake_state.models
+    client.delete_model("alpha:copy")
+    assert "alpha:copy" not in fake_state.models
+    with pytest.raises(OllamaAPIError):
+        client.delete_model("alpha:copy")
+
+
+def test_unreachable_server_raises_connection_error():
+    client = OllamaClient("http://127.0.0.1:1", timeout=1)
+    with pytest.raises(OllamaConnectionError):
+        client.list_models()
+
+
+class CannedHandler(BaseHTTPRequestHandler):
+    """Answers every request with the server's canned content type and body"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        content_type, body = self.server.reply
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+
+@pytest.fixture
+def canned():
+    """A server whose reply the test sets; yields (server, client)"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CannedHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+    client = OllamaClient("http://127.0.0.1:%d" % httpd.server_address[1])
+    yield httpd, client
+    client.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+PROXY_PAGE = ("text/html", b"<html><body><h1>502 Bad Gateway</h1></body></html>")
+TRUNCATED = ("application/json", b'{"models": [{"name": "alpha:1b", "digest": "ab')
+
+
+@pytest.mark.parametrize("reply", [PROXY_PAGE, TRUNCATED, ("application/json", b'["not", "an", "object"]')])
+@pytest.mark.parametrize("call", [
+    lambda client: client.list_models(),
+    lambda client: client.running_models(),
+    lambda client: client.show_model("alpha:1b"),
+    lambda client: client.chat({"model": "alpha:1b", "messages": []}),
+    lambda client: client.load_model("alpha:1b"),
+    lambda client: client.version(),
+], ids=["list_models", "running_models", "show_model", "chat", "load_model", "version"])
+def test_reply_that_is_not_a_json_object_raises_api_error(canned, reply, call):
+    httpd, client = canned
+    httpd.reply = reply
+    with pytest.raises(OllamaAPIError, match="invalid reply") as raised:
+        call(client)
+    assert type(raised.value) is OllamaAPIError  # not a connection error, so not retried
+    assert reply[0] in str(raised.value)
+
+
+def test_invalid_line_in_a_stream_raises_api_error(canned):
+    httpd, client = canned
+    httpd.reply = ("application/x-ndjson", b'{"status": "pulling manifest"}\n<html>proxy timeout</html>\n')
+    chunks = iter_json_lines(client.pull("alpha:1b"))
+    assert next(chunks) == {"status": "pulling manifest"}
+    with pytest.raises(OllamaAPIError, match="Invalid line in stream"):
+        next(chunks)
@@ -0,0 +1,45 @@
+from ollama_batch import BatchRunner, format_report
+
+
+def run_batch(tasks, client, operation, models, **options):
+    done = []
+    progress = []
+    runner = BatchRunner(tasks, max_workers=2, client=client)
+    runner.run(operation, models, on_result=lambda result, finished, total: progress.append(finished),
+               on_done=done.append, **options)
+    tasks.run_until(lambda: done)
+    return done[0], progress
+
+
+def test_copy_reports_every_model_in_input_order(tasks, client, fake_state):
+    results, progress = run_batch(tasks, client, "copy", ["beta:3b", "alpha:1b"], destination="{model}-copy")
+    assert [r.model for r in results] == ["beta:3b", "alpha:1b"]
+    assert all(r.ok for r in results)
+    assert progress == [1, 2]
+    assert {"alpha:1b-copy", "beta:3b-copy"} <= set(fake_state.models)
+
+
+def test_failures_are_reported_not_raised(tasks, client):
+    results, _ = run_batch(tasks, client, "remove", ["alpha:1b", "missing"])
+    assert [r.ok for r in results] == [True, False]
+    assert "not found" in results[1].message
+    report = format_report("remove", results, 0.5)
+    assert "1 succeeded, 1 failed" in report and "missing" in report
+
+
+def test_unexpected_error_still_finishes_the_batch(tasks, client):
+    # "{0}" makes str.format raise IndexError; the batch must still reach on_done
+    results, _ = run_batch(tasks, client, "copy", ["alpha:1b", "beta:3b"], destination="{0}-backup")
+    assert [r.ok for r in results] == [False, False]
+    assert results[0].message.startswith("IndexError")
+
+
+def test_cancel_skips_models_not_yet_started(tasks, client):
+    done = []
+    runner = BatchRunner(tasks, max_workers=1, client=client)
+    runner.run("show", ["alpha:1b", "beta:3b", "alpha:1b"], on_done=done.append)
+    runner.cancel()
+    tasks.run_until(lambda: done)
+    results = done[0]
+    assert len(results) == 3
+    assert all(r.ok or r.message == "cancelled" for r in results)
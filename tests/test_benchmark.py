@@ -0,0 +1,54 @@
+from ollama_benchmark import BenchmarkRunner, BenchmarkStore, format_summary, run_headless, summarize
+from ollama_fake_server import FakeOllamaState
+
+PROMPTS = [("short", "Say hi"), ("long", "Explain how a hash map resolves collisions")]
+
+
+def test_runner_measures_and_stores_every_prompt(client):
+    store = BenchmarkStore(":memory:")
+    seen = []
+    runner = BenchmarkRunner(["alpha:1b"], prompts=PROMPTS, repeats=2, store=store, client=client,
+                             on_result=lambda result, finished, total: seen.append((finished, total)))
+    results = runner.run()
+
+    assert [(r.prompt_id, r.repeat) for r in results] == [("short", 1), ("long", 1), ("short", 2), ("long", 2)]
+    assert seen == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    for r in results:
+        assert r.error is None
+        assert r.ttft_ms is not None and r.total_ms >= r.ttft_ms
+        assert r.eval_tokens > 0
+    # the fake server counts prompt tokens as words
+    assert results[0].prompt_tokens == 2 and results[1].prompt_tokens == 7
+    assert store.run_results(runner.run_id) == results
+    started, latest = store.latest_results("alpha:1b")
+    assert started and latest == results
+    assert store.latest_results("beta:3b") is None
+    store.close()
+
+
+def test_missing_model_records_errors(client):
+    runner = BenchmarkRunner(["nope:1b", "alpha:1b"], prompts=PROMPTS[:1], repeats=1, client=client)
+    results = runner.run()
+    assert results[0].error and "nope" in results[0].error
+    assert results[1].error is None
+
+    summary = summarize(results)
+    assert [(row["model"], row["samples"], row["errors"]) for row in summary] == [("nope:1b", 0, 1), ("alpha:1b", 1, 0)]
+    assert summary[0]["eval_tps"] is None
+    table = format_summary(summary).splitlines()
+    assert len(table) == 3 and table[1].startswith("nope:1b") and table[1].rstrip().endswith("-")
+
+
+def test_run_headless_against_the_fake_server(capsys):
+    assert run_headless(["tiny:1b"], repeats=1, warmup=False, fake=True) == 0
+    out = capsys.readouterr().out
+    assert "tiny:1b" in out and "eval t/s" in out
+    assert "error" not in out
+
+
+def test_run_headless_reports_replies_without_content(capsys, monkeypatch):
+    # an empty reply has no first token and no eval rate
+    monkeypatch.setattr(FakeOllamaState, "tokens", lambda state: [])
+    assert run_headless(["tiny:1b"], repeats=1, warmup=False, fake=True) == 0
+    out = capsys.readouterr().out
+    assert "ttft - ms, eval - tok/s" in out
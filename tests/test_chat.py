@@ -0,0 +1,191 @@
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_chat
+from ollama_api import OllamaClient, OllamaConnectionError
+from ollama_chat import ChatCancelled, ChatStreamRenderer, ChatWorker
+
+
+class FakeSink:
+    """Collects writes like OutputSink and only shows them when flush() runs a frame"""
+
+    def __init__(self):
+        self.flushes = 0
+        self.pending = []
+        self.callbacks = []
+        self.frames = []  # (text, tag) pairs shown by each flush
+
+    def write(self, text, tag=None, on_flush=None):
+        self.pending.append((text, tag))
+        if on_flush:
+            self.callbacks.append(on_flush)
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        callbacks, self.callbacks = self.callbacks, []
+        if not pending:
+            return
+        self.frames.append(pending)
+        self.flushes += 1
+        for callback in callbacks:
+            callback()
+
+
+class RecordingRenderer:
+    def __init__(self):
+        self.tokens = []
+        self.first_token = threading.Event()
+
+    def feed(self, token):
+        if token:
+            self.tokens.append(token)
+            self.first_token.set()
+
+
+def payload(model="alpha:1b"):
+    return {"model": model, "messages": [{"role": "user", "content": "hello there"}]}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(ollama_chat, "time", SimpleNamespace(perf_counter=lambda: clock.now))
+    return clock
+
+
+def test_tokens_fed_within_one_frame_are_flushed_together():
+    sink = FakeSink()
+    sink.flushes = 7  # earlier replies in the same pane
+    renderer = ChatStreamRenderer(sink)
+    renderer.start()
+    for token in ("Hello", "", " there", ","):
+        renderer.feed(token)
+    assert sink.frames == [] and renderer.frames == 0  # nothing shown until the frame runs
+
+    sink.flush()
+    renderer.feed(" friend")
+    renderer.finish()
+
+    assert sink.frames == [[("Hello", "ai"), (" there", "ai"), (",", "ai")], [(" friend", "ai")]]
+    assert renderer.frames == 2
+    assert renderer.tokens_received == 4  # empty chunks aren't counted
+    assert renderer.text == "Hello there, friend"
+
+
+def test_first_visible_is_stamped_when_the_frame_shows_it(clock):
+    sink = FakeSink()
+    renderer = ChatStreamRenderer(sink)
+    renderer.start()
+    clock.now = 0.2
+    renderer.feed("Hello")
+    clock.now = 0.25
+    renderer.feed(" there")
+    assert len(sink.callbacks) == 1  # only the first token asks to be told
+    assert (renderer.first_token_at, renderer.first_visible_at) == (0.2, None)
+
+    clock.now = 0.3
+    sink.flush()
+    assert renderer.first_visible_at == 0.3
+
+    clock.now = 0.5
+    renderer.feed("!")
+    renderer.finish()
+    assert renderer.timings() == {"first_token_ms": 200.0, "first_visible_ms": 300.0, "total_ms": 500.0}
+
+
+def test_tokens_fed_from_a_worker_are_shown_by_the_next_frame():
+    sink = FakeSink()
+    renderer = ChatStreamRenderer(sink)
+    renderer.start()
+    worker = threading.Thread(target=lambda: [renderer.feed(t) for t in ("a", "b", "c")])
+    worker.start()
+    worker.join()
+    assert renderer.first_token_at is not None and renderer.first_visible_at is None
+
+    renderer.finish()
+    assert renderer.frames == 1 and renderer.first_visible_at is not None
+    assert renderer.first_visible_at >= renderer.first_token_at
+
+
+def test_reply_is_streamed_to_the_renderer(client):
+    renderer = RecordingRenderer()
+    final = ChatWorker(payload(), renderer, client=client).run()
+    assert final["done"] and final["eval_count"] == len(renderer.tokens)
+    assert "".join(renderer.tokens).startswith("This is a canned reply")
+
+
+def test_non_streamed_reply_is_rendered_once(client):
+    renderer = RecordingRenderer()
+    ChatWorker(payload(), renderer, stream=False, client=client).run()
+    assert len(renderer.tokens) == 1 and renderer.tokens[0].startswith("This is")
+
+
+def test_cancel_while_waiting_for_headers(tasks, client, fake_state):
+    fake_state.load_duration = 1.0  # headers only arrive once the model is loaded
+    fake_state.token_delay = 0.05
+    errors = []
+    worker = ChatWorker(payload(), RecordingRenderer(), client=client).start(tasks, on_error=errors.append)
+    wait_for(lambda: worker._connecting is not None)
+    started = time.monotonic()
+    worker.cancel()
+    tasks.run_until(lambda: errors)
+    assert isinstance(errors[0], ChatCancelled)
+    assert time.monotonic() - started < 0.5  # didn't wait for the load to finish
+    # the helper thread gets the response later and closes it, which the server sees
+    wait_for(lambda: fake_state.aborted_streams == 1)
+    assert worker.renderer.tokens == []
+
+
+def test_cancel_mid_stream(tasks, client, fake_state):
+    fake_state.token_delay = 0.05
+    renderer = RecordingRenderer()
+    errors = []
+    done = []
+    worker = ChatWorker(payload(), renderer, client=client).start(tasks, on_done=done.append,
+                                                                  on_error=errors.append)
+    assert renderer.first_token.wait(5)
+    worker.cancel()
+    tasks.run_until(lambda: errors or done)
+    assert done == [] and isinstance(errors[0], ChatCancelled)
+    wait_for(lambda: fake_state.aborted_streams == 1)
+    assert 0 < len(renderer.tokens) < len(fake_state.tokens())
+
+
+def unreachable_client():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return OllamaClient(f"http://127.0.0.1:{port}")
+
+
+def test_connection_errors_are_retried_then_raised():
+    retries = []
+    worker = ChatWorker(payload(), RecordingRenderer(), max_retries=3, retry_delay=0.01,
+                        client=unreachable_client())
+    worker.on_retry = retries.append
+    with pytest.raises(OllamaConnectionError):
+        worker.run()
+    assert retries == [1, 2]
+
+
+def test_cancel_during_retry_back_off(tasks):
+    retried = threading.Event()
+    errors = []
+    worker = ChatWorker(payload(), RecordingRenderer(), max_retries=3, retry_delay=30,
+                        client=unreachable_client())
+    worker.start(tasks, on_error=errors.append, on_retry=lambda count: retried.set())
+    assert retried.wait(5)
+    worker.cancel()
+    tasks.run_until(lambda: errors, timeout=5)  # well within the 30 s back-off
+    assert isinstance(errors[0], ChatCancelled)
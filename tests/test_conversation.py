@@ -0,0 +1,91 @@
+from ollama_chat import Conversation, estimate_tokens
+
+
+def roles(payload):
+    return [m["role"] for m in payload["messages"]]
+
+
+def conversation(turns, budget=100, trim_to=0.5, system_prompt="sys"):
+    """A conversation of alternating user/assistant messages of 20 tokens each"""
+    conv = Conversation(system_prompt, token_budget=budget, trim_to=trim_to)
+    for i in range(turns):
+        conv.add("user" if i % 2 == 0 else "assistant", f"message {i}", tokens=20)
+    return conv
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 4
+    assert estimate_tokens("x" * 400) == 104
+
+
+def test_everything_is_sent_within_budget():
+    conv = conversation(3)
+    payload, context = conv.build_payload("alpha:1b", keep_alive="5m")
+    assert payload["model"] == "alpha:1b" and payload["keep_alive"] == "5m"
+    assert roles(payload) == ["system", "user", "assistant", "user"]
+    assert context == {"tokens": 64, "messages": 4, "dropped": 0}
+
+
+def test_trim_drops_whole_turns_down_to_trim_to():
+    conv = conversation(5)  # 4 + 5 * 20 = 104 tokens, over the budget of 100
+    payload, context = conv.build_payload("m")
+    # trimming stops once the prompt is within half the budget, at a user message
+    assert roles(payload) == ["system", "user"]
+    assert payload["messages"][0]["content"] == "sys"
+    assert payload["messages"][1]["content"] == "message 4"
+    assert context == {"tokens": 24, "messages": 2, "dropped": 4}
+
+
+def test_history_start_stays_put_until_the_budget_is_exceeded_again():
+    conv = conversation(5)
+    conv.build_payload("m")
+    conv.add("assistant", "reply", tokens=20)
+    conv.add("user", "next", tokens=20)
+    payload, context = conv.build_payload("m")
+    assert context["dropped"] == 4
+    assert [m["content"] for m in payload["messages"][1:]] == ["message 4", "reply", "next"]
+
+
+def test_newest_message_is_sent_even_over_budget():
+    conv = conversation(4)
+    conv.add("user", "huge", tokens=500)
+    payload, context = conv.build_payload("m")
+    assert [m["content"] for m in payload["messages"]] == ["sys", "huge"]
+    assert context["tokens"] == 504
+
+
+def test_never_starts_on_an_assistant_message():
+    conv = Conversation(None, token_budget=50, trim_to=0.9)
+    conv.add("user", "q1", tokens=10)
+    conv.add("assistant", "a1", tokens=30)
+    conv.add("user", "q2", tokens=5)
+    conv.add("assistant", "a2", tokens=5)
+    conv.add("user", "q3", tokens=5)
+    payload, context = conv.build_payload("m")
+    # dropping q1 alone would bring the prompt within 45 tokens, but a1 would lose its question
+    assert roles(payload) == ["user", "assistant", "user"]
+    assert context["dropped"] == 2
+
+
+def test_discard_unanswered_removes_only_a_trailing_question():
+    conv = conversation(3)
+    conv.discard_unanswered()
+    assert [role for role, _, _ in conv.messages] == ["user", "assistant"]
+    conv.discard_unanswered()
+    assert len(conv.messages) == 2
+
+    conv = conversation(5)
+    conv.build_payload("m")  # everything but the last question is trimmed
+    conv.discard_unanswered()
+    conv.add("user", "retry", tokens=20)
+    payload, _ = conv.build_payload("m")
+    assert [m["content"] for m in payload["messages"]] == ["sys", "retry"]
+
+
+def test_clear():
+    conv = conversation(5)
+    conv.build_payload("m")
+    conv.clear()
+    conv.add("user", "fresh")
+    payload, context = conv.build_payload("m")
+    assert roles(payload) == ["system", "user"] and context["dropped"] == 0
@@ -0,0 +1,133 @@
+import sys
+import types
+
+import pytest
+
+import ollama_gpu
+from ollama_gpu import (FakeBackend, GpuBackendUnavailable, NullBackend, NvmlBackend, SysfsBackend,
+                        open_gpu_backend)
+
+
+def unavailable():
+    raise GpuBackendUnavailable("not here")
+
+
+@pytest.fixture
+def no_hardware(monkeypatch):
+    monkeypatch.delenv(ollama_gpu.BACKEND_ENV, raising=False)
+    monkeypatch.setitem(ollama_gpu.BACKENDS, "nvml", unavailable)
+    monkeypatch.setitem(ollama_gpu.BACKENDS, "sysfs", unavailable)
+
+
+def test_probing_falls_back_to_null_backend(no_hardware):
+    backend = open_gpu_backend()
+    assert isinstance(backend, NullBackend)
+    assert backend.read() == [] and backend.device_names == []
+
+
+def test_explicit_backend_and_environment(no_hardware, monkeypatch):
+    assert isinstance(open_gpu_backend("FAKE"), FakeBackend)
+    monkeypatch.setenv(ollama_gpu.BACKEND_ENV, "fake")
+    assert isinstance(open_gpu_backend(), FakeBackend)
+    assert isinstance(open_gpu_backend("none"), NullBackend)
+    # an unknown name probes as usual
+    assert isinstance(open_gpu_backend("bogus"), NullBackend)
+    # an explicit backend that can't open doesn't fall through to the others
+    assert isinstance(open_gpu_backend("sysfs"), NullBackend)
+
+
+def test_fake_backend_readings():
+    backend = FakeBackend(count=3, memory_total=1000)
+    readings = backend.read()
+    assert [r.index for r in readings] == [0, 1, 2]
+    assert [r.name for r in readings] == backend.device_names
+    for r in readings:
+        assert 0 <= r.load_percent <= 100
+        assert 0 <= r.memory_used <= r.memory_total == 1000
+        assert r.temperature is not None
+
+
+def fake_pynvml(fail_on_name=False):
+    module = types.ModuleType("pynvml")
+
+    class NVMLError(Exception):
+        pass
+
+    module.NVMLError = NVMLError
+    module.calls = []
+    module.nvmlInit = lambda: module.calls.append("init")
+    module.nvmlShutdown = lambda: module.calls.append("shutdown")
+    module.nvmlDeviceGetCount = lambda: 1
+    module.nvmlDeviceGetHandleByIndex = lambda i: f"handle{i}"
+
+    def name(handle):
+        if fail_on_name:
+            raise NVMLError("GPU is lost")
+        return b"Fake RTX"
+    module.nvmlDeviceGetName = name
+    return module
+
+
+def test_nvml_names_and_shutdown(monkeypatch):
+    pynvml = fake_pynvml()
+    monkeypatch.setitem(sys.modules, "pynvml", pynvml)
+    backend = NvmlBackend()
+    assert backend.device_names == ["Fake RTX"]
+    backend.close()
+    assert pynvml.calls == ["init", "shutdown"]
+
+
+def test_nvml_error_while_opening_falls_back(monkeypatch):
+    pynvml = fake_pynvml(fail_on_name=True)
+    monkeypatch.setitem(sys.modules, "pynvml", pynvml)
+    monkeypatch.setitem(ollama_gpu.BACKENDS, "sysfs", unavailable)
+    monkeypatch.delenv(ollama_gpu.BACKEND_ENV, raising=False)
+    with pytest.raises(GpuBackendUnavailable):
+        NvmlBackend()
+    assert isinstance(open_gpu_backend(), NullBackend)
+    assert pynvml.calls == ["init", "shutdown", "init", "shutdown"]
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_sysfs_backend_reads_amd_card(tmp_path):
+    device = tmp_path / "card0" / "device"
+    write(device / "gpu_busy_percent", "37\n")
+    write(device / "mem_info_vram_used", "1048576\n")
+    write(device / "mem_info_vram_total", "8589934592\n")
+    write(device / "vendor", "0x1002\n")
+    write(device / "hwmon" / "hwmon3" / "temp1_input", "54000\n")
+    (tmp_path / "card0-DP-1").mkdir()
+    write(tmp_path / "card1" / "device" / "vendor", "0x8086\n")  # nothing readable: skipped
+
+    backend = SysfsBackend(root=str(tmp_path))
+    try:
+        assert backend.device_names == ["AMD card0"]
+        reading, = backend.read()
+        assert (reading.load_percent, reading.memory_used, reading.memory_total, reading.temperature) == \
+            (37, 1048576, 8589934592, 54.0)
+
+        # the files stay open and are re-read from the start on every sample
+        write(device / "gpu_busy_percent", "81\n")
+        assert backend.read()[0].load_percent == 81
+    finally:
+        backend.close()
+
+
+def test_sysfs_backend_missing_fields_are_none(tmp_path):
+    write(tmp_path / "card0" / "device" / "gpu_busy_percent", "5\n")
+    write(tmp_path / "card0" / "device" / "product_name", "Arc A770\n")
+    backend = SysfsBackend(root=str(tmp_path))
+    reading, = backend.read()
+    assert reading.name == "Arc A770"
+    assert reading.load_percent == 5
+    assert reading.memory_used is reading.memory_total is reading.temperature is None
+    backend.close()
+
+
+def test_sysfs_backend_without_cards(tmp_path):
+    with pytest.raises(GpuBackendUnavailable):
+        SysfsBackend(root=str(tmp_path))
@@ -0,0 +1,61 @@
+import inspect
+import tkinter
+import tkinter.font
+import tkinter.scrolledtext
+import tkinter.ttk
+from unittest import mock
+
+import pytest
+
+import ollama_api
+
+
+class FakeVariable:
+    """Stands in for tk.StringVar/BooleanVar/...: keeps the value, needs no interpreter"""
+
+    def __init__(self, master=None, value=None, name=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def trace_add(self, mode, callback):
+        return "trace"
+
+
+@pytest.fixture
+def headless_tk(monkeypatch, tmp_path, client):
+    """Replaces every Tk widget with a mock so the GUI can be built without a display"""
+    variable_class = tkinter.Variable
+    widget_classes = (tkinter.Misc, tkinter.font.Font, tkinter.ttk.Style)
+    for module in (tkinter, tkinter.ttk, tkinter.scrolledtext, tkinter.font):
+        for name, value in list(vars(module).items()):
+            if not inspect.isclass(value):
+                continue
+            if issubclass(value, variable_class):
+                monkeypatch.setattr(module, name, FakeVariable)
+            elif issubclass(value, widget_classes):
+                monkeypatch.setattr(module, name, mock.MagicMock(name=name))
+    import ollama_gui
+    import ollama_gui_widgets
+    for module in (ollama_gui, ollama_gui_widgets):
+        monkeypatch.setattr(module, "Listbox", tkinter.Listbox)
+    # keep the cache, history database and output spill out of the real user directories
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ollama_api, "_client", client)
+    return ollama_gui
+
+
+def test_gui_builds_without_errors(headless_tk):
+    gui = headless_tk.OllamaFinderGUI(tkinter.Tk())
+    try:
+        assert gui.warm_on_select_var.get() is False
+        assert gui.history_browser.listbox is gui.history_listbox
+        assert gui.conversation.system_prompt == gui.chat_system_prompt
+    finally:
+        gui.tasks.shutdown()
+        gui.chat_history.close()
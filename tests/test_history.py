@@ -0,0 +1,165 @@
+import itertools
+
+import pytest
+
+import ollama_history
+from ollama_history import ChatHistoryStore, HistoryBrowser, fts_query, message_metrics
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChatHistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the store's clock with one that advances a second per message"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(ollama_history.time, "time", lambda: float(next(ticks)))
+
+
+def test_fts_query_quotes_every_word_as_a_prefix():
+    assert fts_query("hash map") == '"hash"* "map"*'
+    assert fts_query('  say "hi" OR NOT ') == '"say"* """hi"""* "OR"* "NOT"*'
+    assert fts_query("   ") == ""
+
+
+def test_message_metrics_from_final_chunk():
+    metrics = message_metrics({"prompt_eval_count": 12, "eval_count": 40, "eval_duration": 2_000_000_000,
+                               "load_duration": 5_000_000}, first_token_ms=150, total_ms=2300)
+    assert metrics["prompt_tokens"] == 12 and metrics["eval_tokens"] == 40
+    assert metrics["eval_ms"] == 2000 and metrics["load_ms"] == 5
+    assert metrics["first_token_ms"] == 150 and metrics["total_ms"] == 2300
+
+
+def test_messages_round_trip(store, clock):
+    store.add_message("c1", "user", "What is  a\nmonad?", model="alpha:1b", params={"temperature": 0})
+    store.add_message("c1", "assistant", "A monoid in the category of endofunctors.", model="alpha:1b",
+                      metrics={"eval_tokens": 9})
+    store.flush()
+    conversation, = store.list_conversations()
+    assert (conversation.title, conversation.model, conversation.message_count) == ("What is a monad?", "alpha:1b", 2)
+    user, assistant = store.messages("c1")
+    assert user.params == {"temperature": 0} and assistant.params == {}
+    assert assistant.eval_tokens == 9 and user.eval_tokens is None
+
+
+def test_keyset_paging_visits_every_conversation_once(store, monkeypatch):
+    # several conversations share an updated time, so the id tie-breaker is exercised
+    times = iter([100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+    monkeypatch.setattr(ollama_history.time, "time", lambda: next(times))
+    for i in range(7):
+        store.add_message(f"c{i}", "user", f"message {i}")
+    store.flush()
+
+    pages = []
+    after = None
+    while True:
+        page = store.list_conversations(limit=3, after=after)
+        pages.append([c.id for c in page])
+        if len(page) < 3:
+            break
+        after = page[-1]
+    assert pages == [["c5", "c6", "c3"], ["c4", "c0", "c1"], ["c2"]]
+
+
+def test_search_matches_prefixes_and_returns_snippets(store, clock):
+    store.add_message("rust", "user", "How do lifetimes work in Rust?")
+    store.add_message("py", "user", "Explain Python generators")
+    store.add_message("py", "assistant", "A generator function yields values lazily")
+    store.flush()
+
+    results = store.search("generat")
+    assert [r.id for r in results] == ["py"]
+    assert "[" in results[0].snippet and "]" in results[0].snippet
+    # every word has to match, though not necessarily in the same message position
+    assert [r.id for r in store.search("lifetime rust")] == ["rust"]
+    assert store.search("lifetime python") == []
+    # FTS syntax in the input is searched for literally rather than raising
+    assert store.search('"unbalanced OR') == []
+    assert store.search("   ") == []
+    # "l" prefixes "lifetimes" and "lazily": both conversations, one per page
+    first, second = store.search("l", limit=1), store.search("l", limit=1, offset=1)
+    assert {first[0].id, second[0].id} == {"py", "rust"}
+
+
+def test_delete_and_rename(store, clock):
+    store.add_message("a", "user", "keep this one")
+    store.add_message("b", "user", "delete this one")
+    store.rename_conversation("a", "Renamed")
+    store.delete_conversation("b")
+    store.flush()
+    assert [(c.id, c.title) for c in store.list_conversations()] == [("a", "Renamed")]
+    assert store.search("delete") == []
+    assert store.messages("b") == []
+
+
+class SyncTasks:
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        try:
+            result = fn(*args)
+        except Exception as e:
+            on_error(e)
+        else:
+            on_done(result)
+
+
+class FakeListbox:
+    def __init__(self):
+        self.items = []
+        self.selection = ()
+
+    def config(self, **options):
+        pass
+
+    def insert(self, index, *items):
+        self.items.extend(items)
+
+    def delete(self, first, last=None):
+        if last is None:
+            del self.items[first]
+        else:
+            del self.items[first:]
+
+    def curselection(self):
+        return self.selection
+
+
+class FakeScrollbar:
+    def set(self, first, last):
+        pass
+
+
+def test_browser_pages_and_searches(store, clock):
+    for i in range(5):
+        store.add_message(f"c{i}", "user", "banana bread" if i == 2 else f"note {i}")
+    store.flush()
+    listbox = FakeListbox()
+    browser = HistoryBrowser(listbox, FakeScrollbar(), store, SyncTasks(), page_size=2)
+
+    browser.reload()
+    assert [r.id for r in browser.rows] == ["c4", "c3"]
+    browser._scrolled("0.5", "1.0")
+    browser._scrolled("0.7", "1.0")
+    assert [r.id for r in browser.rows] == ["c4", "c3", "c2", "c1", "c0"]
+    assert browser.exhausted and len(listbox.items) == 5
+
+    listbox.selection = (1,)
+    assert browser.selected().id == "c3"
+    browser.remove("c3")
+    assert [r.id for r in browser.rows] == ["c4", "c2", "c1", "c0"] and len(listbox.items) == 4
+
+    browser.reload("banan")
+    assert [r.id for r in browser.rows] == ["c2"] and browser.exhausted
+
+
+def test_browser_reports_query_errors(store):
+    errors = []
+    store.close()
+    store.list_conversations = lambda limit, after: 1 / 0
+    browser = HistoryBrowser(FakeListbox(), FakeScrollbar(), store, SyncTasks(), on_error=errors.append)
+    browser.reload()
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert browser.exhausted and not browser.loading
@@ -0,0 +1,148 @@
+import threading
+
+from ollama_api import ModelRecord, OllamaClient, OllamaConnectionError
+from ollama_fake_server import make_model
+from ollama_inventory import ModelDetailsCache, ModelInventory
+
+
+def make_inventory(client):
+    return ModelInventory(client_factory=lambda: client)
+
+
+def test_first_refresh_is_a_baseline(client):
+    inventory = make_inventory(client)
+    diff = inventory.refresh()
+    assert not any(diff)
+    assert inventory.available_names() == ["alpha:1b", "beta:3b"]
+
+
+def test_diff_reports_added_removed_changed_and_running(client, fake_state):
+    inventory = make_inventory(client)
+    inventory.refresh()
+    fake_state.models["gamma:7b"] = make_model("gamma:7b")
+    del fake_state.models["alpha:1b"]
+    fake_state.models["beta:3b"] = dict(fake_state.models["beta:3b"], digest="0" * 64)
+    fake_state.running.add("beta:3b")
+    diff = inventory.refresh(force=True)
+    assert diff.added == ["gamma:7b"]
+    assert diff.removed == ["alpha:1b"]
+    assert diff.changed == ["beta:3b"]
+    assert diff.started == ["beta:3b"]
+    fake_state.running.clear()
+    assert inventory.refresh(force=True).stopped == ["beta:3b"]
+
+
+def test_reads_never_fetch(client, fake_state):
+    inventory = make_inventory(client)
+    assert inventory.available_names() == []  # nothing fetched yet, and reading doesn't fetch
+    assert fake_state.request_log == []
+    inventory.refresh()
+    fake_state.models["gamma:7b"] = make_model("gamma:7b")
+    inventory.invalidate()
+    assert "gamma:7b" not in inventory.available_names()
+
+
+def test_failed_fetch_keeps_last_good_records(client, fake_state):
+    inventory = make_inventory(client)
+    inventory.refresh()
+    inventory.client_factory = lambda: OllamaClient("http://127.0.0.1:1", timeout=1)
+    diff = inventory.refresh(force=True)
+    assert not any(diff)
+    assert inventory.last_error is not None
+    assert inventory.available_names() == ["alpha:1b", "beta:3b"]
+    inventory.client_factory = lambda: client
+    assert not any(inventory.refresh())  # stale after the failure, refetched, nothing changed
+    assert inventory.last_error is None
+
+
+def test_failed_first_fetch_is_not_the_baseline(client):
+    inventory = ModelInventory(client_factory=lambda: OllamaClient("http://127.0.0.1:1", timeout=1))
+    inventory.refresh()
+    inventory.client_factory = lambda: client
+    assert not any(inventory.refresh())
+
+
+class GatedClient:
+    """Answers list_models from a script, holding each reply until the test releases it"""
+
+    def __init__(self):
+        self.replies = []  # (gate, names or an exception) per list_models call, in call order
+        self.calls = threading.Semaphore(0)
+
+    def reply(self, result, held=False):
+        gate = threading.Event()
+        if not held:
+            gate.set()
+        self.replies.append((gate, result))
+        return gate
+
+    def list_models(self):
+        gate, result = self.replies.pop(0)
+        self.calls.release()
+        gate.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return [ModelRecord(name, "digest-" + name, 1, "", {}) for name in result]
+
+    def running_models(self):
+        return []
+
+
+def overlapping_refreshes(older, newer):
+    """
+    Runs two refreshes of the model list whose fetches overlap, the newer one answering
+    first; returns the inventory and the diff each refresh reported
+    """
+    client = GatedClient()
+    inventory = ModelInventory(running_ttl=3600, client_factory=lambda: client)
+    client.reply(["alpha:1b"])
+    inventory.refresh()
+    inventory.invalidate(running=False)
+    older_gate, newer_gate = client.reply(older, held=True), client.reply(newer, held=True)
+    diffs = {}
+
+    def refresh(which):
+        diffs[which] = inventory.refresh()
+
+    threads = [threading.Thread(target=refresh, args=(which,)) for which in ("older", "newer")]
+    for thread in threads:
+        thread.start()
+        assert client.calls.acquire(timeout=5)  # this fetch is in flight before the next starts
+    newer_gate.set()
+    threads[1].join(5)
+    older_gate.set()
+    threads[0].join(5)
+    return inventory, diffs
+
+
+def test_older_fetch_landing_last_is_dropped():
+    inventory, diffs = overlapping_refreshes(older=["alpha:1b"], newer=["alpha:1b", "gamma:7b"])
+    assert diffs["newer"].added == ["gamma:7b"]
+    assert not any(diffs["older"])  # no stale "gamma:7b removed"
+    assert inventory.available_names() == ["alpha:1b", "gamma:7b"]
+    assert inventory.fetch_counts["available"] == 2
+
+
+def test_older_failure_landing_last_does_not_mark_the_list_stale():
+    inventory, diffs = overlapping_refreshes(older=OllamaConnectionError("timed out"), newer=["alpha:1b", "gamma:7b"])
+    assert inventory.last_error is None
+    assert not inventory.is_stale("available")
+    assert inventory.available_names() == ["alpha:1b", "gamma:7b"]
+
+
+def test_older_success_landing_after_a_newer_failure_is_dropped():
+    inventory, diffs = overlapping_refreshes(older=["alpha:1b", "gamma:7b"], newer=OllamaConnectionError("timed out"))
+    assert not any(diffs["older"])
+    assert isinstance(inventory.last_error, OllamaConnectionError)
+    assert inventory.is_stale("available")  # the next refresh retries
+    assert inventory.available_names() == ["alpha:1b"]
+
+
+def test_details_cache_evicts_least_recently_used():
+    cache = ModelDetailsCache(max_entries=2)
+    cache.put("a", "details a")
+    cache.put("b", "details b")
+    assert cache.get("a") == "details a"
+    cache.put("c", "details c")
+    assert cache.get("b") is None
+    assert len(cache) == 2 and cache.evictions == 1
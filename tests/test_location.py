@@ -0,0 +1,119 @@
+import json
+import os
+import stat
+
+import pytest
+
+from ollama_location import (CACHE_VERSION, LEGACY_LOCATION_FILE, discover_location, load_location,
+                             location_is_current, probe_version, save_location)
+
+
+def write_executable(path, version="0.5.7"):
+    with open(path, "w") as f:
+        f.write(f"#!/bin/sh\necho 'ollama version is {version}'\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def executable(tmp_path):
+    return write_executable(tmp_path / "ollama")
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "config" / "location.json")
+
+
+def test_save_and_load_round_trip(executable, cache_file):
+    saved = save_location(executable, "0.5.7", server_url="http://box:11434", cache_file=cache_file)
+    loaded = load_location(cache_file)
+    assert loaded == saved
+    assert loaded["cache_version"] == CACHE_VERSION
+    assert (loaded["path"], loaded["version"], loaded["server_url"]) == (executable, "0.5.7", "http://box:11434")
+    assert not os.path.exists(cache_file + ".tmp")
+    assert location_is_current(loaded)
+
+
+def test_load_ignores_missing_corrupt_and_foreign_caches(tmp_path, cache_file, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no legacy file here
+    assert load_location(cache_file) is None
+    os.makedirs(os.path.dirname(cache_file))
+    with open(cache_file, "w") as f:
+        f.write("{not json")
+    assert load_location(cache_file) is None
+    with open(cache_file, "w") as f:
+        json.dump({"cache_version": CACHE_VERSION + 1, "path": "/usr/bin/ollama"}, f)
+    assert load_location(cache_file) is None
+
+
+def test_changed_mtime_makes_the_entry_stale(executable, cache_file):
+    entry = save_location(executable, cache_file=cache_file)
+    st = os.stat(executable)
+    os.utime(executable, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not location_is_current(entry)
+
+
+def test_changed_size_makes_the_entry_stale(executable, cache_file):
+    entry = save_location(executable, cache_file=cache_file)
+    st = os.stat(executable)
+    with open(executable, "a") as f:
+        f.write("# upgraded\n")
+    os.utime(executable, ns=(st.st_atime_ns, st.st_mtime_ns))  # only the size differs
+    assert not location_is_current(entry)
+
+
+def test_replaced_file_makes_the_entry_stale(executable, cache_file, tmp_path):
+    entry = save_location(executable, cache_file=cache_file)
+    st = os.stat(executable)
+    # same size and mtime, new inode: the file was swapped, as package managers do
+    replacement = write_executable(tmp_path / "ollama.new")
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, executable)
+    assert os.stat(executable).st_size == st.st_size and os.stat(executable).st_ino != entry["inode"]
+    assert not location_is_current(entry)
+
+
+def test_deleted_file_makes_the_entry_stale(executable, cache_file):
+    entry = save_location(executable, cache_file=cache_file)
+    os.remove(executable)
+    assert not location_is_current(entry)
+
+
+def test_legacy_file_is_migrated(executable, cache_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open(LEGACY_LOCATION_FILE, "w") as f:
+        f.write(executable + "\n")
+    entry = load_location(cache_file)
+    assert entry["path"] == executable and entry["version"] is None
+    assert location_is_current(entry)
+    assert load_location(cache_file) == entry  # read from the new cache from now on
+
+
+def test_legacy_file_pointing_nowhere_is_ignored(cache_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open(LEGACY_LOCATION_FILE, "w") as f:
+        f.write(str(tmp_path / "gone" / "ollama"))
+    assert load_location(cache_file) is None
+    assert not os.path.exists(cache_file)
+
+
+def test_probe_version(executable, tmp_path):
+    assert probe_version(executable) == "0.5.7"
+    failing = tmp_path / "broken"
+    failing.write_text("#!/bin/sh\necho 'no driver' >&2\nexit 1\n")
+    failing.chmod(0o755)
+    assert probe_version(str(failing)) is None
+    assert probe_version(str(tmp_path / "missing")) is None
+
+
+def test_discover_location_rewrites_the_cache(executable, cache_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    entry = discover_location(cache_file=cache_file)
+    assert entry["path"] == executable and entry["version"] == "0.5.7"
+    assert load_location(cache_file) == entry
+
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    assert discover_location(cache_file=cache_file) is None
+    # the previously cached path is still tried when the executable left PATH
+    assert discover_location(cached=entry, cache_file=cache_file)["path"] == executable
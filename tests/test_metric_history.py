@@ -0,0 +1,60 @@
+import csv
+import math
+
+from ollama_system_monitor import MetricHistory, draw_sparkline
+
+
+def test_series_is_oldest_first_across_wraparound():
+    history = MetricHistory(["cpu"], capacity=4)
+    assert len(history) == 0 and list(history.series("cpu")) == []
+    for i in range(6):
+        history.record(1000.0 + i, {"cpu": i})
+    assert len(history) == 4
+    assert list(history.series("cpu")) == [2, 3, 4, 5]
+    assert list(history.series("cpu", last=3)) == [3, 4, 5]
+    assert list(history.series("cpu", last=10)) == [2, 3, 4, 5]
+
+
+def test_missing_values_are_nan():
+    history = MetricHistory(["cpu", "gpu"], capacity=3)
+    history.record(1.0, {"cpu": 5, "gpu": None})
+    history.record(2.0, {"cpu": 6})
+    gpu = history.series("gpu")
+    assert len(gpu) == 2 and all(math.isnan(v) for v in gpu)
+
+
+def test_export_csv(tmp_path):
+    history = MetricHistory(["cpu", "ram"], capacity=3)
+    for i in range(5):
+        history.record(1_700_000_000.0 + i, {"cpu": i * 1.5} if i == 4 else {"cpu": i, "ram": 40})
+    path = tmp_path / "metrics.csv"
+    assert history.export_csv(str(path)) == 3
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["timestamp", "cpu", "ram"]
+    assert [row[1:] for row in rows[1:]] == [["2.00", "40.00"], ["3.00", "40.00"], ["6.00", ""]]
+    assert rows[1][0] < rows[2][0] < rows[3][0]
+
+
+class FakeCanvas:
+    def __init__(self, width, height):
+        self.size = {"width": width, "height": height}
+        self.points = None
+
+    def cget(self, option):
+        return str(self.size[option])
+
+    def coords(self, item, *points):
+        self.points = points
+
+
+def test_sparkline_buckets_keep_peaks_and_skip_gaps():
+    canvas = FakeCanvas(width=3, height=12)
+    draw_sparkline(canvas, 1, [1, math.nan, 10, 2, 2, 2, 0], maximum=10)
+    xs, ys = canvas.points[0::2], canvas.points[1::2]
+    assert xs == (0, 1, 2)
+    # six real samples in three buckets: [1, 10] [2, 2] [2, 0]; the spike reaches the top edge
+    assert ys == (1, 9, 9)
+
+    draw_sparkline(canvas, 1, [math.nan, 3])
+    assert canvas.points == (0, 12, 0, 12)
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ollama_system_monitor import ModelMetricsMonitor, metrics_from_response, percentile
+
+FINAL_CHUNK = {
+    "done": True,
+    "load_duration": 250_000_000,
+    "prompt_eval_count": 26,
+    "prompt_eval_duration": 130_000_000,
+    "eval_count": 100,
+    "eval_duration": 2_000_000_000,
+}
+
+
+def test_durations_are_converted_from_nanoseconds():
+    metrics = metrics_from_response(FINAL_CHUNK)
+    assert metrics == {
+        "load_ms": 250.0,
+        "prompt_eval_ms": 130.0,
+        "eval_ms": 2000.0,
+        "prompt_tokens": 26,
+        "eval_tokens": 100,
+        "token_rate": 50.0,
+        "latency_ms": 380.0,  # load + prompt eval when the client didn't measure TTFT
+    }
+    assert metrics_from_response(FINAL_CHUNK, first_token_ms=412.5)["latency_ms"] == 412.5
+
+
+@pytest.mark.parametrize("eval_duration", [0, None])
+def test_missing_or_zero_eval_duration_has_no_token_rate(eval_duration):
+    chunk = dict(FINAL_CHUNK, eval_duration=eval_duration)
+    metrics = metrics_from_response(chunk)
+    assert metrics["token_rate"] is None
+    assert metrics["eval_ms"] == (0.0 if eval_duration == 0 else None)
+
+
+def test_response_without_tokens_or_timings():
+    metrics = metrics_from_response({"done": True, "eval_count": 0})
+    assert metrics["token_rate"] is None and metrics["latency_ms"] is None
+    assert metrics["load_ms"] is metrics["prompt_eval_ms"] is metrics["eval_ms"] is None
+    assert metrics["prompt_tokens"] == metrics["eval_tokens"] == 0
+    # a warm model reports no load; latency is just the prompt evaluation
+    assert metrics_from_response({"eval_count": 5, "prompt_eval_duration": 4_000_000})["latency_ms"] == 4.0
+
+
+def test_percentile_interpolates_between_ranks():
+    values = [40, 10, 30, 20]
+    assert percentile(values, 0) == 10
+    assert percentile(values, 1) == 40
+    assert percentile(values, 0.5) == 25
+    assert percentile(values, 0.95) == pytest.approx(38.5)
+    assert percentile([7], 0) == percentile([7], 0.5) == percentile([7], 1) == 7
+    assert percentile([], 0.5) is None
+
+
+def metrics_monitor(window):
+    """A ModelMetricsMonitor without its widgets"""
+    monitor = ModelMetricsMonitor.__new__(ModelMetricsMonitor)
+    monitor.parent = SimpleNamespace(system_monitor=None)
+    monitor.window = window
+    monitor.samples = {}
+    monitor.resident_mb = {}
+    monitor.current_model = None
+    monitor.refresh = lambda: None
+    return monitor
+
+
+def test_stats_cover_the_rolling_window_and_skip_missing_values():
+    monitor = metrics_monitor(window=3)
+    assert monitor.stats("alpha", "token_rate") is None
+    for eval_ms in (1000, 2000, 4000, 500):  # the first falls out of the window
+        monitor.record_response("alpha", dict(FINAL_CHUNK, eval_duration=eval_ms * 1_000_000))
+    monitor.record_response("alpha", dict(FINAL_CHUNK, eval_duration=0))  # no rate: skipped
+
+    average, p50, p95 = monitor.stats("alpha", "token_rate")
+    assert (average, p50) == (pytest.approx((25 + 200) / 2), pytest.approx(112.5))
+    assert p95 == pytest.approx(25 + (200 - 25) * 0.95)
+    assert len(monitor.samples["alpha"]) == 3
+    assert monitor.current_model == "alpha"
+    assert monitor.stats("beta", "token_rate") is None
+
+
+def test_token_rate_is_passed_to_the_system_monitor():
+    rates = []
+    monitor = metrics_monitor(window=5)
+    monitor.parent.system_monitor = SimpleNamespace(note_token_rate=rates.append)
+    monitor.record_response("alpha", FINAL_CHUNK)
+    monitor.record_response("alpha", dict(FINAL_CHUNK, eval_count=0))
+    assert rates == [50.0]
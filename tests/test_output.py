@@ -0,0 +1,266 @@
+import threading
+
+import pytest
+
+from ollama_output import OutputSink
+
+
+class FakeText:
+    """
+    Just enough of tk.Text for OutputSink: the content as one string (without Tk's final
+    newline), marks with gravity, and counters for the calls that cost a redraw
+    """
+
+    def __init__(self):
+        self.content = ""
+        self.marks = {}  # name -> [offset, gravity]
+        self.inserts = []
+        self.deletes = []
+        self.scheduled = []
+        self.tags = {}
+
+    def _offset(self, index):
+        if index in ("end", "end-1c"):
+            return len(self.content)
+        if index in self.marks:
+            return self.marks[index][0]
+        line, column = map(int, index.split("."))
+        lines = self.content.split("\n")
+        if line > len(lines):
+            return len(self.content)
+        return sum(len(text) + 1 for text in lines[:line - 1]) + column
+
+    def index(self, index):
+        before = self.content[:self._offset(index)]
+        return f"{before.count(chr(10)) + 1}.{len(before) - before.rfind(chr(10)) - 1}"
+
+    def insert(self, index, *args):
+        self.inserts.append(args)
+        position = self._offset(index)
+        for text in args[0::2]:
+            self.content = self.content[:position] + text + self.content[position:]
+            for mark in self.marks.values():
+                if mark[0] > position or (mark[0] == position and mark[1] == "right"):
+                    mark[0] += len(text)
+            position += len(text)
+
+    def delete(self, first, last=None):
+        self.deletes.append((first, last))
+        start = self._offset(first)
+        end = self._offset(last) if last is not None else start + 1
+        if end <= start:
+            return
+        self.content = self.content[:start] + self.content[end:]
+        for mark in self.marks.values():
+            if mark[0] >= end:
+                mark[0] -= end - start
+            elif mark[0] > start:
+                mark[0] = start
+
+    def mark_set(self, name, index):
+        gravity = self.marks.get(name, [0, "right"])[1]
+        self.marks[name] = [self._offset(index), gravity]
+
+    def mark_gravity(self, name, gravity):
+        self.marks[name][1] = gravity
+
+    def mark_unset(self, *names):
+        for name in names:
+            del self.marks[name]
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+    def run_scheduled(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, callback in scheduled:
+            callback()
+
+    def tag_config(self, tag, **options):
+        self.tags[tag] = options
+
+    def config(self, **options):
+        pass
+
+    def see(self, index):
+        pass
+
+
+@pytest.fixture
+def text():
+    return FakeText()
+
+
+def test_writes_in_one_frame_become_one_insert(text):
+    sink = OutputSink(text, max_fps=30)
+    sink.write("pulling ", "info")
+    sink.write("manifest\n", "info")
+    sink.write("error: disk full\n", "error")
+    sink.write("retrying\n")
+    sink.write("")  # ignored
+    assert text.scheduled == [(33, sink.flush)] and text.content == ""
+
+    text.run_scheduled()
+    assert text.inserts == [("pulling manifest\n", "info", "error: disk full\n", "error", "retrying\n", ())]
+    assert text.content == "pulling manifest\nerror: disk full\nretrying\n"
+    assert sink.flushes == 1
+
+
+def test_flushes_are_rate_limited_to_one_per_frame(text):
+    sink = OutputSink(text, max_fps=50)
+    for i in range(200):
+        sink.write(f"line {i}\n")
+    assert len(text.scheduled) == 1 and text.scheduled[0][0] == 20
+    text.run_scheduled()
+    assert len(text.inserts) == 1
+    # the next write schedules the next frame
+    sink.write("more\n")
+    assert len(text.scheduled) == 1
+    text.run_scheduled()
+    assert len(text.inserts) == 2 and sink.flushes == 2
+
+
+def test_writes_from_workers_schedule_through_post(text):
+    posted = []
+    sink = OutputSink(text, post=posted.append)
+    writers = [threading.Thread(target=sink.write, args=(f"{i}\n",)) for i in range(5)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert len(posted) == 1 and text.scheduled == []
+    posted[0]()
+    text.run_scheduled()
+    assert sorted(text.content.split()) == ["0", "1", "2", "3", "4"]
+
+
+def test_line_counters(text, monkeypatch):
+    sink = OutputSink(text, rate_window=5.0)
+    sink.write("a\nb\n")
+    sink.write("partial")
+    sink.flush()
+    sink.write(" line\nc\n")
+    sink.flush()
+    sink.flush()  # nothing queued: not counted
+    assert sink.total_lines == 4 and sink.flushes == 2
+    assert sink.lines_per_second == pytest.approx(4 / 5.0)
+
+    import ollama_output
+    now = ollama_output.time.monotonic()
+    monkeypatch.setattr(ollama_output.time, "monotonic", lambda: now + 10)
+    assert sink.lines_per_second == 0
+
+
+def test_tags_are_configured_once_on_the_tk_thread(text):
+    sink = OutputSink(text)
+    sink.define_tag("green", foreground="green")
+    sink.define_tag("green", foreground="green")
+    assert text.tags == {}
+    sink.write("ok\n", "green")
+    sink.flush()
+    assert text.tags == {"green": {"foreground": "green"}}
+
+
+def test_on_flush_runs_after_the_text_is_shown(text):
+    sink = OutputSink(text)
+    seen = []
+    sink.write("token", on_flush=lambda: seen.append(text.content))
+    assert seen == []
+    sink.flush()
+    assert seen == ["token"]
+
+
+def write_lines(sink, first, count):
+    for i in range(first, first + count):
+        sink.write(f"line {i}\n")
+    sink.flush()
+
+
+def test_scrollback_is_trimmed_in_one_delete_past_the_slack(text):
+    sink = OutputSink(text, max_lines=10, trim_chunk=5)
+    write_lines(sink, 0, 14)
+    assert text.deletes == [] and sink.trimmed_lines == 0
+
+    write_lines(sink, 14, 2)  # 16 lines plus the empty last line: over 10 + 5
+    assert text.deletes == [("1.0", "8.0")]
+    assert sink.trimmed_lines == 7
+    assert text.content.splitlines() == [f"line {i}" for i in range(7, 16)]
+    assert sink.total_lines == 16
+
+    write_lines(sink, 16, 3)
+    assert len(text.deletes) == 1  # back under the cap plus slack
+
+
+def test_unlimited_scrollback(text):
+    sink = OutputSink(text, max_lines=None)
+    write_lines(sink, 0, 100)
+    assert text.deletes == [] and len(text.content.splitlines()) == 100
+
+
+def test_spill_file_keeps_the_full_stream(text, tmp_path):
+    spill = tmp_path / "logs" / "output.log"
+    sink = OutputSink(text, max_lines=10, trim_chunk=0, spill_path=str(spill))
+    write_lines(sink, 0, 30)
+    sink.write("no newline yet")
+    sink.flush()
+    assert len(text.content.splitlines()) <= 11
+    assert spill.read_text(encoding="utf-8") == "".join(f"line {i}\n" for i in range(30)) + "no newline yet"
+    for handler in sink.spill.handlers:
+        handler.close()
+        sink.spill.removeHandler(handler)
+
+
+def test_region_is_redrawn_in_place(text):
+    sink = OutputSink(text)
+    sink.write("$ ollama pull tiny\n")
+    sink.update_region("pull", [], [("pulling  10%", None)])
+    sink.update_region("pull", [], [("pulling  40%", None)])  # replaces the queued state
+    sink.flush()
+    assert text.content == "$ ollama pull tiny\npulling  40%"
+
+    sink.write("[other command]\n", "info")
+    sink.update_region("pull", [("pulling manifest\n", None)], [("pulling 100%", None)])
+    sink.flush()
+    # committed lines go above the region; later appends stay below it
+    assert text.content == "$ ollama pull tiny\npulling manifest\npulling 100%[other command]\n"
+    assert sink.total_lines == 3
+
+    sink.close_region("pull")
+    sink.flush()
+    assert text.marks == {}
+    assert text.content == "$ ollama pull tiny\npulling manifest\npulling 100%[other command]\n"
+
+    # a new region for the same key starts at the end again
+    sink.update_region("pull", [], [("again\n", None)])
+    sink.flush()
+    assert text.content.endswith("[other command]\nagain\n")
+
+
+def test_clear_drops_regions_and_queued_output(text):
+    sink = OutputSink(text)
+    sink.update_region("run", [], [("50%", None)])
+    sink.flush()
+    sink.write("queued\n")
+    sink.clear()
+    assert text.content == "" and text.marks == {}
+    sink.flush()
+    assert text.content == ""
+
+
+def test_closed_region_reaches_the_spill_file(text, tmp_path):
+    spill = tmp_path / "output.log"
+    sink = OutputSink(text, spill_path=str(spill))
+    sink.write("$ ollama pull tiny\n")
+    sink.update_region("pull", [], [("pulling  10%\n", None)])
+    sink.flush()
+    sink.update_region("pull", [("pulling manifest\n", None)], [("pulling 100%\n", None)])
+    sink.flush()
+    sink.close_region("pull")  # in a later frame than the region's last update
+    sink.write("done\n")
+    sink.flush()
+    # live states are only written once they stop changing
+    assert spill.read_text(encoding="utf-8") == "$ ollama pull tiny\npulling manifest\npulling 100%\ndone\n"
+    assert sink.total_lines == 4
+    for handler in sink.spill.handlers:
+        handler.close()
+        sink.spill.removeHandler(handler)
@@ -0,0 +1,114 @@
+import sys
+import time
+
+from ollama_process import CommandRunner
+
+
+class FakeMaster:
+    """Collects after() callbacks; run() plays the part of the Tk event loop"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "condition not reached"
+            scheduled, self.scheduled = self.scheduled, []
+            for callback in scheduled:
+                callback()
+            time.sleep(0.005)
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def start(command, **kwargs):
+    master = FakeMaster()
+    output = []
+    exits = []
+    runner = CommandRunner(master, command, lambda committed, live: output.append((committed, live)),
+                           exits.append, **kwargs).start()
+    return master, runner, output, exits
+
+
+def committed_text(output, stream=None):
+    return "".join(text for committed, _ in output for text, tag in committed if stream in (None, tag))
+
+
+def test_output_of_both_pipes_and_exit_code(tmp_path):
+    master, runner, output, exits = start(python(
+        "import sys; print('to stdout'); sys.stdout.flush(); print('to stderr', file=sys.stderr); sys.exit(3)"))
+    master.run(lambda: exits)
+    assert exits == [3] and runner.returncode == 3 and not runner.is_running()
+    assert "to stdout\n" in committed_text(output, "output")
+    assert "to stderr\n" in committed_text(output, "error")
+    # the final call commits the whole screen and leaves nothing live
+    assert output[-1][1] == []
+    assert master.scheduled == []  # the pump stops once the process has been reported
+
+
+def test_chatty_stderr_does_not_stall_the_child():
+    # far more than a pipe buffer holds, written before anything goes to stdout
+    master, runner, output, exits = start(python(
+        "import sys\n"
+        "for i in range(20000): sys.stderr.write('warning %05d ' % i + 'x' * 40 + '\\n')\n"
+        "print('finished')"), max_items_per_poll=1000)
+    master.run(lambda: exits, timeout=20)
+    assert exits == [0]
+    assert committed_text(output, "output") == "finished\n"
+    assert committed_text(output, "error").count("\n") == 20000
+
+
+def test_progress_redraws_stay_live_until_finished():
+    master, runner, output, exits = start(python(
+        "import sys, time\n"
+        "for p in (10, 50, 100):\n"
+        "    sys.stdout.write('\\rpulling %3d%%' % p); sys.stdout.flush(); time.sleep(0.1)\n"))
+    master.run(lambda: exits)
+    live_states = [live for _, live in output if live]
+    assert live_states and all(len(live) == 1 and "\n" not in live[0][0] for live in live_states)
+    assert committed_text(output) == "pulling 100%\n"
+
+
+class RunningProcess:
+    returncode = None
+
+    def poll(self):
+        return None
+
+
+def test_each_pump_run_handles_a_bounded_number_of_reads():
+    master = FakeMaster()
+    output = []
+    runner = CommandRunner(master, ["unused"], lambda committed, live: output.append(live), None,
+                           max_items_per_poll=2)
+    runner.process = RunningProcess()
+    runner._open_streams = 1
+    for i in range(5):
+        runner._queue.put(("output", f"{i}\n"))
+
+    runner._pump()
+    assert runner.screen.lines[:2] == ["0", "1"] and len(master.scheduled) == 1
+    runner._pump()
+    runner._pump()
+    assert [line for line in runner.screen.lines if line] == ["0", "1", "2", "3", "4"]
+    assert len(master.scheduled) == 3
+
+
+def test_terminate_stops_the_child():
+    master, runner, output, exits = start(python(
+        "import time; print('started', flush=True); time.sleep(60)"))
+    master.run(lambda: "started" in committed_text(output) + "".join(
+        text for _, live in output for text, _ in live))
+    assert runner.is_running()
+    started = time.monotonic()
+    runner.terminate()
+    master.run(lambda: exits)
+    assert time.monotonic() - started < 5
+    assert exits[0] != 0
+    runner.terminate()  # already finished: no error
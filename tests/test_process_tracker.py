@@ -0,0 +1,210 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_system_monitor
+from ollama_api import OllamaAPIError, RunningModelRecord
+from ollama_system_monitor import OllamaProcessTracker
+
+BLOBS = "/usr/share/ollama/.ollama/models/blobs/"
+
+
+class NoSuchProcess(Exception):
+    pass
+
+
+class AccessDenied(Exception):
+    pass
+
+
+class FakeProcess:
+    def __init__(self, pid, name, cmdline, rss=100, children=()):
+        self.pid = pid
+        self.info = {"name": name, "cmdline": cmdline}
+        self._cmdline = cmdline
+        self.rss = rss
+        self._children = list(children)
+        self.running = True
+        self.cpu_calls = 0
+
+    def is_running(self):
+        return self.running
+
+    def children(self, recursive=False):
+        if not self.running:
+            raise NoSuchProcess(self.pid)
+        return list(self._children)
+
+    def cmdline(self):
+        if not self.running:
+            raise NoSuchProcess(self.pid)
+        return self._cmdline
+
+    @contextmanager
+    def oneshot(self):
+        yield
+
+    def memory_info(self):
+        if not self.running:
+            raise NoSuchProcess(self.pid)
+        return SimpleNamespace(rss=self.rss)
+
+    def cpu_percent(self, interval):
+        self.cpu_calls += 1
+        return 80.0
+
+    def num_threads(self):
+        return 12
+
+    def io_counters(self):
+        return SimpleNamespace(read_bytes=1, write_bytes=2)
+
+    def open_files(self):
+        raise AccessDenied(self.pid)
+
+
+class FakePsutil:
+    NoSuchProcess = NoSuchProcess
+    AccessDenied = AccessDenied
+
+    def __init__(self, processes):
+        self.processes = {p.pid: p for p in processes}
+        self.scans = 0
+        self.opened = []
+
+    def cpu_count(self):
+        return 4
+
+    def process_iter(self, attrs):
+        self.scans += 1
+        return [p for p in self.processes.values() if p.running]
+
+    def Process(self, pid):
+        self.opened.append(pid)
+        process = self.processes.get(pid)
+        if process is None or not process.running:
+            raise NoSuchProcess(pid)
+        return process
+
+
+class FakeClient:
+    def __init__(self, blobs):
+        self.blobs = blobs
+        self.shown = []
+
+    def show_model(self, name):
+        self.shown.append(name)
+        if name not in self.blobs:
+            raise OllamaAPIError("not found")
+        return {"modelfile": f"# Modelfile generated by \"ollama show\"\nFROM {BLOBS}{self.blobs[name]}\nPARAMETER stop x\n"}
+
+
+def record(name, digest):
+    return RunningModelRecord(name, digest, 0, 0, "", {})
+
+
+def runner(pid, blob=None, legacy=True):
+    if legacy:
+        cmdline = ["/usr/lib/ollama/runners/cuda_v12/ollama_llama_server", "--model", BLOBS + blob, "--port", "4001"]
+    else:
+        cmdline = ["/usr/bin/ollama", "runner", "--ollama-engine", "--port", "4002"]
+        if blob:
+            cmdline[2:2] = ["--model", BLOBS + blob]
+    return FakeProcess(pid, "ollama_llama_server" if legacy else "ollama", cmdline, rss=pid * 1000)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ollama_system_monitor.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_runners_are_matched_to_models_through_their_weights_blob(clock):
+    runners = [runner(11, "sha256-aaa"), runner(12, "sha256-bbb", legacy=False), FakeProcess(13, "sh", ["sh", "-c", "x"])]
+    server = FakeProcess(10, "ollama", ["/usr/bin/ollama", "serve"], children=runners)
+    psutil = FakePsutil([server, *runners, FakeProcess(20, "ollama", ["/usr/bin/ollama", "ps"])])
+    client = FakeClient({"alpha:1b": "sha256-aaa", "beta:3b": "sha256-bbb"})
+    tracker = OllamaProcessTracker(psutil, lambda: [record("alpha:1b", "d1"), record("beta:3b", "d2")],
+                                   client_factory=lambda: client)
+
+    samples = tracker.sample()
+    assert [(s.role, s.pid, s.model) for s in samples] == [("server", 10, None), ("runner", 11, "alpha:1b"),
+                                                          ("runner", 12, "beta:3b")]
+    server_sample = samples[0]
+    assert server_sample.cpu_percent == 20.0  # per-core percentage spread over 4 cores
+    assert server_sample.read_bytes == 1 and server_sample.open_files is None
+
+    tracker.sample()
+    assert sorted(client.shown) == ["alpha:1b", "beta:3b"]  # /api/show once per digest
+
+
+def test_single_runner_without_a_model_argument_serves_the_single_model(clock):
+    child = runner(11, legacy=False)
+    server = FakeProcess(10, "ollama", ["ollama", "serve"], children=[child])
+    client = FakeClient({})  # /api/show fails, so no blob is known
+    tracker = OllamaProcessTracker(FakePsutil([server, child]), lambda: [record("alpha:1b", "d1")],
+                                   client_factory=lambda: client)
+    assert [s.model for s in tracker.sample()] == [None, "alpha:1b"]
+
+
+def test_two_unmatched_runners_stay_unattributed(clock):
+    children = [runner(11, legacy=False), runner(12, legacy=False)]
+    server = FakeProcess(10, "ollama", ["ollama", "serve"], children=children)
+    tracker = OllamaProcessTracker(FakePsutil([server, *children]),
+                                   lambda: [record("alpha:1b", "d1"), record("beta:3b", "d2")],
+                                   client_factory=lambda: FakeClient({}))
+    assert [s.model for s in tracker.sample()] == [None, None, None]
+
+
+def test_handles_are_cached_by_pid_and_dropped_when_runners_exit(clock):
+    first, second = runner(11, "sha256-aaa"), runner(12, "sha256-aaa")
+    server = FakeProcess(10, "ollama", ["ollama", "serve"], children=[first])
+    psutil = FakePsutil([server, first, second])
+    tracker = OllamaProcessTracker(psutil, lambda: [], client_factory=lambda: FakeClient({}))
+
+    for _ in range(3):
+        tracker.sample()
+    assert psutil.opened == [10, 11]
+    assert first.cpu_calls == 3 + 1  # a baseline call when the handle is opened, then one per sample
+
+    server._children = [second]  # the first runner exited, another one started
+    first.running = False
+    tracker.sample()
+    assert set(tracker.handles) == {10, 12}
+    assert psutil.opened == [10, 11, 12]
+
+
+def test_process_table_is_rescanned_at_most_every_rescan_interval(clock):
+    psutil = FakePsutil([])
+    tracker = OllamaProcessTracker(psutil, rescan_interval=10.0)
+    assert tracker.sample() == []
+    clock[0] += 5
+    assert tracker.sample() == []
+    assert psutil.scans == 1
+
+    server = FakeProcess(10, "ollama", ["ollama", "serve"])
+    psutil.processes[10] = server
+    clock[0] += 5
+    assert [s.role for s in tracker.sample()] == ["server"]
+    assert psutil.scans == 2
+    tracker.sample()
+    assert psutil.scans == 2  # found: no further scans while it is running
+
+
+def test_server_that_exits_is_looked_up_again(clock):
+    server = FakeProcess(10, "ollama", ["ollama", "serve"])
+    psutil = FakePsutil([server])
+    tracker = OllamaProcessTracker(psutil)
+    assert len(tracker.sample()) == 1
+
+    server.running = False
+    clock[0] += 1
+    assert tracker.sample() == []  # within the rescan interval of the last scan
+    assert psutil.scans == 1
+    restarted = FakeProcess(30, "ollama", ["ollama", "serve"])
+    psutil.processes[30] = restarted
+    clock[0] += 10
+    assert [s.pid for s in tracker.sample()] == [30]
+    assert tracker.handles.keys() == {30}
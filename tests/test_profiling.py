@@ -0,0 +1,98 @@
+import builtins
+import os
+import runpy
+import sys
+import threading
+
+import pytest
+
+import ollama_profiling
+from ollama_profiling import StartupProfiler
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+@pytest.fixture
+def original_import(monkeypatch):
+    """The real __import__; put back after the test even if the profiler leaked its hook"""
+    original = builtins.__import__
+    monkeypatch.setattr(ollama_profiling, "_profiler", None)
+    yield original
+    builtins.__import__ = original
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """Writes importable modules to tmp_path and forgets them after the test"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(name, source):
+        (tmp_path / f"{name}.py").write_text(source)
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    return write
+
+
+def test_hook_is_restored_after_the_report_is_written(tmp_path, original_import):
+    profiler = StartupProfiler(str(tmp_path / "logs" / "profile.txt"))
+    profiler.install()
+    assert builtins.__import__ is not original_import
+
+    profiler.write_report()
+
+    assert builtins.__import__ is original_import
+    assert profiler.reported
+    assert (tmp_path / "logs" / "profile.txt").read_text().startswith("Startup profile")
+
+
+def test_hook_is_restored_when_startup_raises(tmp_path, monkeypatch, original_import):
+    report = tmp_path / "profile.txt"
+    monkeypatch.setattr(sys, "argv", ["main.py", "--profile-startup", str(report)])
+    monkeypatch.setitem(sys.modules, "ollama_gui", None)  # importing the GUI fails
+
+    with pytest.raises(ImportError):
+        runpy.run_path(MAIN, run_name="__main__")
+
+    assert builtins.__import__ is original_import
+    assert "imports" in report.read_text()  # the phase that failed is still reported
+
+
+def test_nested_imports_are_attributed_to_the_module_that_ran_them(tmp_path, modules, original_import):
+    modules("profiled_inner", "import time\ntime.sleep(0.1)\n")
+    modules("profiled_outer", "import time\nimport profiled_inner\ntime.sleep(0.02)\n")
+    profiler = StartupProfiler(str(tmp_path / "profile.txt"))
+    profiler.install()
+    try:
+        import profiled_outer  # noqa: F401
+    finally:
+        profiler.uninstall()
+
+    entries = {entry[2]: entry for entry in profiler.imports}
+    outer_order, outer_depth, _, outer_self, outer_cumulative = entries["profiled_outer"]
+    inner_order, inner_depth, _, inner_self, inner_cumulative = entries["profiled_inner"]
+    assert (outer_depth, inner_depth) == (0, 1)
+    assert outer_order < inner_order  # listed in the order the imports started
+    assert inner_self >= 0.1 and inner_cumulative == inner_self
+    # The inner module's time counts towards the outer one's cumulative time only
+    assert 0.02 <= outer_self < 0.1
+    assert outer_cumulative == pytest.approx(outer_self + inner_cumulative)
+    assert "time" not in entries  # already loaded, so not timed
+
+    profiler.write_report()
+    tree = (tmp_path / "profile.txt").read_text().split("Import tree (load order):\n")[1]
+    assert [line[12:] for line in tree.splitlines()] == ["profiled_outer", "  profiled_inner"]
+
+
+def test_imports_from_other_threads_are_not_timed(tmp_path, modules, original_import):
+    modules("profiled_threaded", "")
+    profiler = StartupProfiler(str(tmp_path / "profile.txt"))
+    profiler.install()
+    try:
+        thread = threading.Thread(target=lambda: __import__("profiled_threaded"))
+        thread.start()
+        thread.join()
+    finally:
+        profiler.uninstall()
+
+    assert "profiled_threaded" in sys.modules
+    assert profiler.imports == []
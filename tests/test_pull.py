@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_commands
+from ollama_pull import ACTIVE, CANCELLED, DONE, FAILED, FINISHED_STATES, RETRYING, PullJob, PullManager
+
+SIZE = 10_000_000
+
+
+@pytest.fixture
+def pullable(fake_state):
+    for name in ("one:1b", "two:1b", "three:1b", "four:1b"):
+        fake_state.pullable[name] = SIZE
+    return fake_state
+
+
+def make_manager(tasks, client, **kwargs):
+    kwargs.setdefault("retry_delay", 0.01)
+    return PullManager(tasks, client=client, update_interval=0, **kwargs)
+
+
+def wait_finished(tasks, jobs):
+    tasks.run_until(lambda: all(job.state in FINISHED_STATES for job in jobs))
+    return jobs
+
+
+def test_pulls_run_at_most_max_concurrent_at_once(tasks, client, pullable):
+    pullable.pull_delay = 0.002
+    active = []
+    manager = make_manager(tasks, client, max_concurrent=2,
+                           on_update=lambda job: active.append(manager._active))
+    jobs = wait_finished(tasks, manager.enqueue(["one:1b", "two:1b", "three:1b", "four:1b"]))
+    assert [job.state for job in jobs] == [DONE] * 4
+    assert max(active) == 2
+    assert {"one:1b", "four:1b"} <= set(pullable.models)
+    for job in jobs:
+        assert job.completed == job.total == SIZE + 512
+    # a finished model can be pulled again, but one already queued is not queued twice
+    again = manager.enqueue(["one:1b"])
+    assert len(again) == 1 and manager.enqueue(["one:1b"]) == []
+    wait_finished(tasks, again)
+
+
+def test_dropped_stream_is_retried_and_resumes(tasks, client, pullable, monkeypatch):
+    pullable.pull_interruptions["one:1b"] = 2
+    seen = []  # (attempt, completed) of the weights layer
+    record_progress = PullJob.record_progress
+
+    def spy(job, digest, total, completed):
+        if job.name == "one:1b" and total == SIZE:
+            seen.append((job.attempts, completed))
+        record_progress(job, digest, total, completed)
+    monkeypatch.setattr(PullJob, "record_progress", spy)
+
+    states = []
+    manager = make_manager(tasks, client, on_update=lambda job: states.append(job.state))
+    job, = wait_finished(tasks, manager.enqueue(["one:1b"]))
+
+    assert job.state == DONE and job.attempts == 3
+    assert RETRYING in states
+    for attempt in (2, 3):
+        resumed_at = next(completed for a, completed in seen if a == attempt)
+        dropped_at = max(completed for a, completed in seen if a == attempt - 1)
+        # the server may have stored a step it never got to report before the drop
+        assert 0 < dropped_at <= resumed_at <= dropped_at + SIZE // pullable.pull_steps
+    assert job.completed == job.total == SIZE + 512
+
+
+def test_retries_give_up_after_max_retries(tasks, client, pullable):
+    pullable.pull_interruptions["one:1b"] = 5
+    manager = make_manager(tasks, client, max_retries=1)
+    job, = wait_finished(tasks, manager.enqueue(["one:1b"]))
+    assert job.state == FAILED and job.attempts == 2
+    assert "interrupted" in job.error or "ended" in job.error
+
+
+def test_registry_error_fails_without_retrying(tasks, client, pullable):
+    manager = make_manager(tasks, client)
+    job, = wait_finished(tasks, manager.enqueue(["nosuch:1b"]))
+    assert job.state == FAILED and job.attempts == 1
+    assert "file does not exist" in job.error
+
+
+def test_cancel_a_queued_pull(tasks, client, pullable):
+    pullable.pull_delay = 0.002
+    manager = make_manager(tasks, client, max_concurrent=1)
+    first, second = manager.enqueue(["one:1b", "two:1b"])
+    manager.cancel("two:1b")
+    assert second.state == CANCELLED and second.attempts == 0
+    wait_finished(tasks, [first])
+    assert first.state == DONE
+    assert "two:1b" not in pullable.models
+
+
+def test_cancel_a_running_pull(tasks, client, pullable):
+    pullable.pull_delay = 0.01
+    manager = make_manager(tasks, client)
+    job, = manager.enqueue(["one:1b"])
+    tasks.run_until(lambda: job.completed > 0)
+    assert job.state == ACTIVE
+    manager.cancel("one:1b")
+    wait_finished(tasks, [job])
+    assert job.state == CANCELLED
+    assert "one:1b" not in pullable.models
+
+
+def test_cancel_during_retry_back_off(tasks, client, pullable):
+    pullable.pull_interruptions["one:1b"] = 1
+    manager = make_manager(tasks, client, retry_delay=30)
+    job, = manager.enqueue(["one:1b"])
+    tasks.run_until(lambda: job.state == RETRYING)
+    manager.cancel("one:1b")
+    wait_finished(tasks, [job])  # well within the 30 s back-off
+    assert job.state == CANCELLED and job.attempts == 1
+
+
+def test_finished_pulls_are_reported_once_and_refresh_the_inventory_once(tasks, client, pullable, monkeypatch):
+    messages = []
+    refreshes = []
+    monkeypatch.setattr(ollama_commands, "log_message", lambda gui, text, color=None: messages.append(text))
+    monkeypatch.setattr(ollama_commands, "refresh_inventory", lambda gui, **kwargs: refreshes.append(kwargs))
+    gui = SimpleNamespace(pull_panel=None, found_color="green", not_found_color="red", checking_color="blue")
+    drained = []
+    pullable.pull_delay = 0.001
+    manager = make_manager(
+        tasks, client, max_concurrent=2,
+        on_update=lambda job: ollama_commands.pull_job_updated(gui, job),
+        on_finished=lambda job: ollama_commands.pull_job_finished(gui, job),
+        on_all_done=lambda jobs: (drained.append(jobs), ollama_commands.pulls_finished(gui, jobs)))
+    jobs = manager.enqueue(["one:1b", "two:1b", "nosuch:1b"])
+    tasks.run_until(lambda: drained)
+    wait_finished(tasks, jobs)
+    # let any progress update still queued for a finished job run too
+    tasks.run_until(lambda: tasks.callbacks.empty())
+
+    assert len(drained) == 1 and sorted(job.name for job in drained[0]) == ["nosuch:1b", "one:1b", "two:1b"]
+    assert sorted(m for m in messages if m.startswith("Pulled")) == ["Pulled one:1b (1 attempt(s))",
+                                                                     "Pulled two:1b (1 attempt(s))"]
+    assert sum(m.startswith("Pull of nosuch:1b failed") for m in messages) == 1
+    assert len(refreshes) == 1
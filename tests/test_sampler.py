@@ -0,0 +1,180 @@
+"""
+Drives SystemMonitor._monitor_resources on the test thread with a fake clock: the waits
+advance the clock instead of sleeping, and the fake psutil reports the seconds since its
+previous cpu_percent call, so each sample shows the window its CPU figure covers
+"""
+
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_system_monitor
+from ollama_system_monitor import MetricHistory, SystemMonitor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeWake:
+    """Stands in for the stop event: waiting just moves the clock forward"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.waits = []
+        self.stopped = False
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        if self.stopped:
+            return True
+        self.clock.now += timeout
+        return False
+
+
+class FakeSampling:
+    """Stands in for the pause event: a paused sampler stays paused for pause_length seconds"""
+
+    def __init__(self, clock, pause_length):
+        self.clock = clock
+        self.pause_length = pause_length
+        self.flag = True
+        self.on_resume = None
+
+    def is_set(self):
+        return self.flag
+
+    def clear(self):
+        self.flag = False
+
+    def wait(self):
+        self.clock.now += self.pause_length
+        self.flag = True
+        if self.on_resume:
+            self.on_resume()
+
+
+class FakePsutil:
+    Error = Exception
+
+    def __init__(self, clock, on_sample):
+        self.clock = clock
+        self.on_sample = on_sample
+        self.cpu_calls = []  # clock time of every cpu_percent call, baselines included
+        self.sample_times = []
+
+    def cpu_percent(self, interval):
+        assert interval is None  # the sampler must never block in psutil
+        elapsed = self.clock.now - self.cpu_calls[-1] if self.cpu_calls else None
+        self.cpu_calls.append(self.clock.now)
+        return elapsed
+
+    def virtual_memory(self):
+        # Only called while taking a sample, right after its cpu_percent
+        self.sample_times.append(self.clock.now)
+        self.on_sample(len(self.sample_times))
+        return SimpleNamespace(percent=50.0)
+
+    def swap_memory(self):
+        return SimpleNamespace(percent=0.0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ollama_system_monitor.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def run_sampler(monkeypatch, clock, on_sample, pause_length=10.0):
+    """Runs the sampler loop until on_sample stops it; returns the monitor and fake psutil"""
+    psutil = FakePsutil(clock, lambda n: on_sample(monitor, n))
+    backend = SimpleNamespace(device_names=[], closed=False)
+    backend.close = lambda: setattr(backend, "closed", True)
+    monkeypatch.setitem(sys.modules, "psutil", psutil)
+    monkeypatch.setattr(ollama_system_monitor, "open_gpu_backend", lambda: backend)
+    monkeypatch.setattr(ollama_system_monitor, "OllamaProcessTracker",
+                        lambda psutil, running_models: SimpleNamespace(sample=lambda: []))
+
+    monitor = SystemMonitor.__new__(SystemMonitor)
+    monitor.parent = SimpleNamespace(inventory=None)
+    monitor.update_interval = 1000
+    monitor.running = True
+    monitor.history = MetricHistory(SystemMonitor.METRICS, 100)
+    monitor.history_lock = threading.Lock()
+    monitor.pending_token_rate = None
+    monitor.latest_sample = None
+    monitor.reported_errors = set()
+    monitor.wake = FakeWake(clock)
+    monitor.sampling = FakeSampling(clock, pause_length)
+    monitor._monitor_resources()
+    assert backend.closed
+    return monitor, psutil
+
+
+def test_samples_stay_on_the_grid_when_sampling_takes_time(monkeypatch, clock):
+    def on_sample(monitor, n):
+        clock.now += 0.25  # the rest of the sample takes a quarter of the period
+        monitor.running = n < 4
+
+    monitor, psutil = run_sampler(monkeypatch, clock, on_sample)
+
+    assert psutil.sample_times == [1.0, 2.0, 3.0, 4.0]
+    assert monitor.wake.waits == [1.0, 0.75, 0.75, 0.75]
+    assert psutil.cpu_calls == [0.0, 1.0, 2.0, 3.0, 4.0]  # one baseline, then one delta per tick
+    assert list(monitor.history.series("cpu_percent")) == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_missed_ticks_are_skipped_after_a_stall(monkeypatch, clock):
+    def on_sample(monitor, n):
+        clock.now += 3.5 if n == 2 else 0.25
+        monitor.running = n < 5
+
+    monitor, psutil = run_sampler(monkeypatch, clock, on_sample)
+
+    # The stalled sample ends at 5.5: one sample is taken straight away, then the grid
+    # restarts from there instead of bursting through the ticks at 3, 4 and 5
+    assert psutil.sample_times == [1.0, 2.0, 5.5, 6.5, 7.5]
+    assert monitor.wake.waits == [1.0, 0.75, 0.75, 0.75]
+
+
+def test_resuming_takes_a_fresh_cpu_baseline(monkeypatch, clock):
+    def on_sample(monitor, n):
+        if n == 2:
+            monitor.sampling.clear()
+        monitor.running = n < 4
+
+    monitor, psutil = run_sampler(monkeypatch, clock, on_sample, pause_length=10.0)
+
+    # Paused after the sample at 2 until 12; the baseline retaken at 12 puts the next
+    # tick at 13, and its CPU figure covers one second rather than the whole pause
+    assert psutil.sample_times == [1.0, 2.0, 13.0, 14.0]
+    assert psutil.cpu_calls == [0.0, 1.0, 2.0, 12.0, 13.0, 14.0]
+    assert list(monitor.history.series("cpu_percent")) == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_stop_while_paused_exits_without_sampling(monkeypatch, clock):
+    def on_sample(monitor, n):
+        monitor.sampling.clear()
+        monitor.sampling.on_resume = lambda: setattr(monitor, "running", False)
+
+    monitor, psutil = run_sampler(monkeypatch, clock, on_sample)
+
+    assert psutil.sample_times == [1.0]
+    assert psutil.cpu_calls == [0.0, 1.0]  # no baseline is taken for a resume that only stops
+
+
+def test_stop_interrupts_the_wait_for_the_next_tick(monkeypatch, clock):
+    def on_sample(monitor, n):
+        monitor.wake.stopped = True
+
+    monitor, psutil = run_sampler(monkeypatch, clock, on_sample)
+
+    assert psutil.sample_times == [1.0]
+    assert monitor.wake.waits == [1.0, 1.0]
@@ -0,0 +1,110 @@
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_functions
+from ollama_functions import pruned_mount_points, scan_for_executable
+
+MOUNTS = """\
+/dev/sda1 / ext4 rw,relatime 0 0
+proc /proc proc rw,nosuid 0 0
+tmpfs /run/user/1000 tmpfs rw 0 0
+server:/export /mnt/nas nfs4 rw 0 0
+/dev/loop3 /snap/ollama/12 squashfs ro 0 0
+/dev/sdb1 /media/My\\040Disk vfat rw 0 0
+//host/share /mnt/My\\040Share cifs rw 0 0
+"""
+
+
+def make_tree(root, *paths):
+    """Creates directories, and files for paths ending in ollama"""
+    for path in paths:
+        full = os.path.join(root, path)
+        if os.path.basename(path) == "ollama":
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "w") as f:
+                f.write("#!/bin/sh\n")
+        else:
+            os.makedirs(full, exist_ok=True)
+
+
+@pytest.fixture
+def listed(monkeypatch):
+    """Records (path, depth) of every directory the search lists"""
+    calls = []
+    scan_directory = ollama_functions._scan_directory
+
+    def spy(path, depth, max_depth, pruned, stop):
+        calls.append((path, depth))
+        return scan_directory(path, depth, max_depth, pruned, stop)
+    monkeypatch.setattr(ollama_functions, "_scan_directory", spy)
+    return calls
+
+
+@pytest.fixture
+def no_pruning(monkeypatch):
+    monkeypatch.setattr(ollama_functions, "pruned_mount_points", lambda: set())
+
+
+def test_pruned_mount_points_reads_proc_mounts(monkeypatch):
+    real_open = open
+    monkeypatch.setattr(ollama_functions.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(ollama_functions, "open",
+                        lambda path, *args, **kwargs: io.StringIO(MOUNTS) if path == "/proc/mounts"
+                        else real_open(path, *args, **kwargs), raising=False)
+    pruned = pruned_mount_points()
+    assert {"/proc", "/run/user/1000", "/mnt/nas", "/snap/ollama/12", "/mnt/My Share"} <= pruned
+    assert "/" not in pruned and "/media/My Disk" not in pruned
+    assert "/snap" not in pruned and "/sys" in pruned  # fixed per-platform directories
+
+
+def test_pruned_mount_points_without_proc(monkeypatch):
+    def unreadable(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(ollama_functions.platform, "system", lambda: "Darwin")
+    monkeypatch.setattr(ollama_functions, "open", unreadable, raising=False)
+    assert pruned_mount_points() == ollama_functions.PRUNED_DIRS["Darwin"]
+
+
+def test_finds_the_executable(tmp_path, no_pruning):
+    make_tree(tmp_path, "usr/share/doc", "opt/tools/bin/ollama")
+    assert scan_for_executable([str(tmp_path)], lambda: False) == str(tmp_path / "opt/tools/bin/ollama")
+
+
+def test_directories_beyond_max_depth_are_never_listed(tmp_path, no_pruning, listed):
+    make_tree(tmp_path, "a/b/c/d/ollama")
+    assert scan_for_executable([str(tmp_path)], lambda: False, max_depth=2) is None
+    assert max(depth for _, depth in listed) == 2
+    assert str(tmp_path / "a/b") in dict(listed) and str(tmp_path / "a/b/c") not in dict(listed)
+    assert scan_for_executable([str(tmp_path)], lambda: False, max_depth=4) == str(tmp_path / "a/b/c/d/ollama")
+
+
+def test_pruned_directories_are_not_entered(tmp_path, monkeypatch, listed):
+    make_tree(tmp_path, "mnt/nas/ollama", "proj/node_modules/ollama", "proj/.git/ollama", "home/user")
+    monkeypatch.setattr(ollama_functions, "pruned_mount_points", lambda: {str(tmp_path / "mnt/nas")})
+    assert scan_for_executable([str(tmp_path)], lambda: False) is None
+    paths = {path for path, _ in listed}
+    assert str(tmp_path / "home/user") in paths
+    for skipped in ("mnt/nas", "proj/node_modules", "proj/.git"):
+        assert str(tmp_path / skipped) not in paths
+
+
+def test_stops_at_the_first_match(tmp_path, no_pruning, listed):
+    make_tree(tmp_path, "ollama", *(f"dir{i}/sub" for i in range(20)))
+    assert scan_for_executable([str(tmp_path)], lambda: False) == str(tmp_path / "ollama")
+    # the match was in the root, so none of its subdirectories were queued
+    assert listed == [(str(tmp_path), 0)]
+
+
+def test_stops_when_the_search_is_cancelled(tmp_path, no_pruning, listed):
+    make_tree(tmp_path, *(f"d{i}/e{j}" for i in range(10) for j in range(10)), "d9/e9/ollama")
+    gui = SimpleNamespace(searching=True)
+
+    def should_stop():
+        if len(listed) >= 3:
+            gui.searching = False  # Cancel pressed while the search is running
+        return not gui.searching
+    assert scan_for_executable([str(tmp_path)], should_stop, workers=1) is None
+    assert len(listed) < 111  # root, 10 and 100 directories if it had run to the end
@@ -0,0 +1,62 @@
+from ollama_terminal import TerminalScreen
+
+
+def text(segments):
+    return "".join(t for t, _ in segments)
+
+
+def test_carriage_return_redraws_progress_in_place():
+    screen = TerminalScreen()
+    screen.feed("pulling manifest\n")
+    for percent in (10, 55, 100):
+        screen.feed(f"\rdownloading {percent:3d}%")
+    assert text(screen.live_segments()) == "pulling manifest\ndownloading 100%"
+    assert not screen.changed
+
+
+def test_cursor_up_and_erase_line():
+    screen = TerminalScreen()
+    screen.feed("layer a  10%\nlayer b  20%\n")
+    screen.feed("\x1b[2A\x1b[Klayer a  90%\n\x1b[Klayer b 100%\n")
+    assert text(screen.live_segments()) == "layer a  90%\nlayer b 100%\n"
+
+
+def test_short_redraw_without_erase_keeps_old_tail():
+    screen = TerminalScreen()
+    screen.feed("abcdef\rxy")
+    assert text(screen.live_segments()) == "xycdef"
+
+
+def test_escape_split_across_reads():
+    screen = TerminalScreen()
+    screen.feed("first\nsecond\x1b[")
+    assert text(screen.live_segments()) == "first\nsecond"
+    screen.feed("1A\rFIRST\x1b[?25l\x1b]0;title\x07")
+    assert text(screen.live_segments()) == "FIRST\nsecond"
+
+
+def test_colours_are_dropped_and_tags_follow_the_writer():
+    screen = TerminalScreen()
+    screen.feed("\x1b[32mok\x1b[0m\n", "stdout")
+    screen.feed("boom", "stderr")
+    assert screen.live_segments() == [("ok\n", "stdout"), ("boom", "stderr")]
+
+
+def test_lines_scrolled_out_of_reach_are_committed():
+    screen = TerminalScreen(max_live_lines=3)
+    screen.feed("".join(f"line {i}\n" for i in range(5)))
+    assert screen.take_committed() == [("line 0\n", None), ("line 1\n", None), ("line 2\n", None)]
+    assert screen.take_committed() == []
+    assert text(screen.live_segments()) == "line 3\nline 4\n"
+    # the cursor can't move above the live region any more
+    screen.feed("\x1b[9A\rX")
+    assert text(screen.live_segments()) == "Xine 3\nline 4\n"
+
+
+def test_finish_commits_everything():
+    screen = TerminalScreen()
+    screen.feed("done\npartial\x1b[", "stdout")
+    assert screen.finish() == [("done\n", "stdout"), ("partial\n", "stdout")]
+    assert screen.live_segments() == []
+    screen.feed("next")
+    assert text(screen.live_segments()) == "next"
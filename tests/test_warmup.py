@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import ollama_commands
+from ollama_warmup import FAILED, WARM, WARMING, ModelWarmer
+
+
+def warm_and_wait(warmer, tasks, model, **kwargs):
+    record = warmer.warm(model, **kwargs)
+    tasks.run_until(lambda: record.state != WARMING)
+    return record
+
+
+def test_warm_up_loads_with_keep_alive_and_measures_the_load(tasks, client, fake_state):
+    fake_state.load_duration = 0.05
+    updates = []
+    warmer = ModelWarmer(tasks, keep_alive="10m", on_update=updates.append, client=client)
+    record = warm_and_wait(warmer, tasks, "alpha:1b")
+
+    assert record.state == WARM and updates == [record]
+    assert fake_state.keep_alive["alpha:1b"] == "10m"
+    assert "alpha:1b" in fake_state.running
+    assert record.load_ms >= 50 and record.wall_ms >= record.load_ms
+    assert warmer.cold_load_ms["alpha:1b"] == record.load_ms
+
+    # a second warm-up finds it resident and keeps the cold load as the baseline
+    again = warm_and_wait(warmer, tasks, "alpha:1b")
+    assert again.load_ms < 1
+    assert warmer.cold_load_ms["alpha:1b"] == record.load_ms
+    assert "saved" in warmer.describe_chat_load("alpha:1b", {"load_duration": 0})
+
+
+def test_hot_models_use_the_hot_keep_alive(tasks, client, fake_state):
+    warmer = ModelWarmer(tasks, keep_alive="10m", hot_keep_alive=-1, client=client)
+    record = warmer.set_hot("beta:3b", True)
+    tasks.run_until(lambda: record.state != WARMING)
+    assert record.keep_alive == -1 and fake_state.keep_alive["beta:3b"] == -1
+    assert warmer.keep_alive_for("beta:3b") == -1 and warmer.keep_alive_for("alpha:1b") == "10m"
+
+    record = warmer.set_hot("beta:3b", False)
+    tasks.run_until(lambda: record.state != WARMING)
+    assert fake_state.keep_alive["beta:3b"] == "10m"
+    # an explicit keep_alive wins over both
+    assert warm_and_wait(warmer, tasks, "beta:3b", keep_alive="1h").keep_alive == "1h"
+
+
+def test_duplicate_warm_up_is_not_sent_while_one_is_running(tasks, client, fake_state):
+    warmer = ModelWarmer(tasks, client=client)
+    first = warmer.warm("alpha:1b")
+    assert warmer.warm("alpha:1b") is first
+    tasks.run_until(lambda: first.state != WARMING)
+    assert sum(1 for entry in fake_state.request_log if entry[1] == "/api/generate") == 1
+
+
+def test_failed_warm_up_is_reported(tasks, client):
+    updates = []
+    warmer = ModelWarmer(tasks, on_update=updates.append, client=client)
+    record = warm_and_wait(warmer, tasks, "missing:7b")
+    assert record.state == FAILED and "not found" in record.error
+    assert updates == [record]
+
+
+def test_selecting_a_loaded_model_skips_the_warm_up(monkeypatch):
+    warmed = []
+    gui = SimpleNamespace(
+        inventory=SimpleNamespace(running_names=lambda: {"alpha:1b"}),
+        model_warmer=SimpleNamespace(warm=warmed.append),
+        checking_color="blue",
+    )
+    monkeypatch.setattr(ollama_commands, "log_message", lambda gui, text, color=None: None)
+    ollama_commands.warm_up_model(gui, "alpha:1b")
+    assert warmed == []
+    ollama_commands.warm_up_model(gui, "beta:3b")
+    ollama_commands.warm_up_model(gui, "alpha:1b", force=True)
+    assert warmed == ["beta:3b", "alpha:1b"]